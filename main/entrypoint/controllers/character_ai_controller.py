@@ -1,7 +1,10 @@
-import traceback
+import json, traceback
+from typing import AsyncIterator
 from dependency_injector.wiring import inject, Provide
-from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from main.entrypoint.middleware.core.auth_middleware import get_token
+from main.entrypoint.utils.responses.fast_json_response import build_json_response
 from main.library.di_container import Container
 from main.library.tools.core.character_ai_tool import CharacterAiTool
 from main.library.tools.core.log_tool import LogTool
@@ -112,7 +115,7 @@ async def chat(
         )
         assert response is not None, "Resposta não pode ser nula."
         log_tool.info("Resposta obtida com sucesso.")
-        return response
+        return build_json_response(response)
     except ValidationException as ve:
         error_msg: str = ve.args[0]
         log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
@@ -137,3 +140,247 @@ async def chat(
             },
             status_code=500,
         )
+
+
+@router.post(
+    "/characterai/{char_id}/chat/stream",
+    tags=["Character AI"],
+    responses={
+        200: {
+            "description": "Success",
+            "content": {
+                "text/event-stream": {
+                    "example": 'event: delta\ndata: {"delta": "Como Lorde", "text": "Como Lorde"}\n\n'
+                    'event: delta\ndata: {"delta": " Dart Vader", "text": "Como Lorde Dart Vader"}\n\n'
+                    'event: done\ndata: {"created_at": "27/05/2024 22:10:23", "session": {...}, ...}\n\n'
+                }
+            },
+        },
+        400: {
+            "description": "Bad Request",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "Message": "Invalid request",
+                        "StackTrace": "Traceback...",
+                    }
+                }
+            },
+        },
+        403: {
+            "description": "Forbidden",
+            "content": {
+                "application/json": {"example": {"detail": "Not authenticated"}}
+            },
+        },
+        500: {
+            "description": "Internal Server Error",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "Message": "Internal Server Error",
+                        "StackTrace": "Traceback...",
+                    }
+                }
+            },
+        },
+    },
+)
+@inject
+async def stream_chat(
+    token: str = Depends(get_token),
+    char_id: str = Path(
+        ...,
+        title="Character ID",
+        description="Identificador do personagem",
+        example="amhBBampjntDRr_RjHdjyrwvAxOqklHwItldIsqsjLU",
+    ),
+    chat_id: str = Query(
+        None,
+        title="Chat ID",
+        description="Identificador do chat",
+        example="0f3e34b0-df45-40d2-8be3-b0d5bffd1377",
+    ),
+    body: dict = Body(
+        ...,
+        title="Body",
+        description="Texto a ser enviado para o chat",
+        example={"message": "Olá! Quem é você?"},
+    ),
+    log_tool: LogTool = Depends(Provide[Container.log_tool]),
+    character_ai_tool: CharacterAiTool = Depends(Provide[Container.character_ai_tool]),
+):
+    """
+    Conversar com um personagem, recebendo a resposta à medida que é escrita (Server-Sent Events).
+
+    Envia um evento "delta" a cada trecho novo da resposta e um evento "done" com a resposta completa.
+    Um erro durante a resposta encerra o stream com um evento "error".
+    """
+    try:
+        log_tool.info("Conversando com personagem (stream).")
+        assert char_id is not None, "Character ID não pode ser nulo."
+        assert body is not None, "Body não pode ser nulo."
+        message: str = body.get("message")
+        assert message is not None, "Texto não pode ser nulo."
+        assert len(message) > 0, "Texto não pode ser vazio."
+        events: AsyncIterator[dict | CharacterAiResponse] = character_ai_tool.stream_chat(
+            token, char_id, message, chat_id
+        )
+        # The first event is awaited here so connection errors still get a proper status code.
+        first_event: dict | CharacterAiResponse = await events.__anext__()
+        return StreamingResponse(
+            stream_events_as_sse(first_event, events, log_tool),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    except ValidationException as ve:
+        error_msg: str = ve.args[0]
+        log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
+        stack_trace: str = traceback.format_exc()
+        log_tool.error(f"Traceback: {stack_trace}")
+        return JSONResponse(
+            content={
+                "Message": error_msg,
+                "StackTrace": stack_trace,
+            },
+            status_code=400,
+        )
+    except Exception as e:
+        error_msg: str = e.args[0]
+        log_tool.error(f"Erro ao conversar com personagem: {error_msg}")
+        stack_trace: str = traceback.format_exc()
+        log_tool.error(f"Traceback: {stack_trace}")
+        return JSONResponse(
+            content={
+                "Message": error_msg,
+                "StackTrace": stack_trace,
+            },
+            status_code=500,
+        )
+
+
+async def stream_events_as_sse(
+    first_event: dict | CharacterAiResponse,
+    events: AsyncIterator[dict | CharacterAiResponse],
+    log_tool: LogTool,
+) -> AsyncIterator[str]:
+    try:
+        event: dict | CharacterAiResponse = first_event
+        while True:
+            if isinstance(event, CharacterAiResponse):
+                yield f"event: done\ndata: {json.dumps(jsonable_encoder(event))}\n\n"
+                log_tool.info("Resposta obtida com sucesso.")
+            else:
+                yield f"event: delta\ndata: {json.dumps(event)}\n\n"
+            event = await events.__anext__()
+    except StopAsyncIteration:
+        pass
+    except Exception as e:
+        error_msg: str = e.args[0] if len(e.args) > 0 else str(e)
+        log_tool.error(f"Erro ao receber resposta do personagem: {error_msg}")
+        yield f"event: error\ndata: {json.dumps({'Message': error_msg})}\n\n"
+    finally:
+        await events.aclose()
+
+
+@router.post(
+    "/characterai/chat/batch",
+    tags=["Character AI"],
+    responses={
+        200: {
+            "description": "Success",
+            "content": {
+                "application/x-ndjson": {
+                    "example": '{"index": 1, "char_id": "amhBBampjntDRr_RjHdjyrwvAxOqklHwItldIsqsjLU", "response": {...}}\n'
+                    '{"index": 0, "char_id": "YntB_ZeqRq2l_aVf2gWDCZl4oBttQzDvhj9cXafWcF8", "Message": "Timed out"}\n'
+                }
+            },
+        },
+        400: {
+            "description": "Bad Request",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "Message": "Invalid request",
+                        "StackTrace": "Traceback...",
+                    }
+                }
+            },
+        },
+        403: {
+            "description": "Forbidden",
+            "content": {
+                "application/json": {"example": {"detail": "Not authenticated"}}
+            },
+        },
+    },
+)
+@inject
+async def chat_batch(
+    token: str = Depends(get_token),
+    body: list = Body(
+        ...,
+        title="Body",
+        description="Mensagens a serem enviadas, cada uma a um personagem",
+        example=[
+            {
+                "char_id": "amhBBampjntDRr_RjHdjyrwvAxOqklHwItldIsqsjLU",
+                "chat_id": None,
+                "message": "Qual é o sentido da vida?",
+            },
+            {
+                "char_id": "YntB_ZeqRq2l_aVf2gWDCZl4oBttQzDvhj9cXafWcF8",
+                "chat_id": "0f3e34b0-df45-40d2-8be3-b0d5bffd1377",
+                "message": "Qual é o sentido da vida?",
+                "timeout": 30,
+            },
+        ],
+    ),
+    log_tool: LogTool = Depends(Provide[Container.log_tool]),
+    character_ai_tool: CharacterAiTool = Depends(Provide[Container.character_ai_tool]),
+):
+    """
+    Envia várias mensagens a personagens ao mesmo tempo.
+
+    Retorna um stream NDJSON com o resultado de cada mensagem, na ordem em que terminam.
+    """
+    try:
+        log_tool.info("Conversando com personagens em lote.")
+        assert body is not None, "Body não pode ser nulo."
+        for item in body:
+            if not isinstance(item, dict):
+                raise ValidationException("Cada item deve ser um objeto com char_id e message.")
+        results: AsyncIterator[dict] = character_ai_tool.chat_many(token, body)
+        return StreamingResponse(
+            stream_results_as_ndjson(results, log_tool),
+            media_type="application/x-ndjson",
+        )
+    except ValidationException as ve:
+        error_msg: str = ve.args[0]
+        log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
+        stack_trace: str = traceback.format_exc()
+        log_tool.error(f"Traceback: {stack_trace}")
+        return JSONResponse(
+            content={
+                "Message": error_msg,
+                "StackTrace": stack_trace,
+            },
+            status_code=400,
+        )
+
+
+async def stream_results_as_ndjson(
+    results: AsyncIterator[dict], log_tool: LogTool
+) -> AsyncIterator[str]:
+    answered: int = 0
+    failed: int = 0
+    try:
+        async for result in results:
+            if "Message" not in result:
+                answered += 1
+            else:
+                failed += 1
+            yield json.dumps(jsonable_encoder(result)) + "\n"
+        log_tool.info(f"Mensagens respondidas: {answered}, com erro: {failed}")
+    finally:
+        await results.aclose()
@@ -2,7 +2,11 @@ import platform
 from dependency_injector.wiring import inject, Provide
 from main.library.di_container import Container
 from main.library.tools.core.log_tool import LogTool
+from main.library.tools.core.metrics_tool import MetricsTool
+from main.library.tools.core.tracing_tool import TracingTool
 from fastapi import APIRouter, Body, Depends, Path
+from main.entrypoint.utils.responses.fast_json_response import build_json_response
+from fastapi.responses import JSONResponse, PlainTextResponse
 from main.library.utils.core.settings_helper import get
 from main.library.utils.models.validation_exception import ValidationException
 
@@ -51,3 +55,90 @@ async def get_info(logger: LogTool = Depends(Provide[Container.log_tool])):
     except Exception as e:
         logger.error(f"Erro ao obter informações sobre a API: {str(e)}")
         return {"error": str(e)}, 500
+
+
+@router.get(
+    "/metrics",
+    tags=["Information"],
+    response_class=PlainTextResponse,
+    responses={
+        200: {
+            "description": "Success",
+            "content": {
+                "text/plain": {
+                    "example": '# TYPE notion_request_duration_seconds histogram\nnotion_request_duration_seconds_bucket{endpoint="/v1/pages/{id}",le="0.25",method="GET",status="200"} 12\n'
+                }
+            },
+        },
+    },
+)
+@inject
+async def get_metrics(metrics_tool: MetricsTool = Depends(Provide[Container.metrics_tool])):
+    """
+    Retorna as métricas deste micro-serviço no formato texto do Prometheus.
+
+    Inclui histogramas de duração por rota e por chamada ao Notion e ao Character AI, e contadores de retentativas,
+    esperas do limitador de requisições, caches e pools de conexões.
+    """
+    return PlainTextResponse(
+        metrics_tool.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@router.get(
+    "/traces/{request_id}",
+    tags=["Information"],
+    responses={
+        200: {
+            "description": "Success",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "trace_id": "5f0c6a0e8e9b4d7c9a1f2b3c4d5e6f70",
+                            "span_id": "9a1f2b3c4d5e6f70",
+                            "parent_id": None,
+                            "name": "GET /pages/{page_id}",
+                            "start_time": "2024-05-24T02:05:13.551201+00:00",
+                            "duration_ms": 412.5,
+                            "status": "ok",
+                            "error": None,
+                            "attributes": {"method": "GET", "status": 200, "controller": "read_page_by_id"},
+                        }
+                    ]
+                }
+            },
+        },
+        404: {
+            "description": "Not Found",
+            "content": {"application/json": {"example": {"Message": "Nenhum span encontrado para a requisição."}}},
+        },
+    },
+)
+@inject
+async def get_trace(
+    request_id: str = Path(
+        ...,
+        title="Request ID",
+        description="ID da requisição, retornado no cabeçalho X-Request-Id",
+        example="5f0c6a0e8e9b4d7c9a1f2b3c4d5e6f70",
+    ),
+    tracing_tool: TracingTool = Depends(Provide[Container.tracing_tool]),
+):
+    """
+    Retorna os spans registrados para uma requisição, ordenados pelo início.
+
+    Disponível apenas com TRACING_EXPORTER="memory", que mantém os últimos TRACING_MAX_SPANS spans.
+    """
+    spans: list[dict] | None = tracing_tool.get_spans(request_id)
+    if spans is None:
+        return JSONResponse(
+            content={"Message": "O exportador de spans configurado não permite consultá-los."},
+            status_code=404,
+        )
+    if len(spans) == 0:
+        return JSONResponse(
+            content={"Message": "Nenhum span encontrado para a requisição."},
+            status_code=404,
+        )
+    return build_json_response(spans)
@@ -2,9 +2,10 @@ import traceback
 from dependency_injector.wiring import inject, Provide
 from fastapi.responses import JSONResponse
 from main.entrypoint.middleware.core.auth_middleware import get_token
+from main.entrypoint.utils.responses.fast_json_response import build_json_response
 from main.library.di_container import Container
-from main.library.repositories.notion.core.notion_database_manager import (
-    NotionDatabaseManager,
+from main.library.repositories.notion.core.async_notion_database_manager import (
+    AsyncNotionDatabaseManager,
 )
 from main.library.repositories.notion.core.notion_page_manager import NotionPageManager
 from main.library.repositories.notion.models.notion_custom_icon import NotionIcon
@@ -195,8 +196,8 @@ async def create_database(
         },
     ),
     log_tool: LogTool = Depends(Provide[Container.log_tool]),
-    notion_database_manager: NotionDatabaseManager = Depends(
-        Provide[Container.notion_database_manager]
+    notion_database_manager: AsyncNotionDatabaseManager = Depends(
+        Provide[Container.async_notion_database_manager]
     ),
 ):
     """
@@ -205,10 +206,10 @@ async def create_database(
     try:
         log_tool.info("Criando banco de dados no Notion.")
         database: NotionDatabase = NotionDatabase.from_dict(body)
-        response: dict = notion_database_manager.create_database(token, page_id, database)
-        log_tool.info(f"Resposta da API do Notion: {response}")
+        response: dict = await notion_database_manager.create_database(token, page_id, database)
+        log_tool.info(f"Resposta da API do Notion recebida. ID: {response['id']}")
         database_id: str = response["id"]
-        return {"database_id": database_id}
+        return build_json_response({"database_id": database_id})
     except ValidationException as ve:
         error_msg: str = ve.args[0]
         log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
@@ -465,8 +466,8 @@ async def read_database(
         example="c7c1007a-d112-4b8c-a621-a769adaf7dda",
     ),
     log_tool: LogTool = Depends(Provide[Container.log_tool]),
-    notion_database_manager: NotionDatabaseManager = Depends(
-        Provide[Container.notion_database_manager]
+    notion_database_manager: AsyncNotionDatabaseManager = Depends(
+        Provide[Container.async_notion_database_manager]
     ),
 ):
     """
@@ -475,9 +476,9 @@ async def read_database(
     try:
         log_tool.info("Lendo banco de dados no Notion.")
         assert database_id is not None, "ID do banco de dados não pode ser nulo."
-        db: NotionDatabase = notion_database_manager.read_database_by_id(token, database_id)
-        log_tool.info(f"Banco de dados retornado: \n{db}")
-        return db
+        db: NotionDatabase = await notion_database_manager.read_database_by_id(token, database_id)
+        log_tool.info(f"Banco de dados retornado. ID: {db.id}")
+        return build_json_response(db.to_dict())
     except ValidationException as ve:
         error_msg: str = ve.args[0]
         log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
@@ -504,6 +505,49 @@ async def read_database(
         )
 
 
+@router.get(
+    "/databases/cache/stats",
+    tags=["Notion Database Management"],
+    responses={
+        200: {
+            "description": "Success",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "entries": 12,
+                        "bytes": 48213,
+                        "hits": 3051,
+                        "misses": 40,
+                        "evictions": 0,
+                        "coalesced": 7,
+                    }
+                }
+            },
+        },
+        403: {
+            "description": "Forbidden",
+            "content": {
+                "application/json": {"example": {"detail": "Not authenticated"}}
+            },
+        },
+    },
+)
+@inject
+async def read_database_cache_stats(
+    token: str = Depends(get_token),
+    log_tool: LogTool = Depends(Provide[Container.log_tool]),
+    notion_database_manager: AsyncNotionDatabaseManager = Depends(
+        Provide[Container.async_notion_database_manager]
+    ),
+):
+    """
+    Retorna os contadores do cache de esquemas de bancos de dados.
+    """
+    stats: dict | None = notion_database_manager.get_cache_stats()
+    log_tool.info("Estatísticas do cache de esquemas: %s", stats)
+    return build_json_response(stats)
+
+
 @router.put(
     "/databases/{database_id}/update",
     tags=["Notion Database Management"],
@@ -680,8 +724,8 @@ async def update_database(
         },
     ),
     log_tool: LogTool = Depends(Provide[Container.log_tool]),
-    notion_database_manager: NotionDatabaseManager = Depends(
-        Provide[Container.notion_database_manager]
+    notion_database_manager: AsyncNotionDatabaseManager = Depends(
+        Provide[Container.async_notion_database_manager]
     ),
 ):
     """
@@ -690,10 +734,10 @@ async def update_database(
     try:
         log_tool.info("Atualizando banco de dados no Notion.")
         database: NotionDatabase = NotionDatabase.from_dict(body)
-        response: dict = notion_database_manager.update_database(token, database_id, database)
-        log_tool.info(f"Resposta da API do Notion: {response}")
+        response: dict = await notion_database_manager.update_database(token, database_id, database)
+        log_tool.info(f"Resposta da API do Notion recebida. ID: {response['id']}")
         msg: str = f"Banco de dados {database_id} atualizado com sucesso."
-        return {"Message": msg}
+        return build_json_response({"Message": msg})
     except ValidationException as ve:
         error_msg: str = ve.args[0]
         log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
@@ -778,8 +822,8 @@ async def archive_database(
         example="c7c1007a-d112-4b8c-a621-a769adaf7dda",
     ),
     log_tool: LogTool = Depends(Provide[Container.log_tool]),
-    notion_database_manager: NotionDatabaseManager = Depends(
-        Provide[Container.notion_database_manager]
+    notion_database_manager: AsyncNotionDatabaseManager = Depends(
+        Provide[Container.async_notion_database_manager]
     ),
 ):
     """
@@ -788,10 +832,10 @@ async def archive_database(
     try:
         log_tool.info("Arquivando banco de dados no Notion.")
         assert database_id is not None, "ID do banco de dados não pode ser nulo."
-        response: dict = notion_database_manager.archive_database(token, database_id)
-        log_tool.info(f"Resposta da API do Notion: {response}")
+        response: dict = await notion_database_manager.archive_database(token, database_id)
+        log_tool.info(f"Resposta da API do Notion recebida. ID: {response['id']}")
         msg: str = f"Banco de dados {database_id} arquivado com sucesso."
-        return {"Message": msg}
+        return build_json_response({"Message": msg})
     except ValidationException as ve:
         error_msg: str = ve.args[0]
         log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
@@ -876,8 +920,8 @@ async def unarchive_database(
         example="c7c1007a-d112-4b8c-a621-a769adaf7dda",
     ),
     log_tool: LogTool = Depends(Provide[Container.log_tool]),
-    notion_database_manager: NotionDatabaseManager = Depends(
-        Provide[Container.notion_database_manager]
+    notion_database_manager: AsyncNotionDatabaseManager = Depends(
+        Provide[Container.async_notion_database_manager]
     ),
 ):
     """
@@ -886,10 +930,10 @@ async def unarchive_database(
     try:
         log_tool.info("Desarquivando banco de dados no Notion.")
         assert database_id is not None, "ID do banco de dados não pode ser nulo."
-        response: dict = notion_database_manager.unarchive_database(token, database_id)
-        log_tool.info(f"Resposta da API do Notion: {response}")
+        response: dict = await notion_database_manager.unarchive_database(token, database_id)
+        log_tool.info(f"Resposta da API do Notion recebida. ID: {response['id']}")
         msg: str = f"Banco de dados {database_id} recuperado com sucesso."
-        return {"Message": msg}
+        return build_json_response({"Message": msg})
     except ValidationException as ve:
         error_msg: str = ve.args[0]
         log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
@@ -0,0 +1,224 @@
+import traceback
+from dependency_injector.wiring import inject, Provide
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from main.entrypoint.middleware.core.auth_middleware import get_token
+from main.entrypoint.utils.responses.fast_json_response import build_json_response
+from main.library.di_container import Container
+from main.library.repositories.notion.core.notion_mirror import NotionMirror
+from main.library.repositories.notion.models.notion_page import NotionPage
+from main.library.tools.core.log_tool import LogTool
+from fastapi import APIRouter, Body, Depends, Path, Query
+from main.library.utils.models.validation_exception import ValidationException
+
+router = APIRouter()
+
+
+@router.post(
+    "/mirror/{database_id}/sync",
+    tags=["Notion Mirror"],
+    responses={
+        200: {
+            "description": "Success",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "database_id": "c7c1007a-d112-4b8c-a621-a769adaf7dda",
+                        "full": False,
+                        "synced_pages": 12,
+                        "deleted_pages": 0,
+                        "page_count": 20480,
+                        "last_edited_time": "2024-05-24T02:04:00.000Z",
+                        "synced_at": "2024-05-24T02:05:13.551201+00:00",
+                    }
+                }
+            },
+        },
+        400: {
+            "description": "Bad Request",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "Message": "Invalid request",
+                        "StackTrace": "Traceback...",
+                    }
+                }
+            },
+        },
+        403: {
+            "description": "Forbidden",
+            "content": {
+                "application/json": {"example": {"detail": "Not authenticated"}}
+            },
+        },
+        500: {
+            "description": "Internal Server Error",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "Message": "Internal Server Error",
+                        "StackTrace": "Traceback...",
+                    }
+                }
+            },
+        },
+    },
+)
+@inject
+async def sync_database(
+    token: str = Depends(get_token),
+    database_id: str = Path(
+        ...,
+        title="Database ID",
+        description="ID do banco de dados do Notion",
+        example="c7c1007a-d112-4b8c-a621-a769adaf7dda",
+    ),
+    full: bool = Query(
+        False,
+        title="Full",
+        description="Relê todas as páginas e remove do espelho as que não existem mais no Notion",
+    ),
+    log_tool: LogTool = Depends(Provide[Container.log_tool]),
+    notion_mirror: NotionMirror = Depends(Provide[Container.notion_mirror]),
+):
+    """
+    Sincroniza a cópia local (SQLite) de um banco de dados do Notion.
+    """
+    try:
+        log_tool.info("Sincronizando espelho do banco de dados do Notion.")
+        assert database_id is not None, "ID do banco de dados não pode ser nulo."
+        result: dict = await notion_mirror.sync_database(token, database_id, full)
+        log_tool.info("Resultado da sincronização: %s", result)
+        return build_json_response(result)
+    except ValidationException as ve:
+        error_msg: str = ve.args[0]
+        log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
+        stack_trace: str = traceback.format_exc()
+        log_tool.error(f"Traceback: {stack_trace}")
+        return JSONResponse(
+            content={
+                "Message": error_msg,
+                "StackTrace": stack_trace,
+            },
+            status_code=400,
+        )
+    except Exception as e:
+        error_msg: str = e.args[0]
+        log_tool.error(f"Erro ao sincronizar espelho: {error_msg}")
+        stack_trace: str = traceback.format_exc()
+        log_tool.error(f"Traceback: {stack_trace}")
+        return JSONResponse(
+            content={
+                "Message": error_msg,
+                "StackTrace": stack_trace,
+            },
+            status_code=500,
+        )
+
+
+@router.post(
+    "/mirror/{database_id}/query",
+    tags=["Notion Mirror"],
+    responses={
+        200: {
+            "description": "Success",
+            "content": {"application/json": {"example": []}},
+        },
+        400: {
+            "description": "Bad Request",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "Message": "Invalid request",
+                        "StackTrace": "Traceback...",
+                    }
+                }
+            },
+        },
+        403: {
+            "description": "Forbidden",
+            "content": {
+                "application/json": {"example": {"detail": "Not authenticated"}}
+            },
+        },
+        500: {
+            "description": "Internal Server Error",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "Message": "Internal Server Error",
+                        "StackTrace": "Traceback...",
+                    }
+                }
+            },
+        },
+    },
+)
+@inject
+async def query_mirror(
+    token: str = Depends(get_token),
+    database_id: str = Path(
+        ...,
+        title="Database ID",
+        description="ID do banco de dados do Notion",
+        example="c7c1007a-d112-4b8c-a621-a769adaf7dda",
+    ),
+    body: dict = Body(
+        ...,
+        example={
+            "page_size": 100,
+            "offset": 0,
+            "filter": {
+                "or": [
+                    {"property": "Name", "title": {"contains": ""}},
+                    {
+                        "property": "Description",
+                        "rich_text": {"contains": ""},
+                    },
+                ]
+            },
+        },
+    ),
+    log_tool: LogTool = Depends(Provide[Container.log_tool]),
+    notion_mirror: NotionMirror = Depends(Provide[Container.notion_mirror]),
+):
+    """
+    Consulta páginas na cópia local de um banco de dados, sem chamar a API do Notion.
+
+    Aceita o mesmo formato de filtro da consulta ao Notion. O banco precisa ter sido sincronizado com o mesmo token.
+    """
+    try:
+        log_tool.info("Consultando páginas no espelho do Notion.")
+        assert database_id is not None, "ID do banco de dados não pode ser nulo."
+        filter: dict | None = body.get("filter")
+        page_size: int = int(body.get("page_size", 100))
+        offset: int = int(body.get("offset", 0))
+        response_obj: list[NotionPage] = await run_in_threadpool(
+            notion_mirror.query_pages, token, database_id, filter, page_size, offset
+        )
+        log_tool.info(f"Páginas retornadas do espelho: {len(response_obj)}")
+        return build_json_response([page.to_dict() for page in response_obj])
+    except ValidationException as ve:
+        error_msg: str = ve.args[0]
+        log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
+        stack_trace: str = traceback.format_exc()
+        log_tool.error(f"Traceback: {stack_trace}")
+        return JSONResponse(
+            content={
+                "Message": error_msg,
+                "StackTrace": stack_trace,
+            },
+            status_code=400,
+        )
+    except Exception as e:
+        error_msg: str = e.args[0]
+        log_tool.error(f"Erro ao consultar espelho: {error_msg}")
+        stack_trace: str = traceback.format_exc()
+        log_tool.error(f"Traceback: {stack_trace}")
+        return JSONResponse(
+            content={
+                "Message": error_msg,
+                "StackTrace": stack_trace,
+            },
+            status_code=500,
+        )
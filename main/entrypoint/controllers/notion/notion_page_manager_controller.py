@@ -1,17 +1,25 @@
-import traceback
+import json, traceback
+from typing import Any, AsyncIterator
 from dependency_injector.wiring import inject, Provide
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from main.entrypoint.middleware.core.auth_middleware import get_token
+from main.entrypoint.utils.responses.fast_json_response import build_json_response
+from main.entrypoint.utils.responses.duplex_streaming_response import (
+    DuplexStreamingResponse,
+)
 from main.library.di_container import Container
-from main.library.repositories.notion.core.notion_page_manager import NotionPageManager
+from main.library.repositories.notion.core.async_notion_page_manager import (
+    AsyncNotionPageManager,
+)
 from main.library.repositories.notion.models.notion_custom_icon import NotionIcon
 from main.library.repositories.notion.models.notion_page import NotionPage
 from main.library.repositories.notion.models.notion_page_block import NotionPageBlock
 from main.library.repositories.notion.models.notion_property import NotionProperty
 from main.library.tools.core.log_tool import LogTool
-from fastapi import APIRouter, Body, Depends, Path
+from fastapi import APIRouter, Body, Depends, Path, Query, Request
 from main.library.tools.core.settings_tool import SettingsTool
 from main.library.utils.core.settings_helper import get
+from main.library.utils.models.partial_write_exception import PartialWriteException
 from main.library.utils.models.validation_exception import ValidationException
 
 router = APIRouter()
@@ -163,8 +171,8 @@ async def create_page(
         },
     ),
     log_tool: LogTool = Depends(Provide[Container.log_tool]),
-    notion_page_manager: NotionPageManager = Depends(
-        Provide[Container.notion_page_manager]
+    notion_page_manager: AsyncNotionPageManager = Depends(
+        Provide[Container.async_notion_page_manager]
     ),
 ):
     """
@@ -189,12 +197,26 @@ async def create_page(
                 NotionPageBlock(block_type=block["type"], value=block["value"])
             )
         notion_page: NotionPage = NotionPage(notion_icon, page_properties, page_blocks)
-        log_tool.info(f"Payload: {notion_page}")
-        response_obj: dict = notion_page_manager.create_page(token, notion_page, database_id)
-        log_tool.info(f"Objeto retornado pela API do Notion: {response_obj}")
+        log_tool.info(
+            f"Payload: {len(page_properties)} propriedades, {len(page_blocks)} blocos."
+        )
+        response_obj: dict = await notion_page_manager.create_page(token, notion_page, database_id)
         created_id: str = response_obj["id"]
         log_tool.info(f"Página criada com sucesso. ID: {created_id}")
-        return {"page_id": created_id}
+        return build_json_response({"page_id": created_id})
+    except PartialWriteException as pwe:
+        log_tool.error(f"Página criada parcialmente: {pwe.message}")
+        stack_trace: str = traceback.format_exc()
+        log_tool.error(f"Traceback: {stack_trace}")
+        return JSONResponse(
+            content={
+                "Message": pwe.message,
+                "StackTrace": stack_trace,
+                "PageId": pwe.page_id,
+                "NextBlockIndex": pwe.next_block_index,
+            },
+            status_code=500,
+        )
     except ValidationException as ve:
         error_msg: str = ve.args[0]
         log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
@@ -221,6 +243,195 @@ async def create_page(
         )
 
 
+@router.post(
+    "/pages/{database_id}/create/bulk",
+    tags=["Notion Page Management"],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "icon": {"type": "emoji", "value": "🚀"},
+                            "properties": [
+                                {"name": "Name", "type": "title", "value": "My Page"}
+                            ],
+                            "blocks": [{"type": "paragraph", "value": "Este é um parágrafo."}],
+                        }
+                    ]
+                },
+                "application/x-ndjson": {
+                    "example": '{"icon": {"type": "emoji", "value": "🚀"}, "properties": [{"name": "Name", "type": "title", "value": "My Page"}], "blocks": []}\n'
+                },
+            },
+        }
+    },
+    responses={
+        200: {
+            "description": "Success",
+            "content": {
+                "application/x-ndjson": {
+                    "example": '{"index": 0, "page_id": "6301f640e21c4526a72ed96e7d4ba71d"}\n{"index": 1, "Message": "Page properties cannot be empty"}\n'
+                }
+            },
+        },
+        400: {
+            "description": "Bad Request",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "Message": "Invalid request",
+                        "StackTrace": "Traceback...",
+                    }
+                }
+            },
+        },
+        403: {
+            "description": "Forbidden",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Not authenticated",
+                    }
+                }
+            },
+        },
+    },
+)
+@inject
+async def create_pages(
+    request: Request,
+    token: str = Depends(get_token),
+    database_id: str = Path(
+        ...,
+        title="Database ID",
+        description="ID do banco de dados do Notion",
+        example="c7c1007a-d112-4b8c-a621-a769adaf7dda",
+    ),
+    log_tool: LogTool = Depends(Provide[Container.log_tool]),
+    notion_page_manager: AsyncNotionPageManager = Depends(
+        Provide[Container.async_notion_page_manager]
+    ),
+):
+    """
+    Cria várias páginas no Notion, a partir de uma lista JSON ou de um stream NDJSON (uma página por linha).
+
+    Retorna um stream NDJSON com o resultado de cada página, na ordem em que terminam.
+    """
+    try:
+        log_tool.info("Criando páginas em lote no Notion.")
+        assert database_id is not None, "ID do banco de dados não pode ser nulo."
+        content_type: str = request.headers.get("content-type", "")
+        pages: list[NotionPage] | AsyncIterator[NotionPage]
+        if content_type.startswith("application/x-ndjson"):
+            pages = read_pages_from_ndjson(request)
+        else:
+            body: list = await request.json()
+            if not isinstance(body, list):
+                raise ValidationException("O corpo da requisição deve ser uma lista de páginas.")
+            pages = [build_page_from_body(item) for item in body]
+        results: AsyncIterator[dict] = notion_page_manager.create_pages(
+            token, pages, database_id
+        )
+        return DuplexStreamingResponse(
+            stream_results_as_ndjson(results, log_tool),
+            media_type="application/x-ndjson",
+        )
+    except (ValidationException, ValueError) as ve:
+        error_msg: str = ve.args[0]
+        log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
+        stack_trace: str = traceback.format_exc()
+        log_tool.error(f"Traceback: {stack_trace}")
+        return JSONResponse(
+            content={
+                "Message": error_msg,
+                "StackTrace": stack_trace,
+            },
+            status_code=400,
+        )
+    except Exception as e:
+        error_msg: str = e.args[0]
+        log_tool.error(f"Erro ao criar páginas: {error_msg}")
+        stack_trace: str = traceback.format_exc()
+        log_tool.error(f"Traceback: {stack_trace}")
+        return JSONResponse(
+            content={
+                "Message": error_msg,
+                "StackTrace": stack_trace,
+            },
+            status_code=500,
+        )
+
+
+def build_page_from_body(body: Any) -> NotionPage:
+    # Missing fields are left as None so create_page rejects that page alone, not the whole batch.
+    if not isinstance(body, dict):
+        return NotionPage(None, None, None)
+    icon: dict | None = body.get("icon")
+    notion_icon: NotionIcon | None = (
+        NotionIcon(icon_type=icon.get("type"), icon_value=icon.get("value"))
+        if isinstance(icon, dict)
+        else None
+    )
+    page_properties: list[NotionProperty] | None = (
+        [
+            NotionProperty(
+                name=prop.get("name"), prop_type=prop.get("type"), value=prop.get("value")
+            )
+            for prop in body["properties"]
+            if isinstance(prop, dict)
+        ]
+        if isinstance(body.get("properties"), list)
+        else None
+    )
+    page_blocks: list[NotionPageBlock] | None = (
+        [
+            NotionPageBlock(block_type=block.get("type"), value=block.get("value"))
+            for block in body["blocks"]
+            if isinstance(block, dict)
+        ]
+        if isinstance(body.get("blocks"), list)
+        else None
+    )
+    return NotionPage(notion_icon, page_properties, page_blocks)
+
+
+async def read_pages_from_ndjson(request: Request) -> AsyncIterator[NotionPage]:
+    buffer: bytes = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        lines: list[bytes] = buffer.split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield build_page_from_body(json.loads(line))
+    if buffer.strip():
+        yield build_page_from_body(json.loads(buffer))
+
+
+async def stream_results_as_ndjson(
+    results: AsyncIterator[dict], log_tool: LogTool
+) -> AsyncIterator[str]:
+    created: int = 0
+    failed: int = 0
+    try:
+        async for result in results:
+            if "Message" not in result:
+                created += 1
+            else:
+                failed += 1
+            yield json.dumps(result) + "\n"
+        log_tool.info(f"Páginas criadas: {created}, com erro: {failed}")
+    except Exception as e:
+        # Only a malformed NDJSON line gets here: per-page errors are part of the results.
+        error_msg: str = e.args[0] if len(e.args) > 0 else str(e)
+        log_tool.error(f"Erro ao ler páginas após {created + failed} páginas: {error_msg}")
+        yield json.dumps({"Message": error_msg}) + "\n"
+    finally:
+        await results.aclose()
+
+
 @router.get(
     "/pages/{page_id}/read",
     tags=["Notion Page Management"],
@@ -480,8 +691,8 @@ async def read_page(
         example="6f48b54c-094d-4339-aa90-89f9985fb6c7",
     ),
     log_tool: LogTool = Depends(Provide[Container.log_tool]),
-    notion_page_manager: NotionPageManager = Depends(
-        Provide[Container.notion_page_manager]
+    notion_page_manager: AsyncNotionPageManager = Depends(
+        Provide[Container.async_notion_page_manager]
     ),
 ):
     """
@@ -490,9 +701,9 @@ async def read_page(
     try:
         log_tool.info("Lendo página no Notion.")
         assert page_id is not None, "ID da página não pode ser nulo."
-        response_obj: NotionPage = notion_page_manager.read_page_by_id(token, page_id)
-        log_tool.info(f"Página retornada: \n{response_obj}")
-        return response_obj
+        response_obj: NotionPage = await notion_page_manager.read_page_by_id(token, page_id)
+        log_tool.info(f"Página retornada. ID: {response_obj.id}")
+        return build_json_response(response_obj.to_dict())
     except ValidationException as ve:
         error_msg: str = ve.args[0]
         log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
@@ -525,7 +736,10 @@ async def read_page(
     responses={
         200: {
             "description": "Success",
-            "content": {"application/json": {"example": []}},
+            "content": {
+                "application/json": {"example": []},
+                "application/x-ndjson": {"example": '{"id": "..."}\n{"id": "..."}\n'},
+            },
         },
         400: {
             "description": "Bad Request",
@@ -575,9 +789,14 @@ async def query_pages(
             },
         },
     ),
+    stream: bool = Query(
+        False,
+        title="Stream",
+        description="Percorre todas as páginas de resultados do Notion e as envia como NDJSON, uma página por linha, à medida que chegam",
+    ),
     log_tool: LogTool = Depends(Provide[Container.log_tool]),
-    notion_page_manager: NotionPageManager = Depends(
-        Provide[Container.notion_page_manager]
+    notion_page_manager: AsyncNotionPageManager = Depends(
+        Provide[Container.async_notion_page_manager]
     ),
 ):
     """
@@ -588,11 +807,24 @@ async def query_pages(
         assert database_id is not None, "ID do banco de dados não pode ser nulo."
         assert "filter" in body, "Filtro não pode ser nulo."
         filter: dict | None = body["filter"]
-        response_obj: list[NotionPage] = notion_page_manager.query_pages_by_database_id(
+        if stream:
+            page_size: int = int(body.get("page_size", 100))
+            batches: AsyncIterator[list[NotionPage]] = (
+                notion_page_manager.iter_pages_by_database_id(
+                    token, database_id, filter, page_size
+                )
+            )
+            # The first batch is awaited here so request errors still get a proper status code.
+            first_batch: list[NotionPage] = await batches.__anext__()
+            return StreamingResponse(
+                stream_pages_as_ndjson(first_batch, batches, log_tool),
+                media_type="application/x-ndjson",
+            )
+        response_obj: list[NotionPage] = await notion_page_manager.query_pages_by_database_id(
             token, database_id, filter
         )
-        log_tool.info(f"Páginas retornadas: \n{response_obj}")
-        return response_obj
+        log_tool.info(f"Páginas retornadas: {len(response_obj)}")
+        return build_json_response([page.to_dict() for page in response_obj])
     except ValidationException as ve:
         error_msg: str = ve.args[0]
         log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
@@ -619,6 +851,28 @@ async def query_pages(
         )
 
 
+async def stream_pages_as_ndjson(
+    first_batch: list[NotionPage],
+    batches: AsyncIterator[list[NotionPage]],
+    log_tool: LogTool,
+) -> AsyncIterator[str]:
+    count: int = 0
+    try:
+        batch: list[NotionPage] = first_batch
+        while True:
+            count += len(batch)
+            yield "".join(json.dumps(page.to_dict()) + "\n" for page in batch)
+            batch = await batches.__anext__()
+    except StopAsyncIteration:
+        log_tool.info(f"Páginas enviadas: {count}")
+    except Exception as e:
+        error_msg: str = e.args[0] if len(e.args) > 0 else str(e)
+        log_tool.error(f"Erro ao consultar páginas após {count} páginas: {error_msg}")
+        yield json.dumps({"Message": error_msg}) + "\n"
+    finally:
+        await batches.aclose()
+
+
 @router.put(
     "/pages/{page_id}/update",
     tags=["Notion Page Management"],
@@ -734,8 +988,8 @@ async def update_page(
         },
     ),
     log_tool: LogTool = Depends(Provide[Container.log_tool]),
-    notion_page_manager: NotionPageManager = Depends(
-        Provide[Container.notion_page_manager]
+    notion_page_manager: AsyncNotionPageManager = Depends(
+        Provide[Container.async_notion_page_manager]
     ),
 ):
     """
@@ -755,10 +1009,10 @@ async def update_page(
                 )
             )
         notion_page: NotionPage = NotionPage(notion_icon, page_properties, [])
-        log_tool.info(f"Payload: {notion_page}")
-        response: dict = notion_page_manager.update_page_by_id(token, page_id, notion_page)
-        log_tool.info(f"Resposta da API do Notion: {response}")
-        return {"Message": f"Página {page_id} atualizada com sucesso."}
+        log_tool.info(f"Payload: {len(page_properties)} propriedades.")
+        response: dict = await notion_page_manager.update_page_by_id(token, page_id, notion_page)
+        log_tool.info(f"Resposta da API do Notion recebida. ID: {response['id']}")
+        return build_json_response({"Message": f"Página {page_id} atualizada com sucesso."})
     except ValidationException as ve:
         error_msg: str = ve.args[0]
         log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
@@ -785,6 +1039,134 @@ async def update_page(
         )
 
 
+@router.patch(
+    "/pages/{page_id}/append",
+    tags=["Notion Page Management"],
+    responses={
+        200: {
+            "description": "Success",
+            "content": {"application/json": {"example": {"appended_blocks": 150}}},
+        },
+        400: {
+            "description": "Bad Request",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "Message": "Invalid request",
+                        "StackTrace": "Traceback...",
+                    }
+                }
+            },
+        },
+        403: {
+            "description": "Forbidden",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Not authenticated",
+                    }
+                }
+            },
+        },
+        500: {
+            "description": "Internal Server Error",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "Message": "Page 6f48b54c-094d-4339-aa90-89f9985fb6c7 was written up to block 200 of 350: ...",
+                        "StackTrace": "Traceback...",
+                        "PageId": "6f48b54c-094d-4339-aa90-89f9985fb6c7",
+                        "NextBlockIndex": 200,
+                    }
+                }
+            },
+        },
+    },
+)
+@inject
+async def append_blocks(
+    token: str = Depends(get_token),
+    page_id: str = Path(
+        ...,
+        title="Page ID",
+        description="ID da página do Notion",
+        example="6f48b54c-094d-4339-aa90-89f9985fb6c7",
+    ),
+    body: dict = Body(
+        ...,
+        example={
+            "blocks": [
+                {"type": "paragraph", "value": "Este é um parágrafo."},
+                {"type": "quote", "value": "Citação"},
+            ],
+            "start_index": 0,
+        },
+    ),
+    log_tool: LogTool = Depends(Provide[Container.log_tool]),
+    notion_page_manager: AsyncNotionPageManager = Depends(
+        Provide[Container.async_notion_page_manager]
+    ),
+):
+    """
+    Adiciona blocos ao final de uma página no Notion, a partir de blocks[start_index].
+
+    Para retomar uma criação interrompida, envie os mesmos blocos e o NextBlockIndex retornado no erro.
+    """
+    try:
+        log_tool.info("Adicionando blocos à página no Notion.")
+        assert page_id is not None, "ID da página não pode ser nulo."
+        assert "blocks" in body, "Blocos não podem ser nulos."
+        page_blocks: list[NotionPageBlock] = []
+        for block in body["blocks"]:
+            page_blocks.append(
+                NotionPageBlock(block_type=block["type"], value=block["value"])
+            )
+        start_index: int = int(body.get("start_index", 0))
+        notion_page: NotionPage = NotionPage(None, [], page_blocks)
+        appended_blocks: int = await notion_page_manager.append_blocks(
+            token, page_id, notion_page, start_index
+        )
+        log_tool.info(f"Blocos adicionados à página {page_id}: {appended_blocks}")
+        return build_json_response({"appended_blocks": appended_blocks})
+    except PartialWriteException as pwe:
+        log_tool.error(f"Blocos adicionados parcialmente: {pwe.message}")
+        stack_trace: str = traceback.format_exc()
+        log_tool.error(f"Traceback: {stack_trace}")
+        return JSONResponse(
+            content={
+                "Message": pwe.message,
+                "StackTrace": stack_trace,
+                "PageId": pwe.page_id,
+                "NextBlockIndex": pwe.next_block_index,
+            },
+            status_code=500,
+        )
+    except ValidationException as ve:
+        error_msg: str = ve.args[0]
+        log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
+        stack_trace: str = traceback.format_exc()
+        log_tool.error(f"Traceback: {stack_trace}")
+        return JSONResponse(
+            content={
+                "Message": error_msg,
+                "StackTrace": stack_trace,
+            },
+            status_code=400,
+        )
+    except Exception as e:
+        error_msg: str = e.args[0]
+        log_tool.error(f"Erro ao adicionar blocos: {error_msg}")
+        stack_trace: str = traceback.format_exc()
+        log_tool.error(f"Traceback: {stack_trace}")
+        return JSONResponse(
+            content={
+                "Message": error_msg,
+                "StackTrace": stack_trace,
+            },
+            status_code=500,
+        )
+
+
 @router.patch(
     "/pages/{page_id}/archive",
     tags=["Notion Page Management"],
@@ -843,8 +1225,8 @@ async def archive_page(
         example="6f48b54c-094d-4339-aa90-89f9985fb6c7",
     ),
     log_tool: LogTool = Depends(Provide[Container.log_tool]),
-    notion_page_manager: NotionPageManager = Depends(
-        Provide[Container.notion_page_manager]
+    notion_page_manager: AsyncNotionPageManager = Depends(
+        Provide[Container.async_notion_page_manager]
     ),
 ):
     """
@@ -853,9 +1235,9 @@ async def archive_page(
     try:
         log_tool.info("Atualizando página no Notion.")
         assert page_id is not None, "ID da página não pode ser nulo."
-        response: dict = notion_page_manager.archive_page_by_id(token, page_id)
-        log_tool.info(f"Resposta da API do Notion: {response}")
-        return {"Message": f"Página {page_id} arquivada com sucesso."}
+        response: dict = await notion_page_manager.archive_page_by_id(token, page_id)
+        log_tool.info(f"Resposta da API do Notion recebida. ID: {response['id']}")
+        return build_json_response({"Message": f"Página {page_id} arquivada com sucesso."})
     except ValidationException as ve:
         error_msg: str = ve.args[0]
         log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
@@ -940,8 +1322,8 @@ async def unarchive_page(
         example="6f48b54c-094d-4339-aa90-89f9985fb6c7",
     ),
     log_tool: LogTool = Depends(Provide[Container.log_tool]),
-    notion_page_manager: NotionPageManager = Depends(
-        Provide[Container.notion_page_manager]
+    notion_page_manager: AsyncNotionPageManager = Depends(
+        Provide[Container.async_notion_page_manager]
     ),
 ):
     """
@@ -950,9 +1332,9 @@ async def unarchive_page(
     try:
         log_tool.info("Desarquivando página no Notion.")
         assert page_id is not None, "ID da página não pode ser nulo."
-        response: dict = notion_page_manager.unarchive_page_by_id(token, page_id)
-        log_tool.info(f"Resposta da API do Notion: {response}")
-        return {"Message": f"Página {page_id} recuperada com sucesso."}
+        response: dict = await notion_page_manager.unarchive_page_by_id(token, page_id)
+        log_tool.info(f"Resposta da API do Notion recebida. ID: {response['id']}")
+        return build_json_response({"Message": f"Página {page_id} recuperada com sucesso."})
     except ValidationException as ve:
         error_msg: str = ve.args[0]
         log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
@@ -1,14 +1,19 @@
 import traceback
 from dependency_injector.wiring import inject, Provide
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from main.entrypoint.middleware.core.auth_middleware import get_token
+from main.entrypoint.utils.responses.fast_json_response import build_json_response
 from main.library.di_container import Container
-from main.library.repositories.notion.core.notion_searcher import NotionSearcher
+from main.library.repositories.notion.core.async_notion_searcher import (
+    AsyncNotionSearcher,
+)
+from main.library.repositories.notion.core.notion_mirror import NotionMirror
 from main.library.repositories.notion.models.notion_search_result import (
     NotionSearchResult,
 )
 from main.library.tools.core.log_tool import LogTool
-from fastapi import APIRouter, Body, Depends
+from fastapi import APIRouter, Body, Depends, Query
 from main.library.utils.models.validation_exception import ValidationException
 
 router = APIRouter()
@@ -76,18 +81,41 @@ async def search(
         title="Query",
         description="Termo de busca",
     ),
+    source: str = Query(
+        "notion",
+        title="Source",
+        description="notion: busca de títulos na API do Notion. mirror: busca de texto completo (título, propriedades e blocos) nos bancos espelhados com este token, aceitando query, page_size, offset e database_id",
+    ),
     log_tool: LogTool = Depends(Provide[Container.log_tool]),
-    notion_searcher: NotionSearcher = Depends(Provide[Container.notion_searcher]),
+    notion_searcher: AsyncNotionSearcher = Depends(
+        Provide[Container.async_notion_searcher]
+    ),
+    notion_mirror: NotionMirror = Depends(Provide[Container.notion_mirror]),
 ):
     """
     Buscar uma página ou banco de dados no Notion.
+
+    Com source=mirror, a busca é respondida pelo índice de texto completo do espelho local, ordenada por relevância.
     """
     try:
         log_tool.info("Buscando página no Notion.")
         assert query is not None, "Query não pode ser nula."
-        result: NotionSearchResult = notion_searcher.search(token, query)
-        log_tool.info(f"Páginas retornadas: \n{result}")
-        return result
+        assert source in ("notion", "mirror"), "Source deve ser notion ou mirror."
+        if source == "mirror":
+            assert isinstance(query.get("query"), str), "Termo de busca não pode ser nulo."
+            mirror_result: dict = await run_in_threadpool(
+                notion_mirror.search_pages,
+                token,
+                query["query"],
+                query.get("database_id"),
+                int(query.get("page_size") or 20),
+                int(query.get("offset") or 0),
+            )
+            log_tool.info(f"Páginas retornadas do espelho: {len(mirror_result['results'])}")
+            return build_json_response(mirror_result)
+        result: NotionSearchResult = await notion_searcher.search(token, query)
+        log_tool.info(f"Páginas retornadas: {result.count()}")
+        return build_json_response(result.to_dict())
     except ValidationException as ve:
         error_msg: str = ve.args[0]
         log_tool.error(f"Erro ao validar os dados da requisição: {error_msg}")
@@ -1,10 +1,15 @@
 import sys, os
 
 sys.path.insert(0, os.path.abspath("."))
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from main.library.utils.core.settings_helper import load_environment, get
 import uvicorn
-from main.library.di_container import Container
+from main.library.di_container import (
+    Container,
+    shutdown_resources,
+    startup_resources,
+)
 from main.entrypoint.controllers.main_controller import router as main_controller_router
 from main.entrypoint.controllers.notion.notion_page_manager_controller import (
     router as notion_page_manager_controller_router,
@@ -15,26 +20,44 @@ from main.entrypoint.controllers.notion.notion_database_manager_controller impor
 from main.entrypoint.controllers.notion.notion_searcher_controller import (
     router as notion_searcher_controller_router,
 )
+from main.entrypoint.controllers.notion.notion_mirror_controller import (
+    router as notion_mirror_controller_router,
+)
 from main.entrypoint.controllers.character_ai_controller import (
     router as character_ai_controller_router,
 )
 from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
+from main.entrypoint.middleware.core.metrics_middleware import MetricsMiddleware
+from main.entrypoint.middleware.core.tracing_middleware import TracingMiddleware
 
 load_environment(get("environment"))
 container = Container()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await startup_resources(container)
+    yield
+    await shutdown_resources(container)
+
+
 app = FastAPI(
     title="Micro Tools Api",
     description="Micro ferramentas para auxiliar no desenvolvimento de aplicações",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 app.container = container
+app.add_middleware(MetricsMiddleware, metrics_tool=container.metrics_tool())
+app.add_middleware(TracingMiddleware, tracing_tool=container.tracing_tool())
 app.include_router(main_controller_router)
 app.include_router(notion_page_manager_controller_router)
 app.include_router(notion_database_manager_controller_router)
 app.include_router(notion_searcher_controller_router)
+app.include_router(notion_mirror_controller_router)
 app.include_router(character_ai_controller_router)
 
 if __name__ == "__main__":
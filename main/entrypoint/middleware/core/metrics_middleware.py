@@ -0,0 +1,43 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from main.library.tools.core.metrics_tool import MetricsTool
+
+
+class MetricsMiddleware:
+    """
+    Records the duration of every HTTP request, labelled by method, route template and status.
+
+    The duration runs until the last body chunk is sent, so streamed responses are measured
+    whole. Requests matching no route are labelled with the route "unmatched".
+    """
+
+    def __init__(self, app: ASGIApp, metrics_tool: MetricsTool):
+        self.app: ASGIApp = app
+        self.metrics_tool: MetricsTool = metrics_tool
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started_at: float = time.perf_counter()
+        status: list[int] = [500]
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            self.metrics_tool.observe(
+                "http_server_request_duration_seconds",
+                {
+                    "method": scope["method"],
+                    "route": getattr(route, "path", "unmatched"),
+                    "status": str(status[0]),
+                },
+                time.perf_counter() - started_at,
+                "Duration of each request served by this API",
+            )
@@ -0,0 +1,59 @@
+import re, uuid
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from main.library.tools.core.tracing_tool import TracingTool
+
+# Ids sent by callers are reused only if they are safe to log and echo back.
+REQUEST_ID_PATTERN: re.Pattern = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+class TracingMiddleware:
+    """
+    Gives every HTTP request an id and traces it as the root span of its spans.
+
+    The id comes from the X-Request-Id header when the caller sends a valid one, and is
+    generated otherwise. It is returned in the X-Request-Id response header, logged with
+    every record written while serving the request and forwarded by HttpClientTool. The
+    root span is named after the route template and ends when the last body chunk is sent.
+    """
+
+    def __init__(self, app: ASGIApp, tracing_tool: TracingTool):
+        self.app: ASGIApp = app
+        self.tracing_tool: TracingTool = tracing_tool
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id: str = get_request_id(scope)
+
+        with self.tracing_tool.start_trace(
+            request_id, scope["method"], method=scope["method"]
+        ) as span:
+
+            async def send_with_request_id(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-request-id", request_id.encode("latin-1"))
+                    ]
+                    if span is not None:
+                        span.set_attribute("status", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_request_id)
+            finally:
+                if span is not None:
+                    route = scope.get("route")
+                    endpoint = scope.get("endpoint")
+                    span.name = f"{scope['method']} {getattr(route, 'path', 'unmatched')}"
+                    if endpoint is not None:
+                        span.set_attribute("controller", endpoint.__name__)
+
+
+def get_request_id(scope: Scope) -> str:
+    for name, value in scope.get("headers", []):
+        if name == b"x-request-id":
+            request_id: str = value.decode("latin-1")
+            if REQUEST_ID_PATTERN.match(request_id):
+                return request_id
+    return uuid.uuid4().hex
@@ -0,0 +1,17 @@
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    A StreamingResponse whose body may be produced while the request body is still being read.
+
+    StreamingResponse listens for the client disconnect by consuming `receive`, which would
+    swallow the request body chunks. Here the disconnect surfaces through `request.stream()`
+    instead, as a ClientDisconnect raised into the body iterator.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
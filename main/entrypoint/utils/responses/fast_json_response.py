@@ -0,0 +1,59 @@
+import json
+from typing import Any
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from main.library.utils.core.settings_helper import get
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+
+def to_jsonable(obj: Any) -> Any:
+    """
+    Fallback for objects the JSON encoder does not know: our models through their
+    `to_dict`, and plain classes (e.g. CharacterAiResponse) through their attributes.
+    """
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if hasattr(obj, "__dict__"):
+        return vars(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=to_jsonable)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=to_jsonable,
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    A JSONResponse that writes its content straight to bytes with orjson (or the json
+    module when orjson is missing), skipping FastAPI's recursive jsonable_encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def is_fast_json_response_enabled() -> bool:
+    return (get("FAST_JSON_RESPONSE") or "true").lower() != "false"
+
+
+def build_json_response(content: Any, status_code: int = 200) -> JSONResponse:
+    """
+    Builds the response of a route, with FastJSONResponse unless FAST_JSON_RESPONSE is "false".
+
+    :param content: JSON-ready content, e.g. the output of a model's `to_dict`.
+    """
+    if is_fast_json_response_enabled():
+        return FastJSONResponse(content, status_code=status_code)
+    return JSONResponse(jsonable_encoder(content), status_code=status_code)
@@ -1,15 +1,42 @@
+import inspect
+from typing import Any, Callable
 from dependency_injector import providers, containers
+from main.library.repositories.notion.core.async_notion_block_manager import (
+    AsyncNotionBlockManager,
+)
+from main.library.repositories.notion.core.async_notion_database_manager import (
+    AsyncNotionDatabaseManager,
+)
+from main.library.repositories.notion.core.async_notion_page_manager import (
+    AsyncNotionPageManager,
+)
+from main.library.repositories.notion.core.async_notion_searcher import (
+    AsyncNotionSearcher,
+)
+from main.library.repositories.notion.core.async_notion_transport import (
+    AsyncNotionTransport,
+)
 from main.library.repositories.notion.core.notion_block_manager import (
     NotionBlockManager,
 )
 from main.library.repositories.notion.core.notion_database_manager import (
     NotionDatabaseManager,
 )
+from main.library.repositories.notion.core.notion_mirror import NotionMirror
 from main.library.repositories.notion.core.notion_page_manager import NotionPageManager
+from main.library.repositories.notion.core.notion_rate_limiter import (
+    NotionRateLimiter,
+)
 from main.library.repositories.notion.core.notion_searcher import NotionSearcher
+from main.library.repositories.notion.core.notion_transport import NotionTransport
+from main.library.tools.core.character_ai_pool_tool import CharacterAiPoolTool
 from main.library.tools.core.character_ai_tool import CharacterAiTool
+from main.library.tools.core.connection_pool_tool import ConnectionPoolTool
 from main.library.tools.core.http_client_tool import HttpClientTool
 from main.library.tools.core.log_tool import LogTool
+from main.library.tools.core.lru_cache_tool import LruCacheTool
+from main.library.tools.core.metrics_tool import MetricsTool
+from main.library.tools.core.tracing_tool import TracingTool
 from main.library.tools.core.settings_tool import SettingsTool
 
 
@@ -19,37 +46,129 @@ class Container(containers.DeclarativeContainer):
 
     This class extends the `containers.DeclarativeContainer` class from the `dependency_injector` module.
     It provides instances for each services of the system.
+
+    Every service is a singleton, so pools, caches and clients are created once per worker
+    and shared between requests. Services keep no per-request state; settings are read on
+    each call. `startup_resources` and `shutdown_resources` run from the FastAPI lifespan.
     """
 
-    log_tool = providers.Factory(LogTool)
-    settings_tool = providers.Factory(SettingsTool)
-    http_client_tool = providers.Factory(
-        HttpClientTool, settings_tool=settings_tool, log_tool=log_tool
+    log_tool = providers.Singleton(LogTool)
+    settings_tool = providers.Singleton(SettingsTool)
+    metrics_tool = providers.Singleton(
+        MetricsTool, settings_tool=settings_tool, log_tool=log_tool
+    )
+    tracing_tool = providers.Singleton(
+        TracingTool, settings_tool=settings_tool, log_tool=log_tool
+    )
+    http_client_tool = providers.Singleton(
+        HttpClientTool,
+        settings_tool=settings_tool,
+        log_tool=log_tool,
+        metrics_tool=metrics_tool,
+    )
+    connection_pool_tool = providers.Singleton(
+        ConnectionPoolTool, settings_tool=settings_tool, log_tool=log_tool
     )
 
-    notion_block_manager = providers.Factory(
-        NotionBlockManager, settings_tool=settings_tool, log_tool=log_tool
+    notion_rate_limiter = providers.Singleton(
+        NotionRateLimiter, settings_tool=settings_tool, log_tool=log_tool
+    )
+    notion_transport = providers.Singleton(
+        NotionTransport,
+        settings_tool=settings_tool,
+        log_tool=log_tool,
+        connection_pool_tool=connection_pool_tool,
+        notion_rate_limiter=notion_rate_limiter,
+        metrics_tool=metrics_tool,
     )
-    notion_page_manager = providers.Factory(
+    notion_block_manager = providers.Singleton(
+        NotionBlockManager,
+        settings_tool=settings_tool,
+        log_tool=log_tool,
+        notion_transport=notion_transport,
+    )
+    notion_page_manager = providers.Singleton(
         NotionPageManager,
         settings_tool=settings_tool,
         log_tool=log_tool,
         notion_block_manager=notion_block_manager,
+        notion_transport=notion_transport,
     )
-    notion_database_manager = providers.Factory(
+    notion_database_manager = providers.Singleton(
         NotionDatabaseManager,
         settings_tool=settings_tool,
         log_tool=log_tool,
+        notion_transport=notion_transport,
     )
-    notion_searcher = providers.Factory(
+    notion_searcher = providers.Singleton(
         NotionSearcher,
         settings_tool=settings_tool,
         log_tool=log_tool,
+        notion_transport=notion_transport,
+    )
+    async_notion_transport = providers.Singleton(
+        AsyncNotionTransport,
+        settings_tool=settings_tool,
+        log_tool=log_tool,
+        notion_rate_limiter=notion_rate_limiter,
+        metrics_tool=metrics_tool,
+    )
+    async_notion_block_manager = providers.Singleton(
+        AsyncNotionBlockManager,
+        settings_tool=settings_tool,
+        log_tool=log_tool,
+        async_notion_transport=async_notion_transport,
+    )
+    notion_page_cache = providers.Singleton(
+        LruCacheTool,
+        settings_tool=settings_tool,
+        log_tool=log_tool,
+        prefix="NOTION_PAGE_CACHE",
+    )
+    async_notion_page_manager = providers.Singleton(
+        AsyncNotionPageManager,
+        settings_tool=settings_tool,
+        log_tool=log_tool,
+        async_notion_block_manager=async_notion_block_manager,
+        async_notion_transport=async_notion_transport,
+        notion_page_cache=notion_page_cache,
+    )
+    notion_database_cache = providers.Singleton(
+        LruCacheTool,
+        settings_tool=settings_tool,
+        log_tool=log_tool,
+        prefix="NOTION_DATABASE_CACHE",
     )
-    character_ai_tool = providers.Factory(
+    async_notion_database_manager = providers.Singleton(
+        AsyncNotionDatabaseManager,
+        settings_tool=settings_tool,
+        log_tool=log_tool,
+        async_notion_transport=async_notion_transport,
+        notion_database_cache=notion_database_cache,
+    )
+    async_notion_searcher = providers.Singleton(
+        AsyncNotionSearcher,
+        settings_tool=settings_tool,
+        log_tool=log_tool,
+        async_notion_transport=async_notion_transport,
+    )
+    notion_mirror = providers.Singleton(
+        NotionMirror,
+        settings_tool=settings_tool,
+        log_tool=log_tool,
+        async_notion_page_manager=async_notion_page_manager,
+    )
+    character_ai_pool_tool = providers.Singleton(
+        CharacterAiPoolTool,
+        settings_tool=settings_tool,
+        log_tool=log_tool,
+    )
+    character_ai_tool = providers.Singleton(
         CharacterAiTool,
         settings_tool=settings_tool,
         log_tool=log_tool,
+        character_ai_pool_tool=character_ai_pool_tool,
+        metrics_tool=metrics_tool,
     )
 
     wiring_config = containers.WiringConfiguration(
@@ -58,6 +177,87 @@ class Container(containers.DeclarativeContainer):
             "main.entrypoint.controllers.notion.notion_page_manager_controller",
             "main.entrypoint.controllers.notion.notion_database_manager_controller",
             "main.entrypoint.controllers.notion.notion_searcher_controller",
+            "main.entrypoint.controllers.notion.notion_mirror_controller",
             "main.entrypoint.controllers.character_ai_controller",
         ]
     )
+
+
+async def startup_resources(container: Container) -> None:
+    """
+    Creates every singleton of the container before the first request is served.
+
+    A misconfigured service then fails at startup instead of on the first request using it.
+    """
+    for provider in container.traverse(types=[providers.Singleton]):
+        provider()
+    register_metrics(container)
+
+
+def register_metrics(container: Container) -> None:
+    """
+    Exposes the stats kept by the shared services through the metrics tool.
+    """
+    metrics_tool: MetricsTool = container.metrics_tool()
+    metrics_tool.register_stats(
+        "notion_transport",
+        container.notion_transport().get_stats,
+        counters=("retry_count", "retry_wait_seconds"),
+    )
+    metrics_tool.register_stats(
+        "notion_async_transport",
+        container.async_notion_transport().get_stats,
+        counters=("retry_count", "retry_wait_seconds", "coalesced_count"),
+    )
+    metrics_tool.register_stats(
+        "notion_rate_limiter",
+        container.notion_rate_limiter().get_stats,
+        counters=("wait_count", "wait_seconds"),
+    )
+    for prefix, cache in (
+        ("notion_page_cache", container.notion_page_cache()),
+        ("notion_database_cache", container.notion_database_cache()),
+    ):
+        metrics_tool.register_stats(
+            prefix,
+            cache.get_stats,
+            counters=("hits", "misses", "evictions", "coalesced"),
+        )
+    # The Notion routes are served by the async transport's httpx client; the synchronous
+    # pool only backs NotionTransport.
+    metrics_tool.register_stats(
+        "http_pool", container.async_notion_transport().get_pool_stats
+    )
+    metrics_tool.register_stats(
+        "http_sync_pool", container.connection_pool_tool().get_stats
+    )
+    metrics_tool.register_stats(
+        "character_ai_pool", container.character_ai_pool_tool().get_stats
+    )
+    metrics_tool.register_stats(
+        "log", container.log_tool().get_stats, counters=("dropped", "failed")
+    )
+
+
+async def shutdown_resources(container: Container) -> None:
+    """
+    Closes the pools, clients and files held by the container's singletons.
+
+    A failing step is logged and does not keep the following ones from running.
+    """
+    log_tool: LogTool = container.log_tool()
+    steps: list[tuple[str, Callable[[], Any]]] = [
+        ("async Notion transport", lambda: container.async_notion_transport().aclose()),
+        ("Character AI pool", lambda: container.character_ai_pool_tool().aclose()),
+        ("Notion mirror", lambda: container.notion_mirror().close()),
+        ("HTTP connection pool", lambda: container.connection_pool_tool().close()),
+        ("tracing exporter", lambda: container.tracing_tool().close()),
+    ]
+    for name, step in steps:
+        try:
+            result: Any = step()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            log_tool.error(f"Error closing {name}: {e}")
+    log_tool.flush()
@@ -0,0 +1,73 @@
+import sys, os
+
+from main.library.tools.core.log_tool import LogTool
+
+sys.path.insert(0, os.path.abspath("."))
+
+from main.library.repositories.notion.core.async_notion_transport import (
+    AsyncNotionTransport,
+)
+from main.library.repositories.notion.utils.notion_factory import (
+    build_blocks_from_response,
+)
+from main.library.repositories.notion.models.notion_page_block import NotionPageBlock
+from main.library.tools.core.settings_tool import SettingsTool
+from main.library.tools.core.tracing_tool import traced
+
+
+class AsyncNotionBlockManager:
+    def __init__(
+        self,
+        settings_tool: SettingsTool,
+        log_tool: LogTool,
+        async_notion_transport: AsyncNotionTransport,
+    ):
+        self.settings_tool: SettingsTool = settings_tool
+        self.log_tool: LogTool = log_tool
+        self.async_notion_transport: AsyncNotionTransport = async_notion_transport
+
+    @traced()
+    async def read_page_blocks_by_page_id(
+        self,
+        token: str,
+        page_id: str,
+        page_size: int = 100,
+        start_cursor: str = None,
+        skip_unknown_types: bool = False,
+    ) -> dict:
+        assert token is not None, "Token cannot be None"
+        assert page_id is not None, "Page ID cannot be None"
+        notion_database_uri: str = (
+            f"/v1/blocks/{page_id}/children?page_size={page_size}"
+        )
+        if start_cursor is not None:
+            notion_database_uri += f"&start_cursor={start_cursor}"
+        response_dict: dict = await self.async_notion_transport.request(
+            token, "GET", notion_database_uri
+        )
+        assert "results" in response_dict, "Results cannot be None"
+        assert response_dict["results"] is not None, "Results cannot be None"
+        blocks: list[NotionPageBlock] = build_blocks_from_response(
+            response_dict["results"], skip_unknown_types
+        )
+        blocks_response: dict = {
+            "has_more": response_dict["has_more"],
+            "next_cursor": response_dict["next_cursor"],
+            "blocks": blocks,
+        }
+        return blocks_response
+
+    @traced()
+    async def append_block_children(
+        self, token: str, block_id: str, children: list[dict]
+    ) -> dict:
+        assert token is not None, "Token cannot be None"
+        assert block_id is not None, "Block ID cannot be None"
+        assert children is not None, "Children cannot be None"
+        assert len(children) > 0, "Children cannot be empty"
+        notion_database_uri: str = f"/v1/blocks/{block_id}/children"
+        body: dict = {"children": children}
+        response_dict: dict = await self.async_notion_transport.request(
+            token, "PATCH", notion_database_uri, body
+        )
+        return response_dict
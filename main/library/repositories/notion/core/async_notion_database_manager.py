@@ -0,0 +1,121 @@
+import copy, hashlib, os, sys
+
+from main.library.repositories.notion.core.async_notion_transport import (
+    AsyncNotionTransport,
+)
+
+sys.path.insert(0, os.path.abspath("."))
+from main.library.repositories.notion.models.notion_database import NotionDatabase
+from main.library.tools.core.log_tool import LogTool
+from main.library.tools.core.lru_cache_tool import LruCacheTool
+from main.library.tools.core.settings_tool import SettingsTool
+from main.library.tools.core.tracing_tool import traced
+
+
+class AsyncNotionDatabaseManager:
+    """
+    Creates, reads, updates and archives Notion databases.
+
+    When given a schema cache, read_database_by_id keeps each schema per database and token
+    for NOTION_DATABASE_CACHE_TTL seconds, and concurrent misses share one Notion call.
+    Updating, archiving or unarchiving a database drops its schema for every token.
+    """
+
+    def __init__(
+        self,
+        settings_tool: SettingsTool,
+        log_tool: LogTool,
+        async_notion_transport: AsyncNotionTransport,
+        notion_database_cache: LruCacheTool | None = None,
+    ):
+        self.settings_tool = settings_tool
+        self.log_tool = log_tool
+        self.async_notion_transport = async_notion_transport
+        self.notion_database_cache = notion_database_cache
+
+    @traced()
+    async def create_database(
+        self, token: str, page_id: str, database: NotionDatabase
+    ) -> dict:
+        assert token is not None, "Token cannot be None"
+        assert page_id is not None, "Page ID cannot be None"
+        assert database is not None, "Database cannot be None"
+        database.parent_id = page_id
+        notion_database_uri: str = f"/v1/databases"
+        body: dict = database.to_create_payload()
+        response_dict: dict = await self.async_notion_transport.request(
+            token, "POST", notion_database_uri, body
+        )
+        return response_dict
+
+    @traced()
+    async def read_database_by_id(self, token: str, database_id: str) -> NotionDatabase:
+        assert token is not None, "Token cannot be None"
+        assert database_id is not None, "Database ID cannot be None"
+        if self.notion_database_cache is None:
+            return await self.__fetch_database(token, database_id)
+        # Keyed by token too, so a schema is only served to tokens Notion showed it to.
+        key: tuple[str, str] = (database_id, hashlib.sha256(token.encode()).hexdigest())
+        database: NotionDatabase = await self.notion_database_cache.get_or_load(
+            key,
+            lambda: self.__fetch_database(token, database_id),
+            lambda database: sys.getsizeof(repr(database)),
+        )
+        # Callers may modify the schema they get back, so they each get their own copy.
+        return copy.deepcopy(database)
+
+    @traced()
+    async def __fetch_database(self, token: str, database_id: str) -> NotionDatabase:
+        notion_database_uri: str = f"/v1/databases/{database_id}"
+        response_dict: dict = await self.async_notion_transport.request(
+            token, "GET", notion_database_uri
+        )
+        database: NotionDatabase = NotionDatabase.from_read_response(response_dict)
+        return database
+
+    def get_cache_stats(self) -> dict | None:
+        if self.notion_database_cache is None:
+            return None
+        return self.notion_database_cache.get_stats()
+
+    def __invalidate(self, database_id: str) -> None:
+        if self.notion_database_cache is not None:
+            self.notion_database_cache.delete_where(lambda key: key[0] == database_id)
+
+    @traced()
+    async def update_database(
+        self, token: str, database_id: str, database: NotionDatabase
+    ) -> dict:
+        assert token is not None, "Token cannot be None"
+        assert database is not None, "Database cannot be None"
+        notion_database_uri: str = f"/v1/databases/{database_id}"
+        body: dict = database.to_update_payload()
+        response_dict: dict = await self.async_notion_transport.request(
+            token, "PATCH", notion_database_uri, body
+        )
+        self.__invalidate(database_id)
+        return response_dict
+
+    @traced()
+    async def archive_database(self, token: str, database_id: str) -> dict:
+        assert token is not None, "Token cannot be None"
+        assert database_id is not None, "Database ID cannot be None"
+        notion_database_uri: str = f"/v1/databases/{database_id}"
+        body: dict = {"archived": True}
+        response_dict: dict = await self.async_notion_transport.request(
+            token, "PATCH", notion_database_uri, body
+        )
+        self.__invalidate(database_id)
+        return response_dict
+
+    @traced()
+    async def unarchive_database(self, token: str, database_id: str) -> dict:
+        assert token is not None, "Token cannot be None"
+        assert database_id is not None, "Database ID cannot be None"
+        notion_database_uri: str = f"/v1/databases/{database_id}"
+        body: dict = {"archived": False}
+        response_dict: dict = await self.async_notion_transport.request(
+            token, "PATCH", notion_database_uri, body
+        )
+        self.__invalidate(database_id)
+        return response_dict
@@ -0,0 +1,545 @@
+import sys, os, asyncio, copy
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterable, AsyncIterator, Iterable
+
+from main.library.repositories.notion.core.async_notion_block_manager import (
+    AsyncNotionBlockManager,
+)
+from main.library.repositories.notion.core.async_notion_transport import (
+    AsyncNotionTransport,
+)
+from main.library.repositories.notion.models.notion_page_block import NotionPageBlock
+from main.library.repositories.notion.utils.notion_factory import (
+    build_blocks_for_request,
+    build_icon_for_request,
+    build_page_from_response,
+    build_properties_for_request,
+)
+
+sys.path.insert(0, os.path.abspath("."))
+from main.library.repositories.notion.models.notion_page import NotionPage
+from main.library.tools.core.log_tool import LogTool
+from main.library.tools.core.lru_cache_tool import LruCacheTool
+from main.library.tools.core.settings_tool import SettingsTool
+from main.library.tools.core.tracing_tool import traced
+from main.library.utils.models.partial_write_exception import PartialWriteException
+
+
+class AsyncNotionPageManager:
+    """
+    Creates, reads, queries and updates Notion pages.
+
+    Notion accepts at most MAX_CHILDREN_PER_REQUEST children per request, so longer pages
+    are created with the first batch inline and the rest appended in order.
+
+    When given a page cache, read_page_by_id keeps each page's block tree keyed by page id
+    and reuses it while the page's last_edited_time is unchanged.
+    """
+
+    MAX_CHILDREN_PER_REQUEST: int = 100
+    # Notion rounds last_edited_time down to the minute.
+    LAST_EDITED_TIME_PRECISION: timedelta = timedelta(minutes=1)
+
+    def __init__(
+        self,
+        settings_tool: SettingsTool,
+        log_tool: LogTool,
+        async_notion_block_manager: AsyncNotionBlockManager,
+        async_notion_transport: AsyncNotionTransport,
+        notion_page_cache: LruCacheTool | None = None,
+    ):
+        self.settings_tool: SettingsTool = settings_tool
+        self.log_tool: LogTool = log_tool
+        self.async_notion_block_manager: AsyncNotionBlockManager = (
+            async_notion_block_manager
+        )
+        self.async_notion_transport: AsyncNotionTransport = async_notion_transport
+        self.notion_page_cache: LruCacheTool | None = notion_page_cache
+
+    @traced()
+    async def create_page(self, token: str, page: NotionPage, database_id: str):
+        assert page is not None, "Page cannot be None"
+        assert token is not None, "Token cannot be None"
+        assert database_id is not None, "Database ID cannot be None"
+        assert page.properties is not None, "Page properties cannot be None"
+        assert len(page.properties) > 0, "Page properties cannot be empty"
+        assert page.blocks is not None, "Page blocks cannot be None"
+        notion_database_uri: str = f"/v1/pages"
+        icon: dict = build_icon_for_request(page)
+        properties: dict = build_properties_for_request(page)
+        blocks: list = build_blocks_for_request(page)
+        body: dict = {
+            "parent": {"database_id": database_id},
+            "icon": icon,
+            "properties": properties,
+            "children": blocks[: self.MAX_CHILDREN_PER_REQUEST],
+        }
+        response_dict: dict = await self.async_notion_transport.request(
+            token, "POST", notion_database_uri, body
+        )
+        if len(blocks) > self.MAX_CHILDREN_PER_REQUEST:
+            await self.__append_children(
+                token, response_dict["id"], blocks, self.MAX_CHILDREN_PER_REQUEST
+            )
+        return response_dict
+
+    @traced()
+    async def append_blocks(
+        self, token: str, page_id: str, page: NotionPage, start_index: int = 0
+    ) -> int:
+        """
+        Appends page.blocks[start_index:] to the end of an existing page, in order.
+
+        Resumes a create_page that raised PartialWriteException when given the exception's
+        page_id and next_block_index. Returns the number of blocks appended.
+        """
+        assert token is not None, "Token cannot be None"
+        assert page_id is not None, "Page ID cannot be None"
+        assert page is not None, "Page cannot be None"
+        assert page.blocks is not None, "Page blocks cannot be None"
+        assert 0 <= start_index <= len(page.blocks), "Start index is out of range"
+        blocks: list = build_blocks_for_request(page)
+        try:
+            await self.__append_children(token, page_id, blocks, start_index)
+        finally:
+            self.__invalidate(page_id)
+        return len(blocks) - start_index
+
+    @traced()
+    async def __append_children(
+        self, token: str, page_id: str, blocks: list, start_index: int
+    ) -> None:
+        # Each batch lands at the end of the page, so batches are sent one after the other.
+        for index in range(start_index, len(blocks), self.MAX_CHILDREN_PER_REQUEST):
+            try:
+                await self.async_notion_block_manager.append_block_children(
+                    token, page_id, blocks[index : index + self.MAX_CHILDREN_PER_REQUEST]
+                )
+            except Exception as e:
+                raise PartialWriteException(
+                    f"Page {page_id} was written up to block {index} of {len(blocks)}: {e}",
+                    page_id,
+                    index,
+                    e,
+                ) from e
+
+    async def create_pages(
+        self,
+        token: str,
+        pages: Iterable[NotionPage] | AsyncIterable[NotionPage],
+        database_id: str,
+    ) -> AsyncIterator[dict]:
+        """
+        Creates many pages, yielding one result per page as soon as it is done.
+
+        At most NOTION_BULK_CREATE_CONCURRENCY pages are in flight at a time, and `pages`
+        is only consumed as slots free up, so it can be a lazy stream. Results come in
+        completion order, as {"index": i, "page_id": ...} or {"index": i, "Message": ...}
+        where `index` is the position of the page in `pages`. A page whose blocks were only
+        partly appended also carries its page_id and next_block_index, to resume with
+        append_blocks. If reading `pages` fails,
+        the pages already in flight are finished and reported before the error is raised.
+        """
+        assert token is not None, "Token cannot be None"
+        assert pages is not None, "Pages cannot be None"
+        assert database_id is not None, "Database ID cannot be None"
+        concurrency: int = int(
+            self.settings_tool.get("NOTION_BULK_CREATE_CONCURRENCY") or 5
+        )
+        assert concurrency > 0, "NOTION_BULK_CREATE_CONCURRENCY must be greater than zero"
+        page_iterator: AsyncIterator[NotionPage] = self.__iterate(pages)
+        pending: set[asyncio.Task] = set()
+        index: int = 0
+        exhausted: bool = False
+        read_error: Exception | None = None
+        try:
+            while True:
+                while not exhausted and len(pending) < concurrency:
+                    try:
+                        page: NotionPage = await page_iterator.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    except Exception as e:
+                        # Stop reading, but still report the pages already sent to Notion.
+                        read_error = e
+                        exhausted = True
+                        break
+                    pending.add(
+                        asyncio.create_task(
+                            self.__create_page_result(token, page, database_id, index)
+                        )
+                    )
+                    index += 1
+                if len(pending) == 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+            if read_error is not None:
+                raise read_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def __create_page_result(
+        self, token: str, page: NotionPage, database_id: str, index: int
+    ) -> dict:
+        try:
+            response_dict: dict = await self.create_page(token, page, database_id)
+            return {"index": index, "page_id": response_dict["id"]}
+        except PartialWriteException as e:
+            self.log_tool.error(f"Error creating page {index}: {e.message}")
+            return {
+                "index": index,
+                "page_id": e.page_id,
+                "next_block_index": e.next_block_index,
+                "Message": e.message,
+            }
+        except Exception as e:
+            error_msg: str = str(e.args[0]) if len(e.args) > 0 else repr(e)
+            self.log_tool.error(f"Error creating page {index}: {error_msg}")
+            return {"index": index, "Message": error_msg}
+
+    async def __iterate(
+        self, pages: Iterable[NotionPage] | AsyncIterable[NotionPage]
+    ) -> AsyncIterator[NotionPage]:
+        if isinstance(pages, AsyncIterable):
+            async for page in pages:
+                yield page
+        else:
+            for page in pages:
+                yield page
+
+    @traced()
+    async def read_page_properties_by_page_id(self, token: str, page_id: str) -> NotionPage:
+        assert page_id is not None, "Page ID cannot be None"
+        assert token is not None, "Token cannot be None"
+        notion_database_uri: str = f"/v1/pages/{page_id}"
+        response_dict: dict = await self.async_notion_transport.request(
+            token, "GET", notion_database_uri
+        )
+        response_page: NotionPage = build_page_from_response(response_dict)
+        return response_page
+
+    @traced()
+    async def query_pages_by_database_id(
+        self,
+        token: str,
+        database_id: str,
+        filter: dict | None = None,
+        page_size: int = 100,
+        start_cursor: str | None = None,
+    ) -> list[NotionPage]:
+        assert database_id is not None, "Database ID cannot be None"
+        assert token is not None, "Token cannot be None"
+        response_dict: dict = await self.__query_database(
+            token, database_id, filter, page_size, start_cursor
+        )
+        pages: list[NotionPage] = []
+        for response_page in response_dict["results"]:
+            page: NotionPage = build_page_from_response(response_page)
+            pages.append(page)
+        return pages
+
+    async def iter_pages_by_database_id(
+        self,
+        token: str,
+        database_id: str,
+        filter: dict | None = None,
+        page_size: int = 100,
+        start_cursor: str | None = None,
+    ) -> AsyncIterator[list[NotionPage]]:
+        """
+        Follows the query cursor to the end, yielding each batch of pages as it arrives.
+
+        The next batch is requested while the caller consumes the current one, so at most
+        two batches are held in memory at any time.
+        """
+        assert database_id is not None, "Database ID cannot be None"
+        assert token is not None, "Token cannot be None"
+        next_query: asyncio.Task | None = asyncio.create_task(
+            self.__query_database(token, database_id, filter, page_size, start_cursor)
+        )
+        try:
+            while next_query is not None:
+                response_dict: dict = await next_query
+                next_query = None
+                if response_dict.get("has_more") and response_dict.get("next_cursor"):
+                    next_query = asyncio.create_task(
+                        self.__query_database(
+                            token,
+                            database_id,
+                            filter,
+                            page_size,
+                            response_dict["next_cursor"],
+                        )
+                    )
+                yield [
+                    build_page_from_response(response_page)
+                    for response_page in response_dict["results"]
+                ]
+        finally:
+            if next_query is not None:
+                next_query.cancel()
+
+    @traced()
+    async def __query_database(
+        self,
+        token: str,
+        database_id: str,
+        filter: dict | None,
+        page_size: int,
+        start_cursor: str | None,
+    ) -> dict:
+        notion_database_uri: str = f"/v1/databases/{database_id}/query"
+        body: dict = {"page_size": page_size}
+        if start_cursor is not None:
+            body["start_cursor"] = start_cursor
+        if filter is not None:
+            body["filter"] = filter
+        response_dict: dict = await self.async_notion_transport.request(
+            token, "POST", notion_database_uri, body
+        )
+        return response_dict
+
+    @traced()
+    async def read_page_by_id(self, token: str, page_id: str) -> NotionPage:
+        """
+        Reads a page's properties together with its whole block tree.
+
+        On a cache miss the properties and the first page of blocks are requested at the
+        same time, then blocks with children are expanded breadth-first, at most
+        NOTION_BLOCK_FETCH_CONCURRENCY requests at a time. When the page is cached, only the
+        properties are read and the cached blocks are returned if last_edited_time still
+        matches.
+        """
+        assert page_id is not None, "Page ID cannot be None"
+        assert token is not None, "Token cannot be None"
+        cached: dict | None = (
+            self.notion_page_cache.get(page_id)
+            if self.notion_page_cache is not None
+            else None
+        )
+        read_at: datetime = datetime.now(timezone.utc)
+        failures: list[Exception] = []
+        notionPage: NotionPage
+        if cached is None:
+            blocks_task: asyncio.Task = asyncio.create_task(
+                self.__read_block_tree(token, page_id, failures)
+            )
+            try:
+                notionPage = await self.read_page_properties_by_page_id(token, page_id)
+            except BaseException:
+                blocks_task.cancel()
+                raise
+        else:
+            # Access to the page's properties implies access to its blocks, so the entry
+            # can be shared by every token that reads the page.
+            notionPage = await self.read_page_properties_by_page_id(token, page_id)
+            if cached["last_edited_time"] == notionPage.last_edited_time:
+                # Callers may modify the blocks they get back, so they each get their own copy.
+                notionPage.blocks = copy.deepcopy(cached["blocks"])
+                return notionPage
+            read_at = datetime.now(timezone.utc)
+            blocks_task = asyncio.create_task(
+                self.__read_block_tree(token, page_id, failures)
+            )
+        blocks: list[NotionPageBlock] = []
+        try:
+            blocks = await blocks_task
+        except Exception as e:
+            failures.append(e)
+            self.log_tool.error(f"Error reading page blocks: {e}")
+        notionPage.blocks = blocks
+        if len(failures) == 0:
+            self.__cache_blocks(page_id, notionPage.last_edited_time, blocks, read_at)
+        return notionPage
+
+    def __cache_blocks(
+        self,
+        page_id: str,
+        last_edited_time: str | None,
+        blocks: list[NotionPageBlock],
+        read_at: datetime,
+    ) -> None:
+        if self.notion_page_cache is None or last_edited_time is None:
+            return
+        # An edit later in the same minute would keep last_edited_time unchanged, so only
+        # trees read after that minute closed can be validated by it.
+        edited_at: datetime = datetime.fromisoformat(last_edited_time)
+        if read_at < edited_at + self.LAST_EDITED_TIME_PRECISION:
+            self.notion_page_cache.delete(page_id)
+            return
+        self.notion_page_cache.set(
+            page_id,
+            {"last_edited_time": last_edited_time, "blocks": copy.deepcopy(blocks)},
+            estimate_blocks_size(blocks),
+        )
+
+    def __invalidate(self, page_id: str) -> None:
+        if self.notion_page_cache is not None:
+            self.notion_page_cache.delete(page_id)
+
+    @traced()
+    async def read_block_tree_by_block_id(
+        self,
+        token: str,
+        block_id: str,
+        failures: list[Exception] | None = None,
+        skip_unknown_types: bool = False,
+    ) -> list[NotionPageBlock]:
+        """
+        Reads the children of a block, recursively.
+
+        A nested read that fails leaves its parent without children. Those errors are
+        appended to `failures` when given, otherwise the first one is raised, so a
+        partial tree is never mistaken for a complete one.
+        """
+        assert token is not None, "Token cannot be None"
+        assert block_id is not None, "Block ID cannot be None"
+        nested_failures: list[Exception] = failures if failures is not None else []
+        blocks: list[NotionPageBlock] = await self.__read_block_tree(
+            token, block_id, nested_failures, skip_unknown_types
+        )
+        if failures is None and len(nested_failures) > 0:
+            raise nested_failures[0]
+        return blocks
+
+    @traced()
+    async def __read_block_tree(
+        self,
+        token: str,
+        block_id: str,
+        failures: list[Exception],
+        skip_unknown_types: bool = False,
+    ) -> list[NotionPageBlock]:
+        concurrency: int = int(
+            self.settings_tool.get("NOTION_BLOCK_FETCH_CONCURRENCY") or 3
+        )
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+        return await self.__read_children_recursively(
+            token, block_id, semaphore, failures, skip_unknown_types
+        )
+
+    @traced()
+    async def __read_children_recursively(
+        self,
+        token: str,
+        block_id: str,
+        semaphore: asyncio.Semaphore,
+        failures: list[Exception],
+        skip_unknown_types: bool = False,
+    ) -> list[NotionPageBlock]:
+        blocks: list[NotionPageBlock] = await self.__read_all_children(
+            token, block_id, semaphore, skip_unknown_types
+        )
+        parents: list[NotionPageBlock] = [block for block in blocks if block.has_children]
+        if len(parents) > 0:
+            children: list = await asyncio.gather(
+                *[
+                    self.__read_children_recursively(
+                        token, parent.id, semaphore, failures, skip_unknown_types
+                    )
+                    for parent in parents
+                ],
+                return_exceptions=True,
+            )
+            for parent, parent_children in zip(parents, children):
+                if isinstance(parent_children, Exception):
+                    failures.append(parent_children)
+                    self.log_tool.error(
+                        f"Error reading children of block {parent.id}: {parent_children}"
+                    )
+                    continue
+                parent.children = parent_children
+        return blocks
+
+    @traced()
+    async def __read_all_children(
+        self,
+        token: str,
+        block_id: str,
+        semaphore: asyncio.Semaphore,
+        skip_unknown_types: bool = False,
+    ) -> list[NotionPageBlock]:
+        blocks: list[NotionPageBlock] = []
+        has_more: bool = True
+        next_cursor: str = None
+        while has_more:
+            async with semaphore:
+                response: dict = (
+                    await self.async_notion_block_manager.read_page_blocks_by_page_id(
+                        token,
+                        block_id,
+                        page_size=100,
+                        start_cursor=next_cursor,
+                        skip_unknown_types=skip_unknown_types,
+                    )
+                )
+            blocks.extend(response["blocks"])
+            has_more = response["has_more"]
+            next_cursor = response["next_cursor"]
+        return blocks
+
+    @traced()
+    async def update_page_by_id(self, token: str, page_id: str, page: NotionPage) -> dict:
+        assert token is not None, "Token cannot be None"
+        assert page_id is not None, "Page ID cannot be None"
+        assert page is not None, "Page cannot be None"
+        assert page.properties is not None, "Page properties cannot be None"
+        assert len(page.properties) > 0, "Page properties cannot be empty"
+        assert page.blocks is not None, "Page blocks cannot be None"
+        notion_database_uri: str = f"/v1/pages/{page_id}"
+        icon: dict = build_icon_for_request(page)
+        properties: dict = build_properties_for_request(page)
+        # blocks: list = build_blocks_for_request(page)
+        body: dict = {
+            "icon": icon,
+            "properties": properties,
+            # "children": blocks,
+        }
+        response_dict: dict = await self.async_notion_transport.request(
+            token, "PATCH", notion_database_uri, body
+        )
+        self.__invalidate(page_id)
+        return response_dict
+
+    @traced()
+    async def archive_page_by_id(self, token: str, page_id: str) -> dict:
+        assert token is not None, "Token cannot be None"
+        assert page_id is not None, "Page ID cannot be None"
+        notion_database_uri: str = f"/v1/pages/{page_id}"
+        body: dict = {"archived": True}
+        response_dict: dict = await self.async_notion_transport.request(
+            token, "PATCH", notion_database_uri, body
+        )
+        self.__invalidate(page_id)
+        return response_dict
+
+    @traced()
+    async def unarchive_page_by_id(self, token: str, page_id: str) -> dict:
+        assert token is not None, "Token cannot be None"
+        assert page_id is not None, "Page ID cannot be None"
+        notion_database_uri: str = f"/v1/pages/{page_id}"
+        body: dict = {"archived": False}
+        response_dict: dict = await self.async_notion_transport.request(
+            token, "PATCH", notion_database_uri, body
+        )
+        self.__invalidate(page_id)
+        return response_dict
+
+
+def estimate_blocks_size(blocks: list[NotionPageBlock] | None) -> int:
+    """
+    Roughly estimates the memory held by a block tree, in bytes.
+    """
+    if blocks is None:
+        return 0
+    size: int = 0
+    for block in blocks:
+        size += 256 + sys.getsizeof(str(block.value))
+        size += estimate_blocks_size(block.children)
+    return size
@@ -0,0 +1,49 @@
+import os, sys
+
+from main.library.repositories.notion.core.async_notion_transport import (
+    AsyncNotionTransport,
+)
+from main.library.repositories.notion.models.notion_search_result import (
+    NotionSearchResult,
+)
+
+sys.path.insert(0, os.path.abspath("."))
+from main.library.tools.core.log_tool import LogTool
+from main.library.tools.core.settings_tool import SettingsTool
+from main.library.tools.core.tracing_tool import traced
+
+
+class AsyncNotionSearcher:
+    def __init__(
+        self,
+        settings_tool: SettingsTool,
+        log_tool: LogTool,
+        async_notion_transport: AsyncNotionTransport,
+    ):
+        self.settings_tool = settings_tool
+        self.log_tool = log_tool
+        self.async_notion_transport = async_notion_transport
+
+    @traced()
+    async def search(
+        self,
+        token: str,
+        search_obj: dict,
+        page_size: int = 100,
+        start_cursor: str | None = None,
+    ) -> NotionSearchResult:
+        assert token is not None, "Token cannot be None"
+        assert search_obj is not None, "Search object cannot be None"
+        notion_database_uri: str = f"/v1/search"
+        body: dict = search_obj
+        if "page_size" not in body or body["page_size"] is None:
+            body["page_size"] = page_size
+        if (
+            "start_cursor" not in body or body["start_cursor"] is None
+        ) and start_cursor is not None:
+            body["start_cursor"] = start_cursor
+        response_dict: dict = await self.async_notion_transport.request(
+            token, "POST", notion_database_uri, body
+        )
+        search_result: NotionSearchResult = NotionSearchResult.from_dict(response_dict)
+        return search_result
@@ -0,0 +1,242 @@
+import sys, os, asyncio, hashlib, json, time
+import httpx
+
+from main.library.repositories.notion.core.notion_rate_limiter import (
+    NotionRateLimiter,
+)
+from main.library.repositories.notion.utils.notion_retry import (
+    get_retry_delay,
+    is_idempotent_request,
+    is_retryable_status,
+    parse_retry_after,
+)
+from main.library.repositories.notion.utils.notion_validations import (
+    validate_http_response,
+)
+
+sys.path.insert(0, os.path.abspath("."))
+from main.library.tools.core.log_tool import LogTool
+from main.library.tools.core.metrics_tool import MetricsTool, get_endpoint_template
+from main.library.tools.core.settings_tool import SettingsTool
+from main.library.tools.core.tracing_tool import start_span
+
+
+class AsyncNotionTransport:
+    """
+    Non-blocking counterpart of NotionTransport, backed by a pooled httpx.AsyncClient.
+
+    The client is created on first use so it binds to the running event loop, and
+    honours the same HTTP_POOL_* settings as the synchronous connection pool. Rate limiting
+    and retries follow the same rules as NotionTransport and share its rate limiter.
+
+    Identical reads in flight at the same time (same token, method, URI and body) share one
+    Notion call, and each caller parses its own copy of the response. Reads are GETs plus
+    the POSTs that only query: search and database queries.
+    """
+
+    def __init__(
+        self,
+        settings_tool: SettingsTool,
+        log_tool: LogTool,
+        notion_rate_limiter: NotionRateLimiter,
+        client: httpx.AsyncClient | None = None,
+        metrics_tool: MetricsTool | None = None,
+    ):
+        self.settings_tool: SettingsTool = settings_tool
+        self.log_tool: LogTool = log_tool
+        self.notion_rate_limiter: NotionRateLimiter = notion_rate_limiter
+        self.client: httpx.AsyncClient | None = client
+        self.metrics_tool: MetricsTool | None = metrics_tool
+        self.retry_count: int = 0
+        self.retry_wait_seconds: float = 0.0
+        self.coalesced_count: int = 0
+        self.in_flight: dict[tuple, asyncio.Task] = {}
+
+    async def request(
+        self, token: str, method: str, uri: str, body: dict | list | None = None
+    ) -> dict:
+        assert token is not None, "Token cannot be None"
+        assert method is not None, "Method cannot be None"
+        assert uri is not None, "URI cannot be None"
+        notion_version: str = self.settings_tool.get("NOTION_VERSION")
+        assert notion_version is not None, "NOTION_VERSION cannot be None"
+        headers: dict = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+            "Notion-Version": notion_version,
+        }
+        body_json: str | None = json.dumps(body) if body is not None else None
+        idempotent: bool = is_idempotent_request(method, body)
+        with start_span(
+            "notion.request", method=method, endpoint=get_endpoint_template(uri)
+        ) as span:
+            if not is_read_request(method, uri):
+                try:
+                    response_data: bytes = await self.__send(
+                        token, method, uri, headers, body_json, idempotent
+                    )
+                finally:
+                    # Reads started before this write may miss it, so later reads must not join them.
+                    self.in_flight.clear()
+                return json.loads(response_data.decode("utf-8"))
+            key: tuple = (
+                hashlib.sha256(token.encode()).hexdigest(),
+                method,
+                uri,
+                json.dumps(body, sort_keys=True) if body is not None else None,
+            )
+            sending: asyncio.Task | None = self.in_flight.get(key)
+            if sending is None:
+                sending = asyncio.create_task(
+                    self.__send(token, method, uri, headers, body_json, idempotent)
+                )
+                sending.add_done_callback(lambda task: self.__forget(key, task))
+                self.in_flight[key] = sending
+            else:
+                self.coalesced_count += 1
+                if span is not None:
+                    span.set_attribute("coalesced", True)
+            # A cancelled caller must not cancel the call shared with the others.
+            response_data: bytes = await asyncio.shield(sending)
+            response_dict: dict = json.loads(response_data.decode("utf-8"))
+            return response_dict
+
+    async def __send(
+        self,
+        token: str,
+        method: str,
+        uri: str,
+        headers: dict,
+        body_json: str | None,
+        idempotent: bool,
+    ) -> bytes:
+        max_attempts: int = int(self.settings_tool.get("NOTION_RETRY_MAX_ATTEMPTS") or 5)
+        base_delay: float = float(self.settings_tool.get("NOTION_RETRY_BASE_DELAY") or 0.5)
+        max_delay: float = float(self.settings_tool.get("NOTION_RETRY_MAX_DELAY") or 30)
+        client: httpx.AsyncClient = self.__get_client()
+        attempt: int = 0
+        while True:
+            with start_span("notion.attempt", attempt=attempt + 1) as span:
+                waited: float = await self.notion_rate_limiter.acquire_async(token)
+                started_at: float = time.perf_counter()
+                try:
+                    response: httpx.Response = await client.request(
+                        method, uri, content=body_json, headers=headers
+                    )
+                except Exception:
+                    self.__observe(method, uri, "error", started_at)
+                    raise
+                self.__observe(method, uri, str(response.status_code), started_at)
+                if span is not None:
+                    span.set_attribute("rate_limit_wait_seconds", waited)
+                    span.set_attribute("status", response.status_code)
+            assert response is not None, "Response cannot be None"
+            retry_after: float | None = parse_retry_after(
+                response.headers.get("Retry-After")
+            )
+            if (
+                not is_retryable_status(response.status_code, idempotent)
+                or attempt + 1 >= max_attempts
+            ):
+                break
+            delay: float = get_retry_delay(attempt, retry_after, base_delay, max_delay)
+            self.retry_count += 1
+            self.retry_wait_seconds += delay
+            self.log_tool.warn(
+                f"Notion answered {response.status_code} to {method} {uri}, retrying in {delay:.2f}s"
+            )
+            if response.status_code == 429:
+                # Throttled: hold back every request of this token, this one included.
+                self.notion_rate_limiter.penalize(token, delay)
+            else:
+                await asyncio.sleep(delay)
+            attempt += 1
+        response_data: bytes = response.content
+        validate_http_response(
+            response.status_code, response.reason_phrase, response_data, retry_after
+        )
+        return response_data
+
+    def __observe(self, method: str, uri: str, status: str, started_at: float) -> None:
+        if self.metrics_tool is not None:
+            self.metrics_tool.observe(
+                "notion_request_duration_seconds",
+                {"method": method, "endpoint": get_endpoint_template(uri), "status": status},
+                time.perf_counter() - started_at,
+                "Duration of each Notion API call, retries counted separately",
+            )
+
+    def __forget(self, key: tuple, task: asyncio.Task) -> None:
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
+        # Retrieves the error if every caller was cancelled before the call finished.
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> dict:
+        return {
+            "retry_count": self.retry_count,
+            "retry_wait_seconds": self.retry_wait_seconds,
+            "coalesced_count": self.coalesced_count,
+        }
+
+    def get_pool_stats(self) -> dict:
+        """
+        Returns the use of the client's connection pool, with the keys of
+        ConnectionPoolTool.get_stats. A client built around a custom transport reports no connections.
+        """
+        max_size: str | None = self.settings_tool.get("HTTP_POOL_MAX_SIZE")
+        # httpx keeps its httpcore pool private; the pool's `connections` list is public.
+        pool = getattr(getattr(self.client, "_transport", None), "_pool", None)
+        connections: list = list(pool.connections) if pool is not None else []
+        idle: int = sum(1 for connection in connections if connection.is_idle())
+        return {
+            "max_size": int(max_size) if max_size is not None else 10,
+            "in_use": len(connections) - idle,
+            "idle": idle,
+        }
+
+    async def aclose(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    def __get_client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            notion_protocol: str = self.settings_tool.get("NOTION_PROTOCOL")
+            assert notion_protocol is not None, "NOTION_PROTOCOL cannot be None"
+            notion_host: str = self.settings_tool.get("NOTION_HOST")
+            assert notion_host is not None, "NOTION_HOST cannot be None"
+            notion_port: str = self.settings_tool.get("NOTION_PORT")
+            assert notion_port is not None, "NOTION_PORT cannot be None"
+            max_size: str | None = self.settings_tool.get("HTTP_POOL_MAX_SIZE")
+            idle_timeout: str | None = self.settings_tool.get("HTTP_POOL_IDLE_TIMEOUT")
+            acquire_timeout: str | None = self.settings_tool.get(
+                "HTTP_POOL_ACQUIRE_TIMEOUT"
+            )
+            limits: httpx.Limits = httpx.Limits(
+                max_connections=int(max_size) if max_size is not None else 10,
+                max_keepalive_connections=(
+                    int(max_size) if max_size is not None else 10
+                ),
+                keepalive_expiry=(
+                    float(idle_timeout) if idle_timeout is not None else 60.0
+                ),
+            )
+            timeout: httpx.Timeout = httpx.Timeout(
+                60.0,
+                pool=float(acquire_timeout) if acquire_timeout is not None else 30.0,
+            )
+            self.client = httpx.AsyncClient(
+                base_url=f"{notion_protocol}://{notion_host}:{notion_port}",
+                limits=limits,
+                timeout=timeout,
+            )
+        return self.client
+
+
+def is_read_request(method: str, uri: str) -> bool:
+    if method == "GET":
+        return True
+    path: str = uri.split("?", 1)[0]
+    return method == "POST" and (path == "/v1/search" or path.endswith("/query"))
@@ -1,22 +1,26 @@
-import http.client
-import json
 import os, sys
 
-from main.library.repositories.notion.utils.notion_validations import (
-    validate_http_response,
-)
+from main.library.repositories.notion.core.notion_transport import NotionTransport
 
 sys.path.insert(0, os.path.abspath("."))
 from main.library.repositories.notion.models.notion_database import NotionDatabase
 from main.library.tools.core.log_tool import LogTool
 from main.library.tools.core.settings_tool import SettingsTool
+from main.library.tools.core.tracing_tool import traced
 
 
 class NotionDatabaseManager:
-    def __init__(self, settings_tool: SettingsTool, log_tool: LogTool):
+    def __init__(
+        self,
+        settings_tool: SettingsTool,
+        log_tool: LogTool,
+        notion_transport: NotionTransport,
+    ):
         self.settings_tool = settings_tool
         self.log_tool = log_tool
+        self.notion_transport = notion_transport
 
+    @traced()
     def create_database(
         self, token: str, page_id: str, database: NotionDatabase
     ) -> dict:
@@ -24,180 +28,55 @@ class NotionDatabaseManager:
         assert page_id is not None, "Page ID cannot be None"
         assert database is not None, "Database cannot be None"
         database.parent_id = page_id
-        notion_protocol: str = self.settings_tool.get("NOTION_PROTOCOL")
-        assert notion_protocol is not None, "NOTION_PROTOCOL cannot be None"
-        notion_host: str = self.settings_tool.get("NOTION_HOST")
-        assert notion_host is not None, "NOTION_HOST cannot be None"
-        notion_port: str = self.settings_tool.get("NOTION_PORT")
-        assert notion_port is not None, "NOTION_PORT cannot be None"
-        notion_version: str = self.settings_tool.get("NOTION_VERSION")
-        assert notion_version is not None, "NOTION_VERSION cannot be None"
         notion_database_uri: str = f"/v1/databases"
-        headers: dict = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "Notion-Version": notion_version,
-        }
         body: dict = database.to_create_payload()
-        body_json: str = json.dumps(body)
-        isHttps: bool = notion_protocol == "https"
-        conn: http.client.HTTPSConnection = (
-            http.client.HTTPSConnection(notion_host, notion_port)
-            if isHttps
-            else http.client.HTTPConnection(notion_host, notion_port)
+        response_dict: dict = self.notion_transport.request(
+            token, "POST", notion_database_uri, body
         )
-        assert conn is not None, "Connection cannot be None"
-        conn.request("POST", notion_database_uri, body_json, headers)
-        response: http.client.HTTPResponse = conn.getresponse()
-        assert response is not None, "Response cannot be None"
-        response_status: int = response.status
-        response_data: bytes = response.read()
-        validate_http_response(response_status, response.reason, response_data)
-        response_str: str = response_data.decode("utf-8")
-        response_dict: dict = json.loads(response_str)
         return response_dict
 
+    @traced()
     def read_database_by_id(self, token: str, database_id: str) -> NotionDatabase:
         assert token is not None, "Token cannot be None"
         assert database_id is not None, "Database ID cannot be None"
-        notion_protocol: str = self.settings_tool.get("NOTION_PROTOCOL")
-        assert notion_protocol is not None, "NOTION_PROTOCOL cannot be None"
-        notion_host: str = self.settings_tool.get("NOTION_HOST")
-        assert notion_host is not None, "NOTION_HOST cannot be None"
-        notion_port: str = self.settings_tool.get("NOTION_PORT")
-        assert notion_port is not None, "NOTION_PORT cannot be None"
-        notion_version: str = self.settings_tool.get("NOTION_VERSION")
-        assert notion_version is not None, "NOTION_VERSION cannot be None"
         notion_database_uri: str = f"/v1/databases/{database_id}"
-        headers: dict = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "Notion-Version": notion_version,
-        }
-        isHttps: bool = notion_protocol == "https"
-        conn: http.client.HTTPSConnection = (
-            http.client.HTTPSConnection(notion_host, notion_port)
-            if isHttps
-            else http.client.HTTPConnection(notion_host, notion_port)
+        response_dict: dict = self.notion_transport.request(
+            token, "GET", notion_database_uri
         )
-        assert conn is not None, "Connection cannot be None"
-        conn.request("GET", notion_database_uri, headers=headers)
-        response: http.client.HTTPResponse = conn.getresponse()
-        assert response is not None, "Response cannot be None"
-        response_status: int = response.status
-        response_data: bytes = response.read()
-        validate_http_response(response_status, response.reason, response_data)
-        response_str: str = response_data.decode("utf-8")
-        response_dict: dict = json.loads(response_str)
         database: NotionDatabase = NotionDatabase.from_read_response(response_dict)
         return database
 
+    @traced()
     def update_database(
         self, token: str, database_id: str, database: NotionDatabase
     ) -> dict:
         assert token is not None, "Token cannot be None"
         assert database is not None, "Database cannot be None"
-        notion_protocol: str = self.settings_tool.get("NOTION_PROTOCOL")
-        assert notion_protocol is not None, "NOTION_PROTOCOL cannot be None"
-        notion_host: str = self.settings_tool.get("NOTION_HOST")
-        assert notion_host is not None, "NOTION_HOST cannot be None"
-        notion_port: str = self.settings_tool.get("NOTION_PORT")
-        assert notion_port is not None, "NOTION_PORT cannot be None"
-        notion_version: str = self.settings_tool.get("NOTION_VERSION")
-        assert notion_version is not None, "NOTION_VERSION cannot be None"
         notion_database_uri: str = f"/v1/databases/{database_id}"
-        headers: dict = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "Notion-Version": notion_version,
-        }
         body: dict = database.to_update_payload()
-        body_json: str = json.dumps(body)
-        isHttps: bool = notion_protocol == "https"
-        conn: http.client.HTTPSConnection = (
-            http.client.HTTPSConnection(notion_host, notion_port)
-            if isHttps
-            else http.client.HTTPConnection(notion_host, notion_port)
+        response_dict: dict = self.notion_transport.request(
+            token, "PATCH", notion_database_uri, body
         )
-        assert conn is not None, "Connection cannot be None"
-        conn.request("PATCH", notion_database_uri, body_json, headers)
-        response: http.client.HTTPResponse = conn.getresponse()
-        assert response is not None, "Response cannot be None"
-        response_status: int = response.status
-        response_data: bytes = response.read()
-        validate_http_response(response_status, response.reason, response_data)
-        response_str: str = response_data.decode("utf-8")
-        response_dict: dict = json.loads(response_str)
         return response_dict
 
+    @traced()
     def archive_database(self, token: str, database_id: str) -> dict:
         assert token is not None, "Token cannot be None"
         assert database_id is not None, "Database ID cannot be None"
-        notion_protocol: str = self.settings_tool.get("NOTION_PROTOCOL")
-        assert notion_protocol is not None, "NOTION_PROTOCOL cannot be None"
-        notion_host: str = self.settings_tool.get("NOTION_HOST")
-        assert notion_host is not None, "NOTION_HOST cannot be None"
-        notion_port: str = self.settings_tool.get("NOTION_PORT")
-        assert notion_port is not None, "NOTION_PORT cannot be None"
-        notion_version: str = self.settings_tool.get("NOTION_VERSION")
-        assert notion_version is not None, "NOTION_VERSION cannot be None"
         notion_database_uri: str = f"/v1/databases/{database_id}"
-        headers: dict = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "Notion-Version": notion_version,
-        }
         body: dict = {"archived": True}
-        body_json: str = json.dumps(body)
-        isHttps: bool = notion_protocol == "https"
-        conn: http.client.HTTPSConnection = (
-            http.client.HTTPSConnection(notion_host, notion_port)
-            if isHttps
-            else http.client.HTTPConnection(notion_host, notion_port)
+        response_dict: dict = self.notion_transport.request(
+            token, "PATCH", notion_database_uri, body
         )
-        assert conn is not None, "Connection cannot be None"
-        conn.request("PATCH", notion_database_uri, body_json, headers)
-        response: http.client.HTTPResponse = conn.getresponse()
-        assert response is not None, "Response cannot be None"
-        response_status: int = response.status
-        response_data: bytes = response.read()
-        validate_http_response(response_status, response.reason, response_data)
-        response_str: str = response_data.decode("utf-8")
-        response_dict: dict = json.loads(response_str)
         return response_dict
 
+    @traced()
     def unarchive_database(self, token: str, database_id: str) -> dict:
         assert token is not None, "Token cannot be None"
         assert database_id is not None, "Database ID cannot be None"
-        notion_protocol: str = self.settings_tool.get("NOTION_PROTOCOL")
-        assert notion_protocol is not None, "NOTION_PROTOCOL cannot be None"
-        notion_host: str = self.settings_tool.get("NOTION_HOST")
-        assert notion_host is not None, "NOTION_HOST cannot be None"
-        notion_port: str = self.settings_tool.get("NOTION_PORT")
-        assert notion_port is not None, "NOTION_PORT cannot be None"
-        notion_version: str = self.settings_tool.get("NOTION_VERSION")
-        assert notion_version is not None, "NOTION_VERSION cannot be None"
         notion_database_uri: str = f"/v1/databases/{database_id}"
-        headers: dict = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "Notion-Version": notion_version,
-        }
         body: dict = {"archived": False}
-        body_json: str = json.dumps(body)
-        isHttps: bool = notion_protocol == "https"
-        conn: http.client.HTTPSConnection = (
-            http.client.HTTPSConnection(notion_host, notion_port)
-            if isHttps
-            else http.client.HTTPConnection(notion_host, notion_port)
+        response_dict: dict = self.notion_transport.request(
+            token, "PATCH", notion_database_uri, body
         )
-        assert conn is not None, "Connection cannot be None"
-        conn.request("PATCH", notion_database_uri, body_json, headers)
-        response: http.client.HTTPResponse = conn.getresponse()
-        assert response is not None, "Response cannot be None"
-        response_status: int = response.status
-        response_data: bytes = response.read()
-        validate_http_response(response_status, response.reason, response_data)
-        response_str: str = response_data.decode("utf-8")
-        response_dict: dict = json.loads(response_str)
         return response_dict
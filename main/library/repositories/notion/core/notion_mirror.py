@@ -0,0 +1,589 @@
+import sys, os, asyncio, hashlib, json, re, sqlite3, threading
+from datetime import datetime, timezone
+from typing import Any
+
+from main.library.repositories.notion.core.async_notion_page_manager import (
+    AsyncNotionPageManager,
+)
+from main.library.repositories.notion.utils.notion_mirror_filters import (
+    build_where_clause,
+)
+
+sys.path.insert(0, os.path.abspath("."))
+from main.library.repositories.notion.models.notion_custom_icon import NotionIcon
+from main.library.repositories.notion.models.notion_page import NotionPage
+from main.library.repositories.notion.models.notion_page_block import NotionPageBlock
+from main.library.repositories.notion.models.notion_property import NotionProperty
+from main.library.tools.core.log_tool import LogTool
+from main.library.tools.core.settings_tool import SettingsTool
+from main.library.utils.core.path_helper import get_root_dir
+from main.library.utils.models.validation_exception import ValidationException
+
+
+class NotionMirror:
+    """
+    A local SQLite copy of Notion databases, kept up to date by incremental syncs.
+
+    `sync_database` pulls the pages edited since the previous sync, filtering on
+    last_edited_time, and upserts them. A full sync also drops the pages that are gone
+    from Notion. `query_pages` then answers Notion-style filters locally. Each property is
+    stored as one row, with its value projected into a typed column (text, number or
+    boolean) for filtering and kept as JSON to rebuild the page.
+
+    Synced pages are also written to an FTS5 full-text index of their title, property
+    text and block text, which `search_pages` ranks with bm25. Reading the blocks of each
+    synced page costs extra Notion requests; set NOTION_SEARCH_INDEX_BLOCKS to "false" to
+    index properties only.
+
+    The database file is NOTION_MIRROR_PATH, relative to the project root.
+    """
+
+    SCHEMA: str = """
+        CREATE TABLE IF NOT EXISTS pages (
+            page_id TEXT PRIMARY KEY,
+            database_id TEXT NOT NULL,
+            url TEXT,
+            archived INTEGER NOT NULL DEFAULT 0,
+            created_time TEXT,
+            last_edited_time TEXT,
+            created_by TEXT,
+            last_edited_by TEXT,
+            icon_type TEXT,
+            icon_value TEXT,
+            parent TEXT
+        );
+        CREATE INDEX IF NOT EXISTS pages_database_idx
+            ON pages (database_id, last_edited_time);
+        CREATE TABLE IF NOT EXISTS page_properties (
+            page_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            type TEXT NOT NULL,
+            text_value TEXT,
+            number_value REAL,
+            boolean_value INTEGER,
+            json_value TEXT,
+            is_empty INTEGER NOT NULL,
+            PRIMARY KEY (page_id, name)
+        );
+        CREATE INDEX IF NOT EXISTS page_properties_text_idx
+            ON page_properties (name, text_value);
+        CREATE INDEX IF NOT EXISTS page_properties_number_idx
+            ON page_properties (name, number_value);
+        CREATE TABLE IF NOT EXISTS mirrored_databases (
+            database_id TEXT PRIMARY KEY,
+            last_edited_time TEXT,
+            synced_at TEXT NOT NULL,
+            page_count INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS mirror_access (
+            database_id TEXT NOT NULL,
+            token_hash TEXT NOT NULL,
+            PRIMARY KEY (database_id, token_hash)
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS page_search USING fts5(
+            page_id UNINDEXED,
+            database_id UNINDEXED,
+            title,
+            properties,
+            blocks,
+            tokenize = 'unicode61 remove_diacritics 2'
+        );
+    """
+    # bm25 weights of the page_search columns: a match in the title counts the most.
+    SEARCH_WEIGHTS: tuple[float, ...] = (0.0, 0.0, 10.0, 4.0, 1.0)
+
+    def __init__(
+        self,
+        settings_tool: SettingsTool,
+        log_tool: LogTool,
+        async_notion_page_manager: AsyncNotionPageManager,
+    ):
+        self.settings_tool: SettingsTool = settings_tool
+        self.log_tool: LogTool = log_tool
+        self.async_notion_page_manager: AsyncNotionPageManager = (
+            async_notion_page_manager
+        )
+        database_path: str = (
+            self.settings_tool.get("NOTION_MIRROR_PATH") or "tmp/notion_mirror.db"
+        )
+        if database_path != ":memory:" and not os.path.isabs(database_path):
+            database_path = os.path.join(get_root_dir(), database_path)
+        self.database_path: str = database_path
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._sync_locks: dict[str, asyncio.Lock] = {}
+
+    async def sync_database(self, token: str, database_id: str, full: bool = False) -> dict:
+        """
+        Brings the local copy of a database up to date with Notion.
+
+        The first sync of a database, or any sync with `full=True`, reads every page and
+        deletes the local pages that Notion no longer returns. Later syncs only read the
+        pages edited since the newest last_edited_time already mirrored. A database
+        mirrored before the search index existed gets a full sync, to index its pages.
+        """
+        assert token is not None, "Token cannot be None"
+        assert database_id is not None, "Database ID cannot be None"
+        sync_lock: asyncio.Lock = self._sync_locks.setdefault(database_id, asyncio.Lock())
+        async with sync_lock:
+            state: dict | None = await asyncio.to_thread(self.__read_sync_state, database_id)
+            since: str | None = None
+            if (
+                not full
+                and state is not None
+                and (state["indexed"] or state["page_count"] == 0)
+            ):
+                since = state["last_edited_time"]
+            filter: dict | None = None
+            if since is not None:
+                # Notion rounds last_edited_time to the minute, so pages edited in that
+                # minute are read again; upserting them is harmless.
+                filter = {
+                    "timestamp": "last_edited_time",
+                    "last_edited_time": {"on_or_after": since},
+                }
+            latest: str | None = since
+            seen: set[str] = set()
+            async for batch in self.async_notion_page_manager.iter_pages_by_database_id(
+                token, database_id, filter
+            ):
+                block_texts: dict[str, str] = await self.__read_block_texts(token, batch)
+                await asyncio.to_thread(
+                    self.__upsert_pages, database_id, batch, block_texts
+                )
+                for page in batch:
+                    seen.add(page.id)
+                    if latest is None or page.last_edited_time > latest:
+                        latest = page.last_edited_time
+            deleted: int = 0
+            if since is None:
+                deleted = await asyncio.to_thread(
+                    self.__delete_missing_pages, database_id, seen
+                )
+            synced_at: str = datetime.now(timezone.utc).isoformat()
+            page_count: int = await asyncio.to_thread(
+                self.__write_sync_state,
+                database_id,
+                self.__get_token_hash(token),
+                latest,
+                synced_at,
+            )
+        self.log_tool.info(
+            f"Mirrored database {database_id}: {len(seen)} pages synced, {deleted} deleted"
+        )
+        return {
+            "database_id": database_id,
+            "full": since is None,
+            "synced_pages": len(seen),
+            "deleted_pages": deleted,
+            "page_count": page_count,
+            "last_edited_time": latest,
+            "synced_at": synced_at,
+        }
+
+    def query_pages(
+        self,
+        token: str,
+        database_id: str,
+        filter: dict | None = None,
+        page_size: int = 100,
+        offset: int = 0,
+    ) -> list[NotionPage]:
+        """
+        Queries the local copy of a database, newest edits first.
+
+        Only tokens that have synced the database can read it.
+        """
+        assert token is not None, "Token cannot be None"
+        assert database_id is not None, "Database ID cannot be None"
+        assert page_size > 0, "Page size must be greater than zero"
+        assert offset >= 0, "Offset cannot be negative"
+        where_clause, params = build_where_clause(filter)
+        with self._lock:
+            connection: sqlite3.Connection = self.__get_connection()
+            allowed: tuple | None = connection.execute(
+                "SELECT 1 FROM mirror_access WHERE database_id = ? AND token_hash = ?",
+                (database_id, self.__get_token_hash(token)),
+            ).fetchone()
+            if allowed is None:
+                raise ValidationException(
+                    f"Database {database_id} has not been mirrored with this token"
+                )
+            page_rows: list[tuple] = connection.execute(
+                "SELECT p.page_id, p.url, p.archived, p.created_time, p.last_edited_time,"
+                " p.created_by, p.last_edited_by, p.icon_type, p.icon_value, p.parent"
+                f" FROM pages p WHERE p.database_id = ? AND ({where_clause})"
+                " ORDER BY p.last_edited_time DESC, p.page_id LIMIT ? OFFSET ?",
+                [database_id, *params, page_size, offset],
+            ).fetchall()
+            page_ids: list[str] = [row[0] for row in page_rows]
+            properties_by_page: dict[str, list[NotionProperty]] = {
+                page_id: [] for page_id in page_ids
+            }
+            if len(page_ids) > 0:
+                placeholders: str = ", ".join(["?"] * len(page_ids))
+                for page_id, name, prop_type, json_value in connection.execute(
+                    "SELECT page_id, name, type, json_value FROM page_properties"
+                    f" WHERE page_id IN ({placeholders}) ORDER BY page_id, position",
+                    page_ids,
+                ):
+                    properties_by_page[page_id].append(
+                        NotionProperty(name, prop_type, json.loads(json_value))
+                    )
+        pages: list[NotionPage] = []
+        for row in page_rows:
+            icon: NotionIcon | None = (
+                NotionIcon(row[7], json.loads(row[8])) if row[7] is not None else None
+            )
+            pages.append(
+                NotionPage(
+                    icon,
+                    properties_by_page[row[0]],
+                    [],
+                    page_id=row[0],
+                    parent=json.loads(row[9]) if row[9] is not None else None,
+                    url=row[1],
+                    request_id="",
+                    archived=bool(row[2]),
+                    created_time=row[3],
+                    last_edited_time=row[4],
+                    created_by=row[5],
+                    last_edited_by=row[6],
+                )
+            )
+        return pages
+
+    def search_pages(
+        self,
+        token: str,
+        query: str,
+        database_id: str | None = None,
+        page_size: int = 20,
+        offset: int = 0,
+    ) -> dict:
+        """
+        Full-text search over the pages of the databases this token has synced.
+
+        Every word of `query` must match, as a prefix, the title, the properties or the
+        blocks of a page. Results are ranked by bm25, best first, with a snippet of the
+        best matching column where matches are wrapped in <b></b>.
+        """
+        assert token is not None, "Token cannot be None"
+        assert query is not None, "Query cannot be None"
+        assert page_size > 0, "Page size must be greater than zero"
+        assert offset >= 0, "Offset cannot be negative"
+        match: str = build_match_expression(query)
+        if match == "":
+            return {"results": [], "has_more": False, "next_offset": None}
+        params: list = [self.__get_token_hash(token), match]
+        database_clause: str = ""
+        if database_id is not None:
+            database_clause = " AND s.database_id = ?"
+            params.append(database_id)
+        weights: str = ", ".join(str(weight) for weight in self.SEARCH_WEIGHTS)
+        with self._lock:
+            rows: list[tuple] = (
+                self.__get_connection()
+                .execute(
+                    f"SELECT p.page_id, p.database_id, p.url, s.title, p.last_edited_time,"
+                    f" bm25(page_search, {weights}) AS rank,"
+                    " snippet(page_search, -1, '<b>', '</b>', '…', 16)"
+                    " FROM page_search s"
+                    " JOIN pages p ON p.page_id = s.page_id"
+                    " JOIN mirror_access a"
+                    " ON a.database_id = p.database_id AND a.token_hash = ?"
+                    f" WHERE page_search MATCH ? AND p.archived = 0{database_clause}"
+                    " ORDER BY rank, p.page_id LIMIT ? OFFSET ?",
+                    [*params, page_size + 1, offset],
+                )
+                .fetchall()
+            )
+        has_more: bool = len(rows) > page_size
+        return {
+            "results": [
+                {
+                    "id": row[0],
+                    "database_id": row[1],
+                    "url": row[2],
+                    "title": row[3],
+                    "last_edited_time": row[4],
+                    "score": round(-row[5], 4),
+                    "snippet": row[6],
+                }
+                for row in rows[:page_size]
+            ],
+            "has_more": has_more,
+            "next_offset": offset + page_size if has_more else None,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    async def __read_block_texts(
+        self, token: str, pages: list[NotionPage]
+    ) -> dict[str, str]:
+        index_blocks: str = self.settings_tool.get("NOTION_SEARCH_INDEX_BLOCKS") or "true"
+        if index_blocks.lower() == "false":
+            return {}
+        concurrency: int = int(
+            self.settings_tool.get("NOTION_BLOCK_FETCH_CONCURRENCY") or 3
+        )
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+        async def read_block_text(page_id: str) -> tuple[str, str]:
+            # A page whose blocks cannot be read is still indexed by its properties, rather
+            # than failing the sync or indexing a partial tree as if it were complete.
+            failures: list[Exception] = []
+            try:
+                async with semaphore:
+                    blocks: list[NotionPageBlock] = (
+                        await self.async_notion_page_manager.read_block_tree_by_block_id(
+                            token, page_id, failures, skip_unknown_types=True
+                        )
+                    )
+            except Exception as e:
+                failures.append(e)
+            if len(failures) > 0:
+                self.log_tool.error(
+                    f"Indexing page {page_id} without its blocks: {failures[0]}"
+                )
+                return page_id, ""
+            if len(blocks) == 0:
+                return page_id, ""
+            return page_id, get_blocks_text(blocks)
+
+        return dict(await asyncio.gather(*[read_block_text(page.id) for page in pages]))
+
+    def __upsert_pages(
+        self, database_id: str, pages: list[NotionPage], block_texts: dict[str, str]
+    ) -> None:
+        page_rows: list[tuple] = []
+        property_rows: list[tuple] = []
+        search_rows: list[tuple] = []
+        for page in pages:
+            page_rows.append(
+                (
+                    page.id,
+                    database_id,
+                    page.url,
+                    1 if page.archived else 0,
+                    page.created_time,
+                    page.last_edited_time,
+                    page.created_by,
+                    page.last_edited_by,
+                    page.icon.type if page.icon is not None else None,
+                    json.dumps(page.icon.value) if page.icon is not None else None,
+                    json.dumps(page.parent) if page.parent is not None else None,
+                )
+            )
+            for position, prop in enumerate(page.properties):
+                text_value, number_value, boolean_value, is_empty = project_property_value(
+                    prop.type, prop.value
+                )
+                property_rows.append(
+                    (
+                        page.id,
+                        prop.name,
+                        position,
+                        prop.type,
+                        text_value,
+                        number_value,
+                        boolean_value,
+                        json.dumps(prop.value),
+                        1 if is_empty else 0,
+                    )
+                )
+            search_rows.append(
+                (
+                    page.id,
+                    database_id,
+                    " ".join(
+                        get_searchable_text(prop.value)
+                        for prop in page.properties
+                        if prop.type == "title"
+                    ),
+                    " ".join(
+                        get_searchable_text(prop.value)
+                        for prop in page.properties
+                        if prop.type != "title"
+                        and prop.type not in UNSEARCHABLE_PROPERTY_TYPES
+                    ),
+                    block_texts.get(page.id, ""),
+                )
+            )
+        with self._lock:
+            connection: sqlite3.Connection = self.__get_connection()
+            with connection:
+                connection.executemany(
+                    "DELETE FROM page_properties WHERE page_id = ?",
+                    [(row[0],) for row in page_rows],
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    page_rows,
+                )
+                connection.executemany(
+                    "INSERT INTO page_properties VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    property_rows,
+                )
+                connection.executemany(
+                    "DELETE FROM page_search WHERE page_id = ?",
+                    [(row[0],) for row in search_rows],
+                )
+                connection.executemany(
+                    "INSERT INTO page_search VALUES (?, ?, ?, ?, ?)", search_rows
+                )
+
+    def __delete_missing_pages(self, database_id: str, seen: set[str]) -> int:
+        with self._lock:
+            connection: sqlite3.Connection = self.__get_connection()
+            with connection:
+                stored: list[str] = [
+                    row[0]
+                    for row in connection.execute(
+                        "SELECT page_id FROM pages WHERE database_id = ?", (database_id,)
+                    )
+                ]
+                missing: list[tuple] = [
+                    (page_id,) for page_id in stored if page_id not in seen
+                ]
+                connection.executemany(
+                    "DELETE FROM page_properties WHERE page_id = ?", missing
+                )
+                connection.executemany("DELETE FROM pages WHERE page_id = ?", missing)
+                connection.executemany(
+                    "DELETE FROM page_search WHERE page_id = ?", missing
+                )
+        return len(missing)
+
+    def __read_sync_state(self, database_id: str) -> dict | None:
+        with self._lock:
+            connection: sqlite3.Connection = self.__get_connection()
+            row: tuple | None = connection.execute(
+                "SELECT last_edited_time, synced_at, page_count"
+                " FROM mirrored_databases WHERE database_id = ?",
+                (database_id,),
+            ).fetchone()
+            indexed: tuple | None = connection.execute(
+                "SELECT 1 FROM page_search WHERE database_id = ? LIMIT 1", (database_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "last_edited_time": row[0],
+            "synced_at": row[1],
+            "page_count": row[2],
+            "indexed": indexed is not None,
+        }
+
+    def __write_sync_state(
+        self, database_id: str, token_hash: str, latest: str | None, synced_at: str
+    ) -> int:
+        with self._lock:
+            connection: sqlite3.Connection = self.__get_connection()
+            with connection:
+                page_count: int = connection.execute(
+                    "SELECT count(*) FROM pages WHERE database_id = ?", (database_id,)
+                ).fetchone()[0]
+                connection.execute(
+                    "INSERT OR REPLACE INTO mirrored_databases VALUES (?, ?, ?, ?)",
+                    (database_id, latest, synced_at, page_count),
+                )
+                connection.execute(
+                    "INSERT OR IGNORE INTO mirror_access VALUES (?, ?)",
+                    (database_id, token_hash),
+                )
+        return page_count
+
+    def __get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if self.database_path != ":memory:":
+                os.makedirs(os.path.dirname(self.database_path), exist_ok=True)
+            connection: sqlite3.Connection = sqlite3.connect(
+                self.database_path, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(self.SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def __get_token_hash(self, token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def project_property_value(
+    prop_type: str, value: Any
+) -> tuple[str | None, float | None, int | None, bool]:
+    """
+    Picks the typed column a property value is filtered on.
+
+    Returns:
+        tuple: The text, number and boolean columns, and whether the value is empty.
+    """
+    if prop_type == "number":
+        return None, value, None, value is None
+    if prop_type == "checkbox":
+        return None, None, 1 if value else 0, False
+    if prop_type == "select":
+        name: str | None = value.get("name") if isinstance(value, dict) else None
+        return name or None, None, None, not name
+    if isinstance(value, str):
+        return value, None, None, value == ""
+    if isinstance(value, (list, dict)):
+        return None, None, None, len(value) == 0
+    return None, None, None, value is None
+
+
+# Properties holding ids or timestamps, which are not worth matching words against.
+UNSEARCHABLE_PROPERTY_TYPES: set[str] = {
+    "people",
+    "relation",
+    "created_by",
+    "last_edited_by",
+    "created_time",
+    "last_edited_time",
+}
+# Block values whose strings are links or metadata rather than content.
+UNSEARCHABLE_BLOCK_KEYS: set[str] = {"url", "language"}
+
+
+def get_searchable_text(value: Any) -> str:
+    """
+    Joins the strings found in a property or block value, e.g. the names of a multi_select.
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return " ".join(
+            get_searchable_text(item)
+            for key, item in value.items()
+            if key not in UNSEARCHABLE_BLOCK_KEYS
+        )
+    if isinstance(value, list):
+        return " ".join(get_searchable_text(item) for item in value)
+    return ""
+
+
+def get_blocks_text(blocks: list[NotionPageBlock] | None) -> str:
+    texts: list[str] = []
+    for block in blocks or []:
+        if block.type not in ("image", "video"):
+            texts.append(get_searchable_text(block.value))
+        if block.children is not None:
+            texts.append(get_blocks_text(block.children))
+    return "\n".join(text for text in texts if text != "")
+
+
+def build_match_expression(query: str) -> str:
+    """
+    Turns free text into an FTS5 expression where every word must match as a prefix.
+
+    Only word characters are kept, so the FTS5 query syntax cannot be injected.
+    """
+    words: list[str] = re.findall(r"\w+", query.lower())
+    return " ".join(f'"{word}"*' for word in words)
@@ -1,8 +1,9 @@
-import sys, os, http.client, json
+import sys, os
 
 from main.library.repositories.notion.core.notion_block_manager import (
     NotionBlockManager,
 )
+from main.library.repositories.notion.core.notion_transport import NotionTransport
 from main.library.repositories.notion.models.notion_page_block import NotionPageBlock
 from main.library.repositories.notion.utils.notion_factory import (
     build_blocks_for_request,
@@ -10,27 +11,38 @@ from main.library.repositories.notion.utils.notion_factory import (
     build_page_from_response,
     build_properties_for_request,
 )
-from main.library.repositories.notion.utils.notion_validations import (
-    validate_http_response,
-)
 
 sys.path.insert(0, os.path.abspath("."))
 from main.library.repositories.notion.models.notion_page import NotionPage
 from main.library.tools.core.log_tool import LogTool
 from main.library.tools.core.settings_tool import SettingsTool
+from main.library.tools.core.tracing_tool import traced
+from main.library.utils.models.partial_write_exception import PartialWriteException
 
 
 class NotionPageManager:
+    """
+    Creates, reads, queries and updates Notion pages.
+
+    Notion accepts at most MAX_CHILDREN_PER_REQUEST children per request, so longer pages
+    are created with the first batch inline and the rest appended in order.
+    """
+
+    MAX_CHILDREN_PER_REQUEST: int = 100
+
     def __init__(
         self,
         settings_tool: SettingsTool,
         log_tool: LogTool,
         notion_block_manager: NotionBlockManager,
+        notion_transport: NotionTransport,
     ):
         self.settings_tool: SettingsTool = settings_tool
         self.log_tool: LogTool = log_tool
         self.notion_block_manager: NotionBlockManager = notion_block_manager
+        self.notion_transport: NotionTransport = notion_transport
 
+    @traced()
     def create_page(self, token: str, page: NotionPage, database_id: str):
         assert page is not None, "Page cannot be None"
         assert token is not None, "Token cannot be None"
@@ -38,20 +50,7 @@ class NotionPageManager:
         assert page.properties is not None, "Page properties cannot be None"
         assert len(page.properties) > 0, "Page properties cannot be empty"
         assert page.blocks is not None, "Page blocks cannot be None"
-        notion_protocol: str = self.settings_tool.get("NOTION_PROTOCOL")
-        assert notion_protocol is not None, "NOTION_PROTOCOL cannot be None"
-        notion_host: str = self.settings_tool.get("NOTION_HOST")
-        assert notion_host is not None, "NOTION_HOST cannot be None"
-        notion_port: str = self.settings_tool.get("NOTION_PORT")
-        assert notion_port is not None, "NOTION_PORT cannot be None"
-        notion_version: str = self.settings_tool.get("NOTION_VERSION")
-        assert notion_version is not None, "NOTION_VERSION cannot be None"
         notion_database_uri: str = f"/v1/pages"
-        headers: dict = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "Notion-Version": notion_version,
-        }
         icon: dict = build_icon_for_request(page)
         properties: dict = build_properties_for_request(page)
         blocks: list = build_blocks_for_request(page)
@@ -59,61 +58,66 @@ class NotionPageManager:
             "parent": {"database_id": database_id},
             "icon": icon,
             "properties": properties,
-            "children": blocks,
+            "children": blocks[: self.MAX_CHILDREN_PER_REQUEST],
         }
-        body_json: str = json.dumps(body)
-        isHttps: bool = notion_protocol == "https"
-        conn: http.client.HTTPSConnection = (
-            http.client.HTTPSConnection(notion_host, notion_port)
-            if isHttps
-            else http.client.HTTPConnection(notion_host, notion_port)
+        response_dict: dict = self.notion_transport.request(
+            token, "POST", notion_database_uri, body
         )
-        assert conn is not None, "Connection cannot be None"
-        conn.request("POST", notion_database_uri, body_json, headers)
-        response: http.client.HTTPResponse = conn.getresponse()
-        assert response is not None, "Response cannot be None"
-        response_status: int = response.status
-        response_data: bytes = response.read()
-        validate_http_response(response_status, response.reason, response_data)
-        response_str: str = response_data.decode("utf-8")
-        response_dict: dict = json.loads(response_str)
+        if len(blocks) > self.MAX_CHILDREN_PER_REQUEST:
+            self.__append_children(
+                token, response_dict["id"], blocks, self.MAX_CHILDREN_PER_REQUEST
+            )
         return response_dict
 
+    @traced()
+    def append_blocks(
+        self, token: str, page_id: str, page: NotionPage, start_index: int = 0
+    ) -> int:
+        """
+        Appends page.blocks[start_index:] to the end of an existing page, in order.
+
+        Resumes a create_page that raised PartialWriteException when given the exception's
+        page_id and next_block_index. Returns the number of blocks appended.
+        """
+        assert token is not None, "Token cannot be None"
+        assert page_id is not None, "Page ID cannot be None"
+        assert page is not None, "Page cannot be None"
+        assert page.blocks is not None, "Page blocks cannot be None"
+        assert 0 <= start_index <= len(page.blocks), "Start index is out of range"
+        blocks: list = build_blocks_for_request(page)
+        self.__append_children(token, page_id, blocks, start_index)
+        return len(blocks) - start_index
+
+    @traced()
+    def __append_children(
+        self, token: str, page_id: str, blocks: list, start_index: int
+    ) -> None:
+        # Each batch lands at the end of the page, so batches are sent one after the other.
+        for index in range(start_index, len(blocks), self.MAX_CHILDREN_PER_REQUEST):
+            try:
+                self.notion_block_manager.append_block_children(
+                    token, page_id, blocks[index : index + self.MAX_CHILDREN_PER_REQUEST]
+                )
+            except Exception as e:
+                raise PartialWriteException(
+                    f"Page {page_id} was written up to block {index} of {len(blocks)}: {e}",
+                    page_id,
+                    index,
+                    e,
+                ) from e
+
+    @traced()
     def read_page_properties_by_page_id(self, token: str, page_id: str) -> NotionPage:
         assert page_id is not None, "Page ID cannot be None"
         assert token is not None, "Token cannot be None"
-        notion_protocol: str = self.settings_tool.get("NOTION_PROTOCOL")
-        assert notion_protocol is not None, "NOTION_PROTOCOL cannot be None"
-        notion_host: str = self.settings_tool.get("NOTION_HOST")
-        assert notion_host is not None, "NOTION_HOST cannot be None"
-        notion_port: str = self.settings_tool.get("NOTION_PORT")
-        assert notion_port is not None, "NOTION_PORT cannot be None"
-        notion_version: str = self.settings_tool.get("NOTION_VERSION")
-        assert notion_version is not None, "NOTION_VERSION cannot be None"
         notion_database_uri: str = f"/v1/pages/{page_id}"
-        headers: dict = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "Notion-Version": notion_version,
-        }
-        isHttps: bool = notion_protocol == "https"
-        conn: http.client.HTTPSConnection = (
-            http.client.HTTPSConnection(notion_host, notion_port)
-            if isHttps
-            else http.client.HTTPConnection(notion_host, notion_port)
+        response_dict: dict = self.notion_transport.request(
+            token, "GET", notion_database_uri
         )
-        assert conn is not None, "Connection cannot be None"
-        conn.request("GET", notion_database_uri, headers=headers)
-        response: http.client.HTTPResponse = conn.getresponse()
-        assert response is not None, "Response cannot be None"
-        response_status: int = response.status
-        response_data: bytes = response.read()
-        validate_http_response(response_status, response.reason, response_data)
-        response_str: str = response_data.decode("utf-8")
-        response_dict: dict = json.loads(response_str)
         response_page: NotionPage = build_page_from_response(response_dict)
         return response_page
 
+    @traced()
     def query_pages_by_database_id(
         self,
         token: str,
@@ -124,67 +128,56 @@ class NotionPageManager:
     ) -> list[NotionPage]:
         assert database_id is not None, "Database ID cannot be None"
         assert token is not None, "Token cannot be None"
-        notion_protocol: str = self.settings_tool.get("NOTION_PROTOCOL")
-        assert notion_protocol is not None, "NOTION_PROTOCOL cannot be None"
-        notion_host: str = self.settings_tool.get("NOTION_HOST")
-        assert notion_host is not None, "NOTION_HOST cannot be None"
-        notion_port: str = self.settings_tool.get("NOTION_PORT")
-        assert notion_port is not None, "NOTION_PORT cannot be None"
-        notion_version: str = self.settings_tool.get("NOTION_VERSION")
-        assert notion_version is not None, "NOTION_VERSION cannot be None"
         notion_database_uri: str = f"/v1/databases/{database_id}/query"
-        headers: dict = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "Notion-Version": notion_version,
-        }
         body: dict = {"page_size": page_size}
         if start_cursor is not None:
             body["start_cursor"] = start_cursor
         if filter is not None:
             body["filter"] = filter
-        body_json: str = json.dumps(body)
-        isHttps: bool = notion_protocol == "https"
-        conn: http.client.HTTPSConnection = (
-            http.client.HTTPSConnection(notion_host, notion_port)
-            if isHttps
-            else http.client.HTTPConnection(notion_host, notion_port)
+        response_dict: dict = self.notion_transport.request(
+            token, "POST", notion_database_uri, body
         )
-        assert conn is not None, "Connection cannot be None"
-        conn.request("POST", notion_database_uri, body_json, headers)
-        response: http.client.HTTPResponse = conn.getresponse()
-        assert response is not None, "Response cannot be None"
-        response_status: int = response.status
-        response_data: bytes = response.read()
-        validate_http_response(response_status, response.reason, response_data)
-        response_str: str = response_data.decode("utf-8")
-        response_dict: dict = json.loads(response_str)
         pages: list[NotionPage] = []
         for response_page in response_dict["results"]:
             page: NotionPage = build_page_from_response(response_page)
             pages.append(page)
         return pages
 
+    @traced()
     def read_page_by_id(self, token: str, page_id: str) -> NotionPage:
         assert page_id is not None, "Page ID cannot be None"
         assert token is not None, "Token cannot be None"
         notionPage: NotionPage = self.read_page_properties_by_page_id(token, page_id)
         blocks: list[NotionPageBlock] = []
-        has_more: bool = True
-        next_cursor: str = None
         try:
-            while has_more:
-                response: dict = self.notion_block_manager.read_page_blocks_by_page_id(
-                    token, page_id, page_size=100, start_cursor=next_cursor
-                )
-                blocks.extend(response["blocks"])
-                has_more = response["has_more"]
-                next_cursor = response["next_cursor"]
+            blocks = self.read_block_tree_by_block_id(token, page_id)
         except Exception as e:
             self.log_tool.error(f"Error reading page blocks: {e}")
         notionPage.blocks = blocks
         return notionPage
 
+    @traced()
+    def read_block_tree_by_block_id(
+        self, token: str, block_id: str
+    ) -> list[NotionPageBlock]:
+        assert token is not None, "Token cannot be None"
+        assert block_id is not None, "Block ID cannot be None"
+        blocks: list[NotionPageBlock] = []
+        has_more: bool = True
+        next_cursor: str = None
+        while has_more:
+            response: dict = self.notion_block_manager.read_page_blocks_by_page_id(
+                token, block_id, page_size=100, start_cursor=next_cursor
+            )
+            blocks.extend(response["blocks"])
+            has_more = response["has_more"]
+            next_cursor = response["next_cursor"]
+        for block in blocks:
+            if block.has_children:
+                block.children = self.read_block_tree_by_block_id(token, block.id)
+        return blocks
+
+    @traced()
     def update_page_by_id(self, token: str, page_id: str, page: NotionPage) -> dict:
         assert token is not None, "Token cannot be None"
         assert page_id is not None, "Page ID cannot be None"
@@ -192,20 +185,7 @@ class NotionPageManager:
         assert page.properties is not None, "Page properties cannot be None"
         assert len(page.properties) > 0, "Page properties cannot be empty"
         assert page.blocks is not None, "Page blocks cannot be None"
-        notion_protocol: str = self.settings_tool.get("NOTION_PROTOCOL")
-        assert notion_protocol is not None, "NOTION_PROTOCOL cannot be None"
-        notion_host: str = self.settings_tool.get("NOTION_HOST")
-        assert notion_host is not None, "NOTION_HOST cannot be None"
-        notion_port: str = self.settings_tool.get("NOTION_PORT")
-        assert notion_port is not None, "NOTION_PORT cannot be None"
-        notion_version: str = self.settings_tool.get("NOTION_VERSION")
-        assert notion_version is not None, "NOTION_VERSION cannot be None"
         notion_database_uri: str = f"/v1/pages/{page_id}"
-        headers: dict = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "Notion-Version": notion_version,
-        }
         icon: dict = build_icon_for_request(page)
         properties: dict = build_properties_for_request(page)
         # blocks: list = build_blocks_for_request(page)
@@ -214,92 +194,29 @@ class NotionPageManager:
             "properties": properties,
             # "children": blocks,
         }
-        body_json: str = json.dumps(body)
-        isHttps: bool = notion_protocol == "https"
-        conn: http.client.HTTPSConnection = (
-            http.client.HTTPSConnection(notion_host, notion_port)
-            if isHttps
-            else http.client.HTTPConnection(notion_host, notion_port)
+        response_dict: dict = self.notion_transport.request(
+            token, "PATCH", notion_database_uri, body
         )
-        assert conn is not None, "Connection cannot be None"
-        conn.request("PATCH", notion_database_uri, body_json, headers)
-        response: http.client.HTTPResponse = conn.getresponse()
-        assert response is not None, "Response cannot be None"
-        response_status: int = response.status
-        response_data: bytes = response.read()
-        validate_http_response(response_status, response.reason, response_data)
-        response_str: str = response_data.decode("utf-8")
-        response_dict: dict = json.loads(response_str)
         return response_dict
 
+    @traced()
     def archive_page_by_id(self, token: str, page_id: str) -> dict:
         assert token is not None, "Token cannot be None"
         assert page_id is not None, "Page ID cannot be None"
-        notion_protocol: str = self.settings_tool.get("NOTION_PROTOCOL")
-        assert notion_protocol is not None, "NOTION_PROTOCOL cannot be None"
-        notion_host: str = self.settings_tool.get("NOTION_HOST")
-        assert notion_host is not None, "NOTION_HOST cannot be None"
-        notion_port: str = self.settings_tool.get("NOTION_PORT")
-        assert notion_port is not None, "NOTION_PORT cannot be None"
-        notion_version: str = self.settings_tool.get("NOTION_VERSION")
-        assert notion_version is not None, "NOTION_VERSION cannot be None"
         notion_database_uri: str = f"/v1/pages/{page_id}"
-        headers: dict = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "Notion-Version": notion_version,
-        }
         body: dict = {"archived": True}
-        body_json: str = json.dumps(body)
-        isHttps: bool = notion_protocol == "https"
-        conn: http.client.HTTPSConnection = (
-            http.client.HTTPSConnection(notion_host, notion_port)
-            if isHttps
-            else http.client.HTTPConnection(notion_host, notion_port)
+        response_dict: dict = self.notion_transport.request(
+            token, "PATCH", notion_database_uri, body
         )
-        assert conn is not None, "Connection cannot be None"
-        conn.request("PATCH", notion_database_uri, body_json, headers)
-        response: http.client.HTTPResponse = conn.getresponse()
-        assert response is not None, "Response cannot be None"
-        response_status: int = response.status
-        response_data: bytes = response.read()
-        validate_http_response(response_status, response.reason, response_data)
-        response_str: str = response_data.decode("utf-8")
-        response_dict: dict = json.loads(response_str)
         return response_dict
 
+    @traced()
     def unarchive_page_by_id(self, token: str, page_id: str) -> dict:
         assert token is not None, "Token cannot be None"
         assert page_id is not None, "Page ID cannot be None"
-        notion_protocol: str = self.settings_tool.get("NOTION_PROTOCOL")
-        assert notion_protocol is not None, "NOTION_PROTOCOL cannot be None"
-        notion_host: str = self.settings_tool.get("NOTION_HOST")
-        assert notion_host is not None, "NOTION_HOST cannot be None"
-        notion_port: str = self.settings_tool.get("NOTION_PORT")
-        assert notion_port is not None, "NOTION_PORT cannot be None"
-        notion_version: str = self.settings_tool.get("NOTION_VERSION")
-        assert notion_version is not None, "NOTION_VERSION cannot be None"
         notion_database_uri: str = f"/v1/pages/{page_id}"
-        headers: dict = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "Notion-Version": notion_version,
-        }
         body: dict = {"archived": False}
-        body_json: str = json.dumps(body)
-        isHttps: bool = notion_protocol == "https"
-        conn: http.client.HTTPSConnection = (
-            http.client.HTTPSConnection(notion_host, notion_port)
-            if isHttps
-            else http.client.HTTPConnection(notion_host, notion_port)
+        response_dict: dict = self.notion_transport.request(
+            token, "PATCH", notion_database_uri, body
         )
-        assert conn is not None, "Connection cannot be None"
-        conn.request("PATCH", notion_database_uri, body_json, headers)
-        response: http.client.HTTPResponse = conn.getresponse()
-        assert response is not None, "Response cannot be None"
-        response_status: int = response.status
-        response_data: bytes = response.read()
-        validate_http_response(response_status, response.reason, response_data)
-        response_str: str = response_data.decode("utf-8")
-        response_dict: dict = json.loads(response_str)
         return response_dict
@@ -0,0 +1,106 @@
+import sys, os, asyncio, hashlib, threading, time
+
+sys.path.insert(0, os.path.abspath("."))
+from main.library.tools.core.log_tool import LogTool
+from main.library.tools.core.settings_tool import SettingsTool
+
+
+class NotionRateLimiter:
+    """
+    Token bucket rate limiter, with one bucket per Notion integration token.
+
+    Callers reserve their slot in the bucket up front and then wait for it, so bursts
+    queue up inside the budget (NOTION_RATE_LIMIT_PER_SECOND, NOTION_RATE_LIMIT_BURST)
+    in arrival order instead of being rejected by Notion.
+    """
+
+    MAX_BUCKETS: int = 10000
+
+    def __init__(self, settings_tool: SettingsTool, log_tool: LogTool):
+        self.settings_tool: SettingsTool = settings_tool
+        self.log_tool: LogTool = log_tool
+        rate: str | None = self.settings_tool.get("NOTION_RATE_LIMIT_PER_SECOND")
+        burst: str | None = self.settings_tool.get("NOTION_RATE_LIMIT_BURST")
+        self.rate: float = float(rate) if rate is not None else 3.0
+        self.burst: float = float(burst) if burst is not None else 3.0
+        assert self.rate > 0, "NOTION_RATE_LIMIT_PER_SECOND must be greater than zero"
+        assert self.burst >= 1, "NOTION_RATE_LIMIT_BURST must be at least one"
+        self.wait_count: int = 0
+        self.wait_seconds: float = 0.0
+        self.max_wait_seconds: float = 0.0
+        self._lock: threading.Lock = threading.Lock()
+        self._buckets: dict[str, list[float]] = {}
+
+    def acquire(self, token: str) -> float:
+        """
+        Blocks until the token may send one more request. Returns the time waited, in seconds.
+        """
+        delay: float = self.__reserve(token)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, token: str) -> float:
+        """
+        Awaits until the token may send one more request. Returns the time waited, in seconds.
+        """
+        delay: float = self.__reserve(token)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def penalize(self, token: str, seconds: float) -> None:
+        """
+        Holds back every request of the token for `seconds`, e.g. after Notion answered 429.
+        """
+        key: str = self.__get_key(token)
+        with self._lock:
+            bucket: list[float] = self.__refill(key, time.monotonic())
+            bucket[0] = min(bucket[0], -seconds * self.rate)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "buckets": len(self._buckets),
+                "wait_count": self.wait_count,
+                "wait_seconds": self.wait_seconds,
+                "max_wait_seconds": self.max_wait_seconds,
+            }
+
+    def __reserve(self, token: str) -> float:
+        assert token is not None, "Token cannot be None"
+        key: str = self.__get_key(token)
+        with self._lock:
+            bucket: list[float] = self.__refill(key, time.monotonic())
+            bucket[0] -= 1
+            delay: float = 0.0 if bucket[0] >= 0 else -bucket[0] / self.rate
+            if delay > 0:
+                self.wait_count += 1
+                self.wait_seconds += delay
+                self.max_wait_seconds = max(self.max_wait_seconds, delay)
+            return delay
+
+    def __refill(self, key: str, now: float) -> list[float]:
+        bucket: list[float] | None = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.MAX_BUCKETS:
+                self.__prune(now)
+            bucket = [self.burst, now]
+            self._buckets[key] = bucket
+            return bucket
+        tokens, updated_at = bucket
+        bucket[0] = min(self.burst, tokens + (now - updated_at) * self.rate)
+        bucket[1] = now
+        return bucket
+
+    def __prune(self, now: float) -> None:
+        full: list[str] = [
+            key
+            for key, (tokens, updated_at) in self._buckets.items()
+            if tokens + (now - updated_at) * self.rate >= self.burst
+        ]
+        for key in full:
+            del self._buckets[key]
+
+    def __get_key(self, token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
@@ -0,0 +1,183 @@
+import sys, os, http.client, json, time
+
+
+sys.path.insert(0, os.path.abspath("."))
+from main.library.repositories.notion.core.notion_rate_limiter import (
+    NotionRateLimiter,
+)
+from main.library.repositories.notion.utils.notion_retry import (
+    get_retry_delay,
+    is_idempotent_request,
+    is_retryable_status,
+    parse_retry_after,
+)
+from main.library.repositories.notion.utils.notion_validations import (
+    validate_http_response,
+)
+from main.library.tools.core.connection_pool_tool import ConnectionPoolTool
+from main.library.tools.core.log_tool import LogTool
+from main.library.tools.core.metrics_tool import MetricsTool, get_endpoint_template
+from main.library.tools.core.settings_tool import SettingsTool
+from main.library.tools.core.tracing_tool import start_span, traced
+
+
+class NotionTransport:
+    """
+    Sends requests to the Notion API over connections borrowed from a shared keep-alive pool.
+
+    Every request first waits for its token's rate limit budget. Responses with status 429,
+    and 5xx responses to idempotent requests (GETs, DELETEs and archives), are retried with
+    jittered exponential backoff, honouring Retry-After, up to NOTION_RETRY_MAX_ATTEMPTS attempts.
+    """
+
+    def __init__(
+        self,
+        settings_tool: SettingsTool,
+        log_tool: LogTool,
+        connection_pool_tool: ConnectionPoolTool,
+        notion_rate_limiter: NotionRateLimiter,
+        metrics_tool: MetricsTool | None = None,
+    ):
+        self.settings_tool: SettingsTool = settings_tool
+        self.log_tool: LogTool = log_tool
+        self.connection_pool_tool: ConnectionPoolTool = connection_pool_tool
+        self.notion_rate_limiter: NotionRateLimiter = notion_rate_limiter
+        self.metrics_tool: MetricsTool | None = metrics_tool
+        self.retry_count: int = 0
+        self.retry_wait_seconds: float = 0.0
+
+    @traced("notion.request")
+    def request(
+        self, token: str, method: str, uri: str, body: dict | list | None = None
+    ) -> dict:
+        assert token is not None, "Token cannot be None"
+        assert method is not None, "Method cannot be None"
+        assert uri is not None, "URI cannot be None"
+        notion_protocol: str = self.settings_tool.get("NOTION_PROTOCOL")
+        assert notion_protocol is not None, "NOTION_PROTOCOL cannot be None"
+        notion_host: str = self.settings_tool.get("NOTION_HOST")
+        assert notion_host is not None, "NOTION_HOST cannot be None"
+        notion_port: str = self.settings_tool.get("NOTION_PORT")
+        assert notion_port is not None, "NOTION_PORT cannot be None"
+        notion_version: str = self.settings_tool.get("NOTION_VERSION")
+        assert notion_version is not None, "NOTION_VERSION cannot be None"
+        headers: dict = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+            "Notion-Version": notion_version,
+        }
+        max_attempts: int = int(self.settings_tool.get("NOTION_RETRY_MAX_ATTEMPTS") or 5)
+        base_delay: float = float(self.settings_tool.get("NOTION_RETRY_BASE_DELAY") or 0.5)
+        max_delay: float = float(self.settings_tool.get("NOTION_RETRY_MAX_DELAY") or 30)
+        body_json: str | None = json.dumps(body) if body is not None else None
+        idempotent: bool = is_idempotent_request(method, body)
+        attempt: int = 0
+        while True:
+            with start_span(
+                "notion.attempt",
+                method=method,
+                endpoint=get_endpoint_template(uri),
+                attempt=attempt + 1,
+            ) as span:
+                waited: float = self.notion_rate_limiter.acquire(token)
+                started_at: float = time.perf_counter()
+                try:
+                    response_status, response_reason, response_data, retry_after = (
+                        self.__send(
+                            notion_protocol,
+                            notion_host,
+                            notion_port,
+                            method,
+                            uri,
+                            body_json,
+                            headers,
+                            idempotent,
+                        )
+                    )
+                except Exception:
+                    self.__observe(method, uri, "error", started_at)
+                    raise
+                self.__observe(method, uri, str(response_status), started_at)
+                if span is not None:
+                    span.set_attribute("rate_limit_wait_seconds", waited)
+                    span.set_attribute("status", response_status)
+            if (
+                not is_retryable_status(response_status, idempotent)
+                or attempt + 1 >= max_attempts
+            ):
+                break
+            delay: float = get_retry_delay(attempt, retry_after, base_delay, max_delay)
+            self.retry_count += 1
+            self.retry_wait_seconds += delay
+            self.log_tool.warn(
+                f"Notion answered {response_status} to {method} {uri}, retrying in {delay:.2f}s"
+            )
+            if response_status == 429:
+                # Throttled: hold back every request of this token, this one included.
+                self.notion_rate_limiter.penalize(token, delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+        validate_http_response(response_status, response_reason, response_data, retry_after)
+        response_str: str = response_data.decode("utf-8")
+        response_dict: dict = json.loads(response_str)
+        return response_dict
+
+    def get_stats(self) -> dict:
+        return {
+            "retry_count": self.retry_count,
+            "retry_wait_seconds": self.retry_wait_seconds,
+        }
+
+    def __observe(self, method: str, uri: str, status: str, started_at: float) -> None:
+        if self.metrics_tool is not None:
+            self.metrics_tool.observe(
+                "notion_request_duration_seconds",
+                {"method": method, "endpoint": get_endpoint_template(uri), "status": status},
+                time.perf_counter() - started_at,
+                "Duration of each Notion API call, retries counted separately",
+            )
+
+    def __send(
+        self,
+        protocol: str,
+        host: str,
+        port: str,
+        method: str,
+        uri: str,
+        body_json: str | None,
+        headers: dict,
+        idempotent: bool,
+    ) -> tuple[int, str, bytes, float | None]:
+        conn: http.client.HTTPConnection = self.connection_pool_tool.acquire(
+            protocol, host, port
+        )
+        reused: bool = conn.sock is not None
+        try:
+            conn.request(method, uri, body_json, headers)
+            response: http.client.HTTPResponse = conn.getresponse()
+            assert response is not None, "Response cannot be None"
+            response_data: bytes = response.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            self.connection_pool_tool.release(protocol, host, port, conn, False)
+            if not reused or not idempotent:
+                raise
+            # The server dropped a kept-alive connection between requests: retry once on a fresh one.
+            # Only idempotent requests, since the server may have handled the first send.
+            self.log_tool.warn(f"Stale Notion connection discarded for {method} {uri}")
+            conn = self.connection_pool_tool.acquire(protocol, host, port)
+            try:
+                conn.request(method, uri, body_json, headers)
+                response = conn.getresponse()
+                assert response is not None, "Response cannot be None"
+                response_data = response.read()
+            except Exception:
+                self.connection_pool_tool.release(protocol, host, port, conn, False)
+                raise
+        except Exception:
+            self.connection_pool_tool.release(protocol, host, port, conn, False)
+            raise
+        reusable: bool = response.will_close is False
+        self.connection_pool_tool.release(protocol, host, port, conn, reusable)
+        retry_after: float | None = parse_retry_after(response.getheader("Retry-After"))
+        return response.status, response.reason, response_data, retry_after
@@ -7,6 +7,8 @@ sys.path.insert(0, os.path.abspath("."))
 
 
 class NotionIcon:
+    __slots__ = ("type", "value")
+
     def __init__(self, icon_type: str, icon_value: Any):
         self.type = icon_type
         self.value = icon_value
@@ -23,6 +25,9 @@ class NotionIcon:
     def __hash__(self):
         return hash((self.type, self.value))
 
+    def to_dict(self) -> dict:
+        return {"type": self.type, "value": self.value}
+
     def to_payload(self) -> dict:
         payload: dict = {"type": self.type}
         if self.type == NOTION_ICON_TYPES["emoji"]:
@@ -44,6 +44,24 @@ class NotionDatabase:
     def to_json(self) -> str:
         return json.dumps(self.to_dict())
 
+    def to_dict(self) -> dict:
+        return {
+            "is_inline": self.is_inline,
+            "parent_id": self.parent_id,
+            "icon": self.icon.to_dict() if self.icon is not None else None,
+            "title": self.title,
+            "description": self.description,
+            "properties": (
+                [prop.to_dict() for prop in self.properties]
+                if self.properties is not None
+                else None
+            ),
+            "id": self.id,
+            "archived": self.archived,
+            "url": self.url,
+            "request_id": self.request_id,
+        }
+
     def to_create_payload(self) -> dict:
         assert self.is_inline is not None, "is_inline cannot be None"
         assert self.parent_id is not None, "parent cannot be None"
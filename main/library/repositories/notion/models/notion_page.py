@@ -8,6 +8,21 @@ from main.library.repositories.notion.models.notion_property import NotionProper
 
 
 class NotionPage:
+    __slots__ = (
+        "id",
+        "parent",
+        "url",
+        "request_id",
+        "archived",
+        "created_time",
+        "last_edited_time",
+        "created_by",
+        "last_edited_by",
+        "icon",
+        "properties",
+        "blocks",
+    )
+
     def __init__(
         self,
         icon: NotionIcon,
@@ -51,3 +66,30 @@ class NotionPage:
 
     def __hash__(self):
         return hash((self.icon, self.properties, self.blocks))
+
+    def to_dict(self) -> dict:
+        """
+        Returns the page as JSON-ready dicts and lists, keyed like its attributes.
+        """
+        return {
+            "id": self.id,
+            "parent": self.parent,
+            "url": self.url,
+            "request_id": self.request_id,
+            "archived": self.archived,
+            "created_time": self.created_time,
+            "last_edited_time": self.last_edited_time,
+            "created_by": self.created_by,
+            "last_edited_by": self.last_edited_by,
+            "icon": self.icon.to_dict() if self.icon is not None else None,
+            "properties": (
+                [prop.to_dict() for prop in self.properties]
+                if self.properties is not None
+                else None
+            ),
+            "blocks": (
+                [block.to_dict() for block in self.blocks]
+                if self.blocks is not None
+                else None
+            ),
+        }
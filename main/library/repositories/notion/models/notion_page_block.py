@@ -5,10 +5,21 @@ from typing import Any
 
 
 class NotionPageBlock:
-    def __init__(self, block_type: str, value: Any, block_id: str = None):
+    __slots__ = ("id", "type", "value", "has_children", "children")
+
+    def __init__(
+        self,
+        block_type: str,
+        value: Any,
+        block_id: str = None,
+        has_children: bool = False,
+        children: list["NotionPageBlock"] | None = None,
+    ):
         self.id = block_id
         self.type = block_type
         self.value = value
+        self.has_children = has_children
+        self.children = children
 
     def __str__(self):
         return f"{self.type}: {self.value}"
@@ -18,3 +29,16 @@ class NotionPageBlock:
 
     def __eq__(self, other):
         return self.type == other.type and self.value == other.value
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "type": self.type,
+            "value": self.value,
+            "has_children": self.has_children,
+            "children": (
+                [child.to_dict() for child in self.children]
+                if self.children is not None
+                else None
+            ),
+        }
@@ -5,6 +5,8 @@ from typing import Any
 
 
 class NotionProperty:
+    __slots__ = ("name", "type", "value", "options")
+
     def __init__(
         self, name: str, prop_type: str, value: Any, options: Any | None = None
     ):
@@ -16,6 +18,14 @@ class NotionProperty:
     def __str__(self) -> str:
         return f"{self.name} ({self.type}): {self.value}"
 
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "type": self.type,
+            "value": self.value,
+            "options": self.options,
+        }
+
     @staticmethod
     def from_dict(data: dict) -> "NotionProperty":
         return NotionProperty(
@@ -31,6 +31,23 @@ class NotionSearchResult:
     def count(self):
         return len(self.pages) + len(self.databases)
 
+    def to_dict(self) -> dict:
+        return {
+            "has_more": self.has_more,
+            "next_cursor": self.next_cursor,
+            "pages": (
+                [page.to_dict() for page in self.pages]
+                if self.pages is not None
+                else None
+            ),
+            "databases": (
+                [database.to_dict() for database in self.databases]
+                if self.databases is not None
+                else None
+            ),
+            "request_id": self.request_id,
+        }
+
     @staticmethod
     def from_dict(data: dict[str, Any]) -> "NotionSearchResult":
         pages_from_dict: list[dict] = [
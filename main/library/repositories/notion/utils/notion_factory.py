@@ -1,5 +1,5 @@
 import sys, os
-from typing import Any
+from typing import Any, Callable
 
 from main.library.repositories.notion.models.notion_custom_icon import NotionIcon
 from main.library.repositories.notion.utils.notion_icon_types import NOTION_ICON_TYPES
@@ -9,6 +9,7 @@ sys.path.insert(0, os.path.abspath("."))
 from main.library.repositories.notion.models.notion_page import NotionPage
 from main.library.repositories.notion.models.notion_page_block import NotionPageBlock
 from main.library.repositories.notion.models.notion_property import NotionProperty
+from main.library.tools.core.tracing_tool import traced
 
 
 def build_block_from_response(block: dict) -> NotionPageBlock:
@@ -16,12 +17,48 @@ def build_block_from_response(block: dict) -> NotionPageBlock:
     assert "object" in block, "Block object cannot be None"
     assert block["object"] == "block", "Block object must be a block"
     assert "type" in block, "Block type cannot be None"
-    block_type: str = block["type"]
-    value: str = get_block_value_from_response(block)
-    block_id: str = block["id"]
-    return NotionPageBlock(block_type, value, block_id)
+    return decode_blocks([block])[0]
+
+
+@traced()
+def build_blocks_from_response(
+    blocks: list[dict], skip_unknown_types: bool = False
+) -> list[NotionPageBlock]:
+    """
+    Decodes a list of blocks, e.g. the results of a block children response.
+
+    Blocks of a type without a decoder raise, unless `skip_unknown_types` leaves them out.
+    """
+    assert blocks is not None, "Blocks cannot be None"
+    return decode_blocks(blocks, skip_unknown_types)
+
+
+def decode_blocks(
+    blocks: list[dict], skip_unknown_types: bool = False
+) -> list[NotionPageBlock]:
+    # Hot loop of every page read: one decoder lookup per block, no per-block checks or spans.
+    decoders: dict[str, Callable[[dict], Any]] = BLOCK_DECODERS
+    page_blocks: list[NotionPageBlock] = []
+    append: Callable[[NotionPageBlock], None] = page_blocks.append
+    for block in blocks:
+        block_type: str = block["type"]
+        decoder: Callable[[dict], Any] | None = decoders.get(block_type)
+        if decoder is None:
+            if skip_unknown_types:
+                continue
+            raise Exception(f"Invalid block type: {block_type}")
+        append(
+            NotionPageBlock(
+                block_type,
+                decoder(block[block_type]),
+                block["id"],
+                block.get("has_children") is True,
+            )
+        )
+    return page_blocks
 
 
+@traced()
 def build_page_from_response(response: dict) -> NotionPage:
     assert response is not None, "Response cannot be None"
     assert "object" in response, "Response object cannot be None"
@@ -85,112 +122,300 @@ def get_icon_from_response(response: dict) -> NotionIcon | None:
         return None
 
 
+def get_plain_text_from_rich_text(rich_text: list[dict]) -> str:
+    if len(rich_text) == 1:
+        return str(rich_text[0]["plain_text"])
+    return "".join([str(segment["plain_text"]) for segment in rich_text])
+
+
+def build_rich_text_for_request(content: str) -> list[dict]:
+    return [{"type": "text", "text": {"content": content}}]
+
+
+def decode_rich_text_block(content: dict) -> str:
+    return get_plain_text_from_rich_text(content["rich_text"])
+
+
+def decode_external_block(content: dict) -> str:
+    return str(content["external"]["url"])
+
+
+def decode_file_block(content: dict) -> dict:
+    return {
+        "name": str(content["name"]),
+        "url": str(content["external"]["url"]),
+    }
+
+
+def decode_code_block(content: dict) -> dict:
+    return {
+        "content": get_plain_text_from_rich_text(content["rich_text"]),
+        "language": str(content["language"]),
+    }
+
+
+def encode_rich_text_block(block_type: str, value: Any) -> dict:
+    assert isinstance(value, str), f"When type is {block_type}, value must be a string"
+    return {"rich_text": build_rich_text_for_request(value)}
+
+
+def encode_external_block(block_type: str, value: Any) -> dict:
+    assert isinstance(value, str), f"When type is {block_type}, value must be a string"
+    return {"caption": [], "type": "external", "external": {"url": value}}
+
+
+def encode_file_block(block_type: str, value: Any) -> dict:
+    assert isinstance(value, dict), "When type is file, value must be a dictionary"
+    file_name: str = value["name"]
+    file_url: str = value["url"]
+    return {
+        "caption": [],
+        "type": "external",
+        "external": {"url": file_url},
+        "name": file_name,
+    }
+
+
+def encode_code_block(block_type: str, value: Any) -> dict:
+    assert isinstance(value, dict), "When type is code, value must be a dictionary"
+    code_content: str = value["content"]
+    code_language: str = value["language"]
+    return {
+        "caption": [],
+        "rich_text": build_rich_text_for_request(code_content),
+        "language": code_language,
+    }
+
+
+# Decoders receive the type-specific object of a block (block[block["type"]]).
+BLOCK_DECODERS: dict[str, Callable[[dict], Any]] = {
+    "paragraph": decode_rich_text_block,
+    "heading_1": decode_rich_text_block,
+    "heading_2": decode_rich_text_block,
+    "heading_3": decode_rich_text_block,
+    "bulleted_list_item": decode_rich_text_block,
+    "numbered_list_item": decode_rich_text_block,
+    "to_do": decode_rich_text_block,
+    "toggle": decode_rich_text_block,
+    "image": decode_external_block,
+    "video": decode_external_block,
+    "file": decode_file_block,
+    "code": decode_code_block,
+    "quote": decode_rich_text_block,
+}
+
+# Encoders receive the block type and value, and return the type-specific object of the block.
+BLOCK_ENCODERS: dict[str, Callable[[str, Any], dict]] = {
+    "paragraph": encode_rich_text_block,
+    "heading_1": encode_rich_text_block,
+    "heading_2": encode_rich_text_block,
+    "heading_3": encode_rich_text_block,
+    "bulleted_list_item": encode_rich_text_block,
+    "numbered_list_item": encode_rich_text_block,
+    "to_do": encode_rich_text_block,
+    "toggle": encode_rich_text_block,
+    "image": encode_external_block,
+    "video": encode_external_block,
+    "file": encode_file_block,
+    "code": encode_code_block,
+    "quote": encode_rich_text_block,
+}
+
+
+def decode_select_prop(value: dict | None) -> dict:
+    return {
+        "name": str(value["name"] if value is not None else ""),
+        "color": str(value["color"] if value is not None else ""),
+    }
+
+
+def decode_multi_select_prop(value: list[dict]) -> list[dict]:
+    return [
+        {"name": str(option["name"]), "color": str(option["color"])}
+        for option in value
+    ]
+
+
+def decode_files_prop(value: list[dict]) -> list[dict]:
+    files_to_return: list[dict] = []
+    for file in value:
+        file_obj: dict = {}
+        if "external" in file:
+            file_obj["name"] = str(file["name"])
+            file_obj["url"] = str(file["external"]["url"])
+        elif "file" in file:
+            file_obj["name"] = str(file["name"])
+            file_obj["url"] = str(file["file"]["url"])
+        else:
+            raise Exception(f"Unrecognized file object: {file}")
+        files_to_return.append(file_obj)
+    return files_to_return
+
+
+def encode_text_prop(prop_type: str, value: Any) -> list[dict]:
+    assert isinstance(value, str), f"When type is {prop_type}, value must be a string"
+    return [{"text": {"content": value}}]
+
+
+def encode_string_prop(prop_type: str, value: Any) -> str:
+    assert isinstance(value, str), f"When type is {prop_type}, value must be a string"
+    return value
+
+
+def encode_number_prop(prop_type: str, value: Any) -> float:
+    assert isinstance(value, float), "When type is number, value must be a float"
+    return value
+
+
+def encode_select_prop(prop_type: str, value: Any) -> dict:
+    assert isinstance(value, dict), "When type is select, value must be a dictionary"
+    return {"name": value["name"], "color": value["color"]}
+
+
+def encode_multi_select_prop(prop_type: str, value: Any) -> list[dict]:
+    assert isinstance(
+        value, list
+    ), "When type is multi_select, value must be a list of dictionaries"
+    return [
+        {"name": selection["name"], "color": selection["color"]} for selection in value
+    ]
+
+
+def encode_date_prop(prop_type: str, value: Any) -> dict:
+    assert isinstance(value, str), "When type is date, value must be a string"
+    return {"start": value}
+
+
+def encode_people_prop(prop_type: str, value: Any) -> list[dict]:
+    assert isinstance(value, list), "When type is people, value must be a list of strings"
+    return [{"object": "user", "id": person_id} for person_id in value]
+
+
+def encode_files_prop(prop_type: str, value: Any) -> list[dict]:
+    assert isinstance(value, list), "When type is files, value must be a list of strings"
+    return [{"name": file["name"], "external": {"url": file["url"]}} for file in value]
+
+
+def encode_checkbox_prop(prop_type: str, value: Any) -> bool:
+    assert isinstance(value, bool), "When type is checkbox, value must be a boolean"
+    return value
+
+
+def encode_relation_prop(prop_type: str, value: Any) -> list[dict]:
+    assert isinstance(
+        value, list
+    ), "When type is relation, value must be a list of strings"
+    return [{"id": id} for id in value]
+
+
+def build_read_only_prop_encoder(message: str) -> Callable[[str, Any], Any]:
+    def encode_read_only_prop(prop_type: str, value: Any) -> Any:
+        raise Exception(message)
+
+    return encode_read_only_prop
+
+
+# Decoders receive the type-specific value of a property (prop[prop["type"]]).
+PROPERTY_DECODERS: dict[str, Callable[[Any], Any]] = {
+    "title": get_plain_text_from_rich_text,
+    "rich_text": get_plain_text_from_rich_text,
+    "number": lambda value: float(value) if value is not None else None,
+    "select": decode_select_prop,
+    "multi_select": decode_multi_select_prop,
+    "date": lambda value: str(value["start"] if value is not None else ""),
+    "people": lambda value: [str(person["id"]) for person in value],
+    "files": decode_files_prop,
+    "checkbox": lambda value: bool(value),
+    "url": lambda value: str(value),
+    "email": lambda value: str(value),
+    "phone_number": lambda value: str(value),
+    "formula": lambda value: dict(value),
+    "relation": lambda value: [str(relation["id"]) for relation in value],
+    "rollup": lambda value: dict(value),
+    "created_time": lambda value: str(value),
+    "last_edited_time": lambda value: str(value),
+    "last_edited_by": lambda value: str(value["id"]),
+    "created_by": lambda value: str(value["id"]),
+}
+
+# Encoders receive the property type and value, and return the type-specific value of the property.
+PROPERTY_ENCODERS: dict[str, Callable[[str, Any], Any]] = {
+    "title": encode_text_prop,
+    "rich_text": encode_text_prop,
+    "number": encode_number_prop,
+    "select": encode_select_prop,
+    "multi_select": encode_multi_select_prop,
+    "date": encode_date_prop,
+    "people": encode_people_prop,
+    "files": encode_files_prop,
+    "checkbox": encode_checkbox_prop,
+    "url": encode_string_prop,
+    "email": encode_string_prop,
+    "phone_number": encode_string_prop,
+    "formula": build_read_only_prop_encoder("Formulas are not supported for now"),
+    "relation": encode_relation_prop,
+    "rollup": build_read_only_prop_encoder("Rollups are not supported for now"),
+    "created_time": build_read_only_prop_encoder(
+        "Created time should not be set manually"
+    ),
+    "last_edited_time": build_read_only_prop_encoder(
+        "Last edited time should not be set manually"
+    ),
+    "last_edited_by": build_read_only_prop_encoder(
+        "Last edited by should not be set manually"
+    ),
+    "created_by": build_read_only_prop_encoder("Created by should not be set manually"),
+}
+
+
+def register_block_codec(
+    block_type: str,
+    decoder: Callable[[dict], Any] | None = None,
+    encoder: Callable[[str, Any], dict] | None = None,
+) -> None:
+    """
+    Adds or replaces how a block type is read from and written to Notion.
+    """
+    assert block_type is not None, "Block type cannot be None"
+    if decoder is not None:
+        BLOCK_DECODERS[block_type] = decoder
+    if encoder is not None:
+        BLOCK_ENCODERS[block_type] = encoder
+
+
+def register_property_codec(
+    prop_type: str,
+    decoder: Callable[[Any], Any] | None = None,
+    encoder: Callable[[str, Any], Any] | None = None,
+) -> None:
+    """
+    Adds or replaces how a property type is read from and written to Notion.
+    """
+    assert prop_type is not None, "Property type cannot be None"
+    if decoder is not None:
+        PROPERTY_DECODERS[prop_type] = decoder
+    if encoder is not None:
+        PROPERTY_ENCODERS[prop_type] = encoder
+
+
 def get_block_value_from_response(block: dict) -> Any:
     assert block is not None, "Block cannot be None"
     assert "type" in block, "Block type cannot be None"
     block_type: str = block["type"]
-    if block_type == "paragraph":
-        return str(block["paragraph"]["rich_text"][0]["plain_text"])
-    elif block_type == "heading_1":
-        return str(block["heading_1"]["rich_text"][0]["plain_text"])
-    elif block_type == "heading_2":
-        return str(block["heading_2"]["rich_text"][0]["plain_text"])
-    elif block_type == "heading_3":
-        return str(block["heading_3"]["rich_text"][0]["plain_text"])
-    elif block_type == "bulleted_list_item":
-        return str(block["bulleted_list_item"]["rich_text"][0]["plain_text"])
-    elif block_type == "numbered_list_item":
-        return str(block["numbered_list_item"]["rich_text"][0]["plain_text"])
-    elif block_type == "to_do":
-        return str(block["to_do"]["rich_text"][0]["plain_text"])
-    elif block_type == "toggle":
-        return str(block["toggle"]["rich_text"][0]["plain_text"])
-    elif block_type == "image":
-        return str(block["image"]["external"]["url"])
-    elif block_type == "video":
-        return str(block["video"]["external"]["url"])
-    elif block_type == "file":
-        return {
-            "name": str(block["file"]["name"]),
-            "url": str(block["file"]["external"]["url"]),
-        }
-    elif block_type == "code":
-        return {
-            "content": str(block["code"]["rich_text"][0]["plain_text"]),
-            "language": str(block["code"]["language"]),
-        }
-    elif block_type == "quote":
-        return str(block["quote"]["rich_text"][0]["plain_text"])
-    else:
+    decoder: Callable[[dict], Any] | None = BLOCK_DECODERS.get(block_type)
+    if decoder is None:
         raise Exception(f"Invalid block type: {block_type}")
+    return decoder(block[block_type])
 
 
 def get_prop_value_from_response(prop: dict) -> Any:
     assert prop is not None, "Property cannot be None"
     assert "type" in prop, "Property type cannot be None"
     prop_type: str = prop["type"]
-    if prop_type == "title":
-        return str(prop["title"][0]["plain_text"])
-    elif prop_type == "rich_text":
-        return str(prop["rich_text"][0]["plain_text"])
-    elif prop_type == "number":
-        return float(prop["number"])
-    elif prop_type == "select":
-        return {
-            "name": str(prop["select"]["name"] if prop["select"] is not None else ""),
-            "color": str(prop["select"]["color"] if prop["select"] is not None else ""),
-        }
-    elif prop_type == "multi_select":
-        options: list[dict] = prop["multi_select"]
-        return [
-            {"name": str(option["name"]), "color": str(option["color"])}
-            for option in options
-        ]
-    elif prop_type == "date":
-        return str(prop["date"]["start"] if prop["date"] is not None else "")
-    elif prop_type == "people":
-        people_ids: list[str] = [str(person["id"]) for person in prop["people"]]
-        return people_ids
-    elif prop_type == "files":
-        files: list[dict] = prop["files"]
-        files_to_return: list[dict] = []
-        for file in files:
-            file_obj: dict = {}
-            if "external" in file:
-                file_obj["name"] = str(file["name"])
-                file_obj["url"] = str(file["external"]["url"])
-            elif "file" in file:
-                file_obj["name"] = str(file["name"])
-                file_obj["url"] = str(file["file"]["url"])
-            else:
-                raise Exception(f"Unrecognized file object: {file}")
-            files_to_return.append(file_obj)
-        return files_to_return
-    elif prop_type == "checkbox":
-        return bool(prop["checkbox"])
-    elif prop_type == "url":
-        return str(prop["url"])
-    elif prop_type == "email":
-        return str(prop["email"])
-    elif prop_type == "phone_number":
-        return str(prop["phone_number"])
-    elif prop_type == "formula":
-        return dict(prop["formula"])
-    elif prop_type == "relation":
-        relation_list: list[dict] = prop["relation"]
-        return [str(relation["id"]) for relation in relation_list]
-    elif prop_type == "rollup":
-        return dict(prop["rollup"])
-    elif prop_type == "created_time":
-        return str(prop["created_time"])
-    elif prop_type == "last_edited_time":
-        return str(prop["last_edited_time"])
-    elif prop_type == "last_edited_by":
-        return str(prop["last_edited_by"]["id"])
-    elif prop_type == "created_by":
-        return str(prop["created_by"]["id"])
-    else:
+    decoder: Callable[[Any], Any] | None = PROPERTY_DECODERS.get(prop_type)
+    if decoder is None:
         raise Exception(f"Invalid property type: {prop_type}")
+    return decoder(prop[prop_type])
 
 
 def build_blocks_for_request(page: NotionPage) -> list:
@@ -199,279 +424,16 @@ def build_blocks_for_request(page: NotionPage) -> list:
     assert len(page.blocks) >= 0, "Blocks cannot be empty"
     blocks: list = []
     for notionBlock in page.blocks:
-        if notionBlock.type == "paragraph":
-            assert isinstance(
-                notionBlock.value, str
-            ), "When type is paragraph, value must be a string"
-            paragraph_content: str = notionBlock.value
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": paragraph_content,
-                                },
-                            }
-                        ]
-                    },
-                }
-            )
-        elif notionBlock.type == "heading_1":
-            assert isinstance(
-                notionBlock.value, str
-            ), "When type is heading_1, value must be a string"
-            heading_1_content: str = notionBlock.value
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "heading_1",
-                    "heading_1": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": heading_1_content,
-                                },
-                            }
-                        ]
-                    },
-                }
-            )
-        elif notionBlock.type == "heading_2":
-            assert isinstance(
-                notionBlock.value, str
-            ), "When type is heading_2, value must be a string"
-            heading_2_content: str = notionBlock.value
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "heading_2",
-                    "heading_2": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": heading_2_content,
-                                },
-                            }
-                        ]
-                    },
-                }
-            )
-        elif notionBlock.type == "heading_3":
-            assert isinstance(
-                notionBlock.value, str
-            ), "When type is heading_3, value must be a string"
-            heading_3_content: str = notionBlock.value
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "heading_3",
-                    "heading_3": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": heading_3_content,
-                                },
-                            }
-                        ]
-                    },
-                }
-            )
-        elif notionBlock.type == "bulleted_list_item":
-            assert isinstance(
-                notionBlock.value, str
-            ), "When type is bulleted_list_item, value must be a string"
-            bulleted_single_item_content: str = notionBlock.value
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": bulleted_single_item_content,
-                                },
-                            }
-                        ]
-                    },
-                }
-            )
-        elif notionBlock.type == "numbered_list_item":
-            assert isinstance(
-                notionBlock.value, str
-            ), "When type is numbered_list_item, value must be a string"
-            numbered_single_item_content: str = notionBlock.value
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "numbered_list_item",
-                    "numbered_list_item": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": numbered_single_item_content,
-                                },
-                            }
-                        ]
-                    },
-                }
-            )
-        elif notionBlock.type == "to_do":
-            assert isinstance(
-                notionBlock.value, str
-            ), "When type is to_do, value must be a string"
-            todo_single_item_content: str = notionBlock.value
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "to_do",
-                    "to_do": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": todo_single_item_content,
-                                },
-                            }
-                        ]
-                    },
-                }
-            )
-        elif notionBlock.type == "toggle":
-            assert isinstance(
-                notionBlock.value, str
-            ), "When type is toggle, value must be a string"
-            toggle_single_item_content: str = notionBlock.value
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "toggle",
-                    "toggle": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": toggle_single_item_content,
-                                },
-                            }
-                        ]
-                    },
-                }
-            )
-        elif notionBlock.type == "image":
-            assert isinstance(
-                notionBlock.value, str
-            ), "When type is image, value must be a string"
-            image_url: str = notionBlock.value
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "image",
-                    "image": {
-                        "caption": [],
-                        "type": "external",
-                        "external": {
-                            "url": image_url,
-                        },
-                    },
-                }
-            )
-        elif notionBlock.type == "video":
-            assert isinstance(
-                notionBlock.value, str
-            ), "When type is video, value must be a string"
-            video_url: str = notionBlock.value
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "video",
-                    "video": {
-                        "caption": [],
-                        "type": "external",
-                        "external": {
-                            "url": video_url,
-                        },
-                    },
-                }
-            )
-        elif notionBlock.type == "file":
-            assert isinstance(
-                notionBlock.value, dict
-            ), "When type is file, value must be a dictionary"
-            file: dict = notionBlock.value
-            file_name: str = file["name"]
-            file_url: str = file["url"]
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "file",
-                    "file": {
-                        "caption": [],
-                        "type": "external",
-                        "external": {
-                            "url": file_url,
-                        },
-                        "name": file_name,
-                    },
-                }
-            )
-        elif notionBlock.type == "code":
-            assert isinstance(
-                notionBlock.value, dict
-            ), "When type is code, value must be a dictionary"
-            code: dict = notionBlock.value
-            code_content: str = code["content"]
-            code_language: str = code["language"]
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "code",
-                    "code": {
-                        "caption": [],
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": code_content,
-                                },
-                            }
-                        ],
-                        "language": code_language,
-                    },
-                }
-            )
-        elif notionBlock.type == "quote":
-            assert isinstance(
-                notionBlock.value, str
-            ), "When type is quote, value must be a string"
-            quote_content: str = notionBlock.value
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "quote",
-                    "quote": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": quote_content,
-                                },
-                            }
-                        ]
-                    },
-                }
-            )
-        else:
+        encoder: Callable[[str, Any], dict] | None = BLOCK_ENCODERS.get(notionBlock.type)
+        if encoder is None:
             raise Exception(f"Invalid Notion block type: {notionBlock.type}")
+        blocks.append(
+            {
+                "object": "block",
+                "type": notionBlock.type,
+                notionBlock.type: encoder(notionBlock.type, notionBlock.value),
+            }
+        )
     return blocks
 
 
@@ -481,135 +443,14 @@ def build_properties_for_request(page: NotionPage) -> dict:
     assert len(page.properties) > 0, "Properties cannot be empty"
     properties: dict = {}
     for notionProperty in page.properties:
-        if notionProperty.type == "title":
-            assert isinstance(
-                notionProperty.value, str
-            ), "When type is title, value must be a string"
-            properties[notionProperty.name] = {
-                "title": [
-                    {
-                        "text": {
-                            "content": notionProperty.value,
-                        }
-                    }
-                ]
-            }
-        elif notionProperty.type == "rich_text":
-            assert isinstance(
-                notionProperty.value, str
-            ), "When type is rich_text, value must be a string"
-            properties[notionProperty.name] = {
-                "rich_text": [
-                    {
-                        "text": {
-                            "content": notionProperty.value,
-                        }
-                    }
-                ]
-            }
-        elif notionProperty.type == "number":
-            assert isinstance(
-                notionProperty.value, float
-            ), "When type is number, value must be a float"
-            properties[notionProperty.name] = {
-                "number": notionProperty.value,
-            }
-        elif notionProperty.type == "select":
-            assert isinstance(
-                notionProperty.value, dict
-            ), "When type is select, value must be a dictionary"
-            selection_value: str = notionProperty.value["name"]
-            selection_color: str = notionProperty.value["color"]
-            properties[notionProperty.name] = {
-                "select": {"name": selection_value, "color": selection_color}
-            }
-        elif notionProperty.type == "multi_select":
-            assert isinstance(
-                notionProperty.value, list
-            ), "When type is multi_select, value must be a list of dictionaries"
-            selection_list: list[dict] = notionProperty.value
-            selections: list[dict] = [
-                {"name": selection["name"], "color": selection["color"]}
-                for selection in selection_list
-            ]
-            properties[notionProperty.name] = {"multi_select": selections}
-        elif notionProperty.type == "date":
-            assert isinstance(
-                notionProperty.value, str
-            ), "When type is date, value must be a string"
-            properties[notionProperty.name] = {
-                "date": {
-                    "start": notionProperty.value,
-                }
-            }
-        elif notionProperty.type == "people":
-            assert isinstance(
-                notionProperty.value, list
-            ), "When type is people, value must be a list of strings"
-            persons: list[str] = notionProperty.value
-            person_ids: list[str] = [
-                {"object": "user", "id": person_id} for person_id in persons
-            ]
-            properties[notionProperty.name] = {"people": person_ids}
-        elif notionProperty.type == "files":
-            assert isinstance(
-                notionProperty.value, list
-            ), "When type is files, value must be a list of strings"
-            files: list[dict] = notionProperty.value
-            files_obj: list[str] = [
-                {"name": file["name"], "external": {"url": file["url"]}}
-                for file in files
-            ]
-            properties[notionProperty.name] = {"files": files_obj}
-        elif notionProperty.type == "checkbox":
-            assert isinstance(
-                notionProperty.value, bool
-            ), "When type is checkbox, value must be a boolean"
-            properties[notionProperty.name] = {
-                "checkbox": notionProperty.value,
-            }
-        elif notionProperty.type == "url":
-            assert isinstance(
-                notionProperty.value, str
-            ), "When type is url, value must be a string"
-            properties[notionProperty.name] = {
-                "url": notionProperty.value,
-            }
-        elif notionProperty.type == "email":
-            assert isinstance(
-                notionProperty.value, str
-            ), "When type is email, value must be a string"
-            properties[notionProperty.name] = {
-                "email": notionProperty.value,
-            }
-        elif notionProperty.type == "phone_number":
-            assert isinstance(
-                notionProperty.value, str
-            ), "When type is phone_number, value must be a string"
-            properties[notionProperty.name] = {
-                "phone_number": notionProperty.value,
-            }
-        elif notionProperty.type == "formula":
-            raise Exception("Formulas are not supported for now")
-        elif notionProperty.type == "relation":
-            assert isinstance(
-                notionProperty.value, list
-            ), "When type is relation, value must be a list of strings"
-            ids: list[str] = notionProperty.value
-            relation: list[dict] = [{"id": id} for id in ids]
-            properties[notionProperty.name] = {"relation": relation}
-        elif notionProperty.type == "rollup":
-            raise Exception("Rollups are not supported for now")
-        elif notionProperty.type == "created_time":
-            raise Exception("Created time should not be set manually")
-        elif notionProperty.type == "last_edited_time":
-            raise Exception("Last edited time should not be set manually")
-        elif notionProperty.type == "last_edited_by":
-            raise Exception("Last edited by should not be set manually")
-        elif notionProperty.type == "created_by":
-            raise Exception("Created by should not be set manually")
-        else:
+        encoder: Callable[[str, Any], Any] | None = PROPERTY_ENCODERS.get(
+            notionProperty.type
+        )
+        if encoder is None:
             raise Exception(f"Invalid Notion property type: {notionProperty.type}")
+        properties[notionProperty.name] = {
+            notionProperty.type: encoder(notionProperty.type, notionProperty.value)
+        }
     return properties
 
 
@@ -0,0 +1,160 @@
+import sys, os
+from typing import Any
+
+sys.path.insert(0, os.path.abspath("."))
+from main.library.utils.models.validation_exception import ValidationException
+
+TEXT_PROPERTY_TYPES: set[str] = {
+    "title",
+    "rich_text",
+    "url",
+    "email",
+    "phone_number",
+    "select",
+    "created_by",
+    "last_edited_by",
+}
+DATE_PROPERTY_TYPES: set[str] = {"date", "created_time", "last_edited_time"}
+LIST_PROPERTY_TYPES: set[str] = {"multi_select", "people", "relation"}
+
+TEXT_OPERATORS: dict[str, str] = {
+    "equals": "pp.text_value = ?",
+    "does_not_equal": "pp.text_value <> ?",
+    "contains": "lower(pp.text_value) LIKE ? ESCAPE '\\'",
+    "does_not_contain": "lower(pp.text_value) NOT LIKE ? ESCAPE '\\'",
+    "starts_with": "lower(pp.text_value) LIKE ? ESCAPE '\\'",
+    "ends_with": "lower(pp.text_value) LIKE ? ESCAPE '\\'",
+}
+NUMBER_OPERATORS: dict[str, str] = {
+    "equals": "pp.number_value = ?",
+    "does_not_equal": "pp.number_value <> ?",
+    "greater_than": "pp.number_value > ?",
+    "less_than": "pp.number_value < ?",
+    "greater_than_or_equal_to": "pp.number_value >= ?",
+    "less_than_or_equal_to": "pp.number_value <= ?",
+}
+DATE_OPERATORS: dict[str, str] = {
+    "equals": "substr(pp.text_value, 1, 10) = substr(?, 1, 10)",
+    "before": "pp.text_value < ?",
+    "after": "pp.text_value > ?",
+    "on_or_before": "pp.text_value <= ?",
+    "on_or_after": "pp.text_value >= ?",
+}
+TIMESTAMP_OPERATORS: dict[str, str] = {
+    "equals": "substr(p.{column}, 1, 10) = substr(?, 1, 10)",
+    "before": "p.{column} < ?",
+    "after": "p.{column} > ?",
+    "on_or_before": "p.{column} <= ?",
+    "on_or_after": "p.{column} >= ?",
+}
+
+
+def build_where_clause(filter: dict | None) -> tuple[str, list]:
+    """
+    Translates a Notion database query filter into a SQL condition over the mirror tables.
+
+    Supports "and"/"or" compounds, timestamp filters and the common property conditions
+    of text, select, number, checkbox, date, multi_select, people and relation properties.
+    The condition expects the pages table aliased as `p`.
+
+    Returns:
+        tuple[str, list]: The SQL condition and its parameters.
+    """
+    if filter is None or len(filter) == 0:
+        return "1 = 1", []
+    assert isinstance(filter, dict), "Filter must be a dictionary"
+    if "and" in filter or "or" in filter:
+        operator: str = "and" if "and" in filter else "or"
+        conditions: list[str] = []
+        params: list = []
+        for sub_filter in filter[operator]:
+            condition, sub_params = build_where_clause(sub_filter)
+            conditions.append(f"({condition})")
+            params.extend(sub_params)
+        if len(conditions) == 0:
+            return "1 = 1", []
+        return f" {operator.upper()} ".join(conditions), params
+    if "timestamp" in filter:
+        return build_timestamp_condition(filter)
+    if "property" in filter:
+        return build_property_condition(filter)
+    raise ValidationException(f"Unsupported filter: {filter}")
+
+
+def build_timestamp_condition(filter: dict) -> tuple[str, list]:
+    column: str = filter["timestamp"]
+    if column not in ("created_time", "last_edited_time"):
+        raise ValidationException(f"Unsupported timestamp: {column}")
+    operator, value = get_condition(filter, column)
+    if operator not in TIMESTAMP_OPERATORS:
+        raise ValidationException(f"Unsupported {column} condition: {operator}")
+    condition: str = TIMESTAMP_OPERATORS[operator].format(column=column)
+    return condition, [str(value)] * condition.count("?")
+
+
+def build_property_condition(filter: dict) -> tuple[str, list]:
+    name: str = filter["property"]
+    prop_type: str = next(key for key in filter if key != "property")
+    operator, value = get_condition(filter, prop_type)
+    if operator in ("is_empty", "is_not_empty"):
+        # A property with no row at all is empty too.
+        exists: str = (
+            "EXISTS (SELECT 1 FROM page_properties pp WHERE pp.page_id = p.page_id"
+            " AND pp.name = ? AND pp.is_empty = 0)"
+        )
+        return (f"NOT {exists}" if operator == "is_empty" else exists), [name]
+    condition: str
+    params: list
+    if prop_type in TEXT_PROPERTY_TYPES and operator in TEXT_OPERATORS:
+        condition = TEXT_OPERATORS[operator]
+        params = [build_text_param(operator, value)]
+    elif prop_type == "number" and operator in NUMBER_OPERATORS:
+        condition = NUMBER_OPERATORS[operator]
+        params = [float(value)]
+    elif prop_type == "checkbox" and operator in ("equals", "does_not_equal"):
+        condition = f"pp.boolean_value {'=' if operator == 'equals' else '<>'} ?"
+        params = [1 if value else 0]
+    elif prop_type in DATE_PROPERTY_TYPES and operator in DATE_OPERATORS:
+        condition = DATE_OPERATORS[operator]
+        params = [str(value)] * condition.count("?")
+    elif prop_type in LIST_PROPERTY_TYPES and operator in ("contains", "does_not_contain"):
+        item: str = (
+            "json_extract(item.value, '$.name')"
+            if prop_type == "multi_select"
+            else "item.value"
+        )
+        condition = (
+            f"{'NOT ' if operator == 'does_not_contain' else ''}EXISTS"
+            f" (SELECT 1 FROM json_each(pp.json_value) item WHERE {item} = ?)"
+        )
+        params = [str(value)]
+    else:
+        raise ValidationException(
+            f"Unsupported condition for property {name}: {prop_type}.{operator}"
+        )
+    return (
+        "EXISTS (SELECT 1 FROM page_properties pp WHERE pp.page_id = p.page_id"
+        f" AND pp.name = ? AND {condition})"
+    ), [name] + params
+
+
+def get_condition(filter: dict, key: str) -> tuple[str, Any]:
+    condition: dict = filter[key]
+    if not isinstance(condition, dict) or len(condition) != 1:
+        raise ValidationException(f"Invalid condition: {condition}")
+    operator: str = next(iter(condition))
+    return operator, condition[operator]
+
+
+def build_text_param(operator: str, value: Any) -> str:
+    text: str = str(value)
+    if operator in ("equals", "does_not_equal"):
+        return text
+    escaped: str = (
+        text.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    )
+    if operator == "starts_with":
+        return f"{escaped}%"
+    if operator == "ends_with":
+        return f"%{escaped}"
+    return f"%{escaped}%"
@@ -0,0 +1,70 @@
+import sys, os, random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+sys.path.insert(0, os.path.abspath("."))
+
+RETRYABLE_STATUS_CODES: set[int] = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS: set[str] = {"GET", "DELETE"}
+ARCHIVE_BODY_KEYS: set[str] = {"archived", "in_trash"}
+
+
+def is_idempotent_request(method: str, body: dict | list | None = None) -> bool:
+    """
+    Tells whether sending a request twice does no more than sending it once: GETs, DELETEs
+    and the PATCHes that only archive or restore a page or block.
+    """
+    if method.upper() in IDEMPOTENT_METHODS:
+        return True
+    return (
+        method.upper() == "PATCH"
+        and isinstance(body, dict)
+        and len(body) > 0
+        and set(body.keys()) <= ARCHIVE_BODY_KEYS
+    )
+
+
+def is_retryable_status(status_code: int, idempotent: bool) -> bool:
+    """
+    429 means Notion did not process the request, so it is always retried; a 5xx may come
+    after the write was applied, so it is only retried for idempotent requests.
+    """
+    if status_code == 429:
+        return True
+    return idempotent and status_code in RETRYABLE_STATUS_CODES
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parses a Retry-After header, given either in seconds or as an HTTP date.
+    """
+    if not isinstance(value, str) or value.strip() == "":
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at: datetime = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def get_retry_delay(
+    attempt: int,
+    retry_after: float | None,
+    base_delay: float,
+    max_delay: float,
+) -> float:
+    """
+    Returns how long to wait before retry number `attempt` (zero based).
+
+    A Retry-After given by the server is honoured, with a little jitter added so that
+    queued callers do not all wake up at once; otherwise it is full-jitter exponential backoff.
+    """
+    if retry_after is not None:
+        return retry_after + random.uniform(0, base_delay)
+    return random.uniform(0, min(max_delay, base_delay * (2**attempt)))
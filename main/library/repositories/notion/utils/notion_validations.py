@@ -1,18 +1,23 @@
 import sys, os
 
 sys.path.insert(0, os.path.abspath("."))
+from main.library.utils.models.http_exception import HttpException
 
 
-def validate_http_response(status_code: int, reason: str, response_data: bytes):
+def validate_http_response(
+    status_code: int,
+    reason: str,
+    response_data: bytes,
+    retry_after: float | None = None,
+):
     if 400 <= status_code:
         if reason is not None and reason != "":
             if response_data is not None and response_data != b"":
-                raise Exception(
-                    f"Request failed with status code {status_code}, reason {reason}, and response data {response_data}"
-                )
+                message: str = f"Request failed with status code {status_code}, reason {reason}, and response data {response_data}"
             else:
-                raise Exception(
+                message: str = (
                     f"Request failed with status code {status_code} and reason {reason}"
                 )
         else:
-            raise Exception(f"Request failed with status code {status_code}")
+            message: str = f"Request failed with status code {status_code}"
+        raise HttpException(message, status_code, reason, response_data, retry_after)
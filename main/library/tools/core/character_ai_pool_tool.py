@@ -0,0 +1,134 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("."))
+import asyncio, hashlib, time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+from characterai import aiocai
+from main.library.tools.core.log_tool import LogTool
+from main.library.tools.core.settings_tool import SettingsTool
+
+
+class CharacterAiConnection:
+    def __init__(self, client: Any, chat: Any, me: Any):
+        self.client = client
+        self.chat = chat
+        self.me = me
+        self.reused: bool = False
+        self.released_at: float = time.monotonic()
+
+
+class CharacterAiPoolTool:
+    """
+    A pool of authenticated aiocai clients with an open chat connection each, kept per token.
+
+    A chat connection answers one message at a time, so each checkout gets a connection to
+    itself. At most CHARACTER_AI_POOL_MAX_SIZE connections per token exist at a time, and
+    connections idle for CHARACTER_AI_POOL_IDLE_TIMEOUT seconds are closed. The account
+    identity (`me`) is fetched once per token.
+    """
+
+    def __init__(self, settings_tool: SettingsTool, log_tool: LogTool):
+        self.settings_tool: SettingsTool = settings_tool
+        self.log_tool: LogTool = log_tool
+        max_size: str | None = self.settings_tool.get("CHARACTER_AI_POOL_MAX_SIZE")
+        idle_timeout: str | None = self.settings_tool.get(
+            "CHARACTER_AI_POOL_IDLE_TIMEOUT"
+        )
+        self.max_size: int = int(max_size) if max_size is not None else 4
+        self.idle_timeout: float = (
+            float(idle_timeout) if idle_timeout is not None else 300.0
+        )
+        assert self.max_size > 0, "CHARACTER_AI_POOL_MAX_SIZE must be greater than zero"
+        self._idle: dict[str, list[CharacterAiConnection]] = {}
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._me: dict[str, Any] = {}
+
+    @asynccontextmanager
+    async def connection(self, token: str) -> AsyncIterator[CharacterAiConnection]:
+        """
+        Checks out a connection for the token, reusing an open idle one when possible.
+
+        Waits while the token already has `max_size` connections checked out. A connection
+        whose user raises is closed instead of going back to the pool.
+        """
+        assert token is not None, "Token is required"
+        key: str = hashlib.sha256(token.encode()).hexdigest()
+        semaphore: asyncio.Semaphore = self._slots.setdefault(
+            key, asyncio.Semaphore(self.max_size)
+        )
+        async with semaphore:
+            await self.__evict_idle()
+            connection: CharacterAiConnection | None = await self.__pop_idle(key)
+            if connection is None:
+                connection = await self.__connect(token, key)
+            try:
+                yield connection
+            except BaseException:
+                await self.__close(connection)
+                raise
+            connection.reused = True
+            connection.released_at = time.monotonic()
+            self._idle.setdefault(key, []).append(connection)
+
+    def get_stats(self) -> dict:
+        return {
+            "tokens": len(self._slots),
+            "idle_connections": sum(len(idle) for idle in self._idle.values()),
+        }
+
+    async def aclose(self) -> None:
+        idle: list[CharacterAiConnection] = [
+            connection for connections in self._idle.values() for connection in connections
+        ]
+        self._idle.clear()
+        self._me.clear()
+        for connection in idle:
+            await self.__close(connection)
+
+    async def __connect(self, token: str, key: str) -> CharacterAiConnection:
+        client = aiocai.Client(token)
+        try:
+            me = self._me.get(key)
+            if me is None:
+                me = await client.get_me()
+                self._me[key] = me
+            chat = await client.connect()
+        except BaseException:
+            await client.close()
+            raise
+        return CharacterAiConnection(client, chat, me)
+
+    async def __pop_idle(self, key: str) -> CharacterAiConnection | None:
+        idle: list[CharacterAiConnection] = self._idle.get(key, [])
+        while len(idle) > 0:
+            connection: CharacterAiConnection = idle.pop()
+            ws = getattr(connection.chat, "ws", None)
+            if ws is None or getattr(ws, "open", True):
+                return connection
+            await self.__close(connection)
+        return None
+
+    async def __evict_idle(self) -> None:
+        expired_before: float = time.monotonic() - self.idle_timeout
+        for key, idle in list(self._idle.items()):
+            expired: list[CharacterAiConnection] = [
+                connection for connection in idle if connection.released_at < expired_before
+            ]
+            if len(expired) == 0:
+                continue
+            self._idle[key] = [
+                connection for connection in idle if connection.released_at >= expired_before
+            ]
+            for connection in expired:
+                await self.__close(connection)
+
+    async def __close(self, connection: CharacterAiConnection) -> None:
+        try:
+            await connection.chat.close()
+        except Exception as e:
+            self.log_tool.warn(f"Error closing Character AI connection: {e}")
+        try:
+            await connection.client.close()
+        except Exception as e:
+            self.log_tool.warn(f"Error closing Character AI client: {e}")
@@ -1,17 +1,36 @@
-import os, sys
+import asyncio, json, os, sys, time
+from typing import AsyncIterator, Iterable
 
 from main.library.tools.models.character_ai_response import CharacterAiResponse
 
 sys.path.insert(0, os.path.abspath("."))
+from main.library.tools.core.character_ai_pool_tool import (
+    CharacterAiConnection,
+    CharacterAiPoolTool,
+)
 from main.library.tools.core.log_tool import LogTool
+from main.library.tools.core.metrics_tool import MetricsTool
 from main.library.tools.core.settings_tool import SettingsTool
-from characterai import aiocai, sendCode, authUser
+from main.library.tools.core.tracing_tool import traced
+from characterai import sendCode, authUser
+from characterai.types import chat2
+from websockets.exceptions import ConnectionClosed
 
 
 class CharacterAiTool:
-    def __init__(self, settings_tool: SettingsTool, log_tool: LogTool):
+    def __init__(
+        self,
+        settings_tool: SettingsTool,
+        log_tool: LogTool,
+        character_ai_pool_tool: CharacterAiPoolTool | None = None,
+        metrics_tool: MetricsTool | None = None,
+    ):
         self.settings_tool = settings_tool
         self.log_tool = log_tool
+        self.character_ai_pool_tool = character_ai_pool_tool or CharacterAiPoolTool(
+            settings_tool, log_tool
+        )
+        self.metrics_tool = metrics_tool
 
     def generate_token(self):
         self.log_tool.info("Generating token ...")
@@ -23,6 +42,7 @@ class CharacterAiTool:
         self.log_tool.info(f"Token generated: {token}")
         return token
 
+    @traced()
     async def chat(
         self, token: str, char_id: str, message: str, chat_id: str | None = None
     ) -> CharacterAiResponse:
@@ -30,23 +50,216 @@ class CharacterAiTool:
         assert char_id is not None, "Character ID is required"
         assert message is not None, "Message is required"
         self.log_tool.info(f"Sending message {message} to character {char_id} ...")
-        client = aiocai.Client(token)
-        me = await client.get_me()
-        char_ai_response: CharacterAiResponse | None = None
-        async with await client.connect() as chat:
+        reconnected: bool = False
+        while True:
+            reused: bool = False
+            try:
+                async with self.character_ai_pool_tool.connection(token) as connection:
+                    reused = connection.reused
+                    return await self.__send_message(
+                        connection, char_id, message, chat_id
+                    )
+            except ConnectionClosed as e:
+                # An idle connection may have been closed by the server; retry once on a new one.
+                if not reused or reconnected:
+                    raise
+                self.log_tool.warn(f"Character AI connection was closed, reconnecting: {e}")
+                reconnected = True
+
+    async def chat_many(
+        self, token: str, messages: Iterable[dict]
+    ) -> AsyncIterator[dict]:
+        """
+        Sends many messages at once, yielding one result per message as soon as it is done.
+
+        Each message is a dict with "char_id", "message" and optionally "chat_id" and
+        "timeout" (seconds, CHARACTER_AI_BATCH_TIMEOUT by default). At most
+        CHARACTER_AI_BATCH_CONCURRENCY messages are in flight at a time. Results come in
+        completion order, as {"index": i, "char_id": ..., "response": CharacterAiResponse}
+        or {"index": i, "char_id": ..., "Message": ...}.
+        """
+        assert token is not None, "Token is required"
+        assert messages is not None, "Messages are required"
+        concurrency: int = int(
+            self.settings_tool.get("CHARACTER_AI_BATCH_CONCURRENCY") or 4
+        )
+        assert concurrency > 0, "CHARACTER_AI_BATCH_CONCURRENCY must be greater than zero"
+        default_timeout: float = float(
+            self.settings_tool.get("CHARACTER_AI_BATCH_TIMEOUT") or 60
+        )
+        pending: set[asyncio.Task] = set()
+        try:
+            for index, item in enumerate(messages):
+                if len(pending) >= concurrency:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        yield task.result()
+                pending.add(
+                    asyncio.create_task(
+                        self.__chat_result(token, item, index, default_timeout)
+                    )
+                )
+            while len(pending) > 0:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def __chat_result(
+        self, token: str, item: dict, index: int, default_timeout: float
+    ) -> dict:
+        char_id: str | None = item.get("char_id")
+        try:
+            assert char_id is not None, "Character ID is required"
+            timeout: float = float(item.get("timeout") or default_timeout)
+            response: CharacterAiResponse = await asyncio.wait_for(
+                self.chat(token, char_id, item.get("message"), item.get("chat_id")),
+                timeout,
+            )
+            return {"index": index, "char_id": char_id, "response": response}
+        except asyncio.TimeoutError:
+            self.log_tool.error(f"Message {index} to character {char_id} timed out")
+            return {"index": index, "char_id": char_id, "Message": "Timed out"}
+        except Exception as e:
+            error_msg: str = str(e.args[0]) if len(e.args) > 0 else repr(e)
+            self.log_tool.error(f"Error sending message {index}: {error_msg}")
+            return {"index": index, "char_id": char_id, "Message": error_msg}
+
+    async def stream_chat(
+        self, token: str, char_id: str, message: str, chat_id: str | None = None
+    ) -> AsyncIterator[dict | CharacterAiResponse]:
+        """
+        Sends a message and yields the reply while the character writes it.
+
+        Yields {"delta": ..., "text": ...} for each update of the primary candidate, where
+        `text` is the reply so far and `delta` what it added, then the complete reply as a
+        CharacterAiResponse.
+        """
+        assert token is not None, "Token is required"
+        assert char_id is not None, "Character ID is required"
+        assert message is not None, "Message is required"
+        self.log_tool.info(f"Streaming message {message} to character {char_id} ...")
+        reconnected: bool = False
+        while True:
+            reused: bool = False
+            started: bool = False
+            try:
+                async with self.character_ai_pool_tool.connection(token) as connection:
+                    reused = connection.reused
+                    async for event in self.__stream_message(
+                        connection, char_id, message, chat_id
+                    ):
+                        started = True
+                        yield event
+                    return
+            except ConnectionClosed as e:
+                if not reused or reconnected or started:
+                    raise
+                self.log_tool.warn(f"Character AI connection was closed, reconnecting: {e}")
+                reconnected = True
+
+    async def __stream_message(
+        self,
+        connection: CharacterAiConnection,
+        char_id: str,
+        message: str,
+        chat_id: str | None,
+    ) -> AsyncIterator[dict | CharacterAiResponse]:
+        started_at: float = time.perf_counter()
+        chat = connection.chat
+        if chat_id is None:
+            new_chat = await chat.new_chat(char_id, connection.me.id)
+            new, answer = new_chat[0], new_chat[1]
+            self.log_tool.info(f"{answer.name}: {answer.text}")
+            chat_id = new.chat_id
+        # Same command as aiocai's send_message, which only returns the final turn.
+        await chat.ws.send(json.dumps(build_message_command(char_id, chat_id, message)))
+        text: str = ""
+        while True:
+            response: dict = json.loads(await chat.ws.recv())
+            turn: dict | None = response.get("turn")
+            if turn is None:
+                self.__observe(
+                    "character_ai_request_duration_seconds", "stream", "error", started_at
+                )
+                raise Exception(response.get("comment", "Character AI returned no turn"))
+            if turn["author"]["author_id"].isdigit():
+                # The echo of our own message.
+                continue
+            candidate: dict = turn["candidates"][0]
+            raw_content: str = candidate.get("raw_content") or ""
+            if raw_content != text:
+                if text == "":
+                    self.__observe(
+                        "character_ai_first_text_seconds", "stream", "ok", started_at
+                    )
+                delta: str = (
+                    raw_content[len(text) :] if raw_content.startswith(text) else raw_content
+                )
+                text = raw_content
+                yield {"delta": delta, "text": text}
+            if "is_final" in candidate:
+                self.__observe(
+                    "character_ai_request_duration_seconds", "stream", "ok", started_at
+                )
+                char_response = chat2.BotAnswer.model_validate(turn)
+                self.log_tool.info(f"{char_response.name}: {char_response.text}")
+                yield CharacterAiResponse(char_response)
+                return
+
+    @traced()
+    async def __send_message(
+        self,
+        connection: CharacterAiConnection,
+        char_id: str,
+        message: str,
+        chat_id: str | None,
+    ) -> CharacterAiResponse:
+        started_at: float = time.perf_counter()
+        status: str = "error"
+        try:
+            chat = connection.chat
             if chat_id is None:
-                new_chat = await chat.new_chat(char_id, me.id)
+                new_chat = await chat.new_chat(char_id, connection.me.id)
                 new, answer = new_chat[0], new_chat[1]
                 self.log_tool.info(f"{answer.name}: {answer.text}")
-                char_response = await chat.send_message(char_id, new.chat_id, message)
-                self.log_tool.info(f"{char_response.name}: {char_response.text}")
-                char_ai_response = CharacterAiResponse(char_response)
-                return char_ai_response
-            else:
-                char_response = await chat.send_message(char_id, chat_id, message)
-                self.log_tool.info(f"{char_response.name}: {char_response.text}")
-                char_ai_response = CharacterAiResponse(char_response)
-                return char_ai_response
+                chat_id = new.chat_id
+            char_response = await chat.send_message(char_id, chat_id, message)
+            status = "ok"
+        finally:
+            self.__observe("character_ai_request_duration_seconds", "chat", status, started_at)
+        self.log_tool.info(f"{char_response.name}: {char_response.text}")
+        char_ai_response: CharacterAiResponse = CharacterAiResponse(char_response)
+        return char_ai_response
+
+    def __observe(self, name: str, operation: str, status: str, started_at: float) -> None:
+        if self.metrics_tool is not None:
+            self.metrics_tool.observe(
+                name,
+                {"operation": operation, "status": status},
+                time.perf_counter() - started_at,
+                "Duration of Character AI calls, or until their first streamed text",
+            )
+
+
+def build_message_command(char_id: str, chat_id: str, message: str) -> dict:
+    return {
+        "command": "create_and_generate_turn",
+        "payload": {
+            "character_id": char_id,
+            "turn": {
+                "turn_key": {"chat_id": chat_id},
+                "author": {},
+                "candidates": [{"raw_content": message, "tti_image_rel_path": None}],
+            },
+        },
+    }
 
 
 # Uncomment the following lines to generate a token and chat with a character
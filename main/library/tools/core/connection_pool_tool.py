@@ -0,0 +1,140 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("."))
+import http.client, select, socket, threading, time
+from main.library.tools.core.log_tool import LogTool
+from main.library.tools.core.settings_tool import SettingsTool
+
+
+class ConnectionPoolTool:
+    """
+    A bounded pool of keep-alive HTTP(S) connections, kept per (protocol, host, port).
+
+    The pool size, idle timeout and checkout timeout are read from the settings
+    HTTP_POOL_MAX_SIZE, HTTP_POOL_IDLE_TIMEOUT and HTTP_POOL_ACQUIRE_TIMEOUT.
+    """
+
+    def __init__(self, settings_tool: SettingsTool, log_tool: LogTool):
+        self.settings_tool: SettingsTool = settings_tool
+        self.log_tool: LogTool = log_tool
+        max_size: str | None = self.settings_tool.get("HTTP_POOL_MAX_SIZE")
+        idle_timeout: str | None = self.settings_tool.get("HTTP_POOL_IDLE_TIMEOUT")
+        acquire_timeout: str | None = self.settings_tool.get(
+            "HTTP_POOL_ACQUIRE_TIMEOUT"
+        )
+        self.max_size: int = int(max_size) if max_size is not None else 10
+        self.idle_timeout: float = (
+            float(idle_timeout) if idle_timeout is not None else 60.0
+        )
+        self.acquire_timeout: float = (
+            float(acquire_timeout) if acquire_timeout is not None else 30.0
+        )
+        assert self.max_size > 0, "HTTP_POOL_MAX_SIZE must be greater than zero"
+        self._condition: threading.Condition = threading.Condition()
+        self._idle: dict[tuple, list[tuple[http.client.HTTPConnection, float]]] = {}
+        self._in_use: dict[tuple, int] = {}
+
+    def acquire(
+        self, protocol: str, host: str, port: str
+    ) -> http.client.HTTPConnection:
+        """
+        Checks out a connection for the given host, reusing a healthy idle one when possible.
+
+        Blocks while the host already has `max_size` connections checked out, and raises
+        TimeoutError if none is released within `acquire_timeout` seconds.
+        """
+        assert protocol is not None, "Protocol cannot be None"
+        assert host is not None, "Host cannot be None"
+        assert port is not None, "Port cannot be None"
+        key: tuple = (protocol, host, str(port))
+        deadline: float = time.monotonic() + self.acquire_timeout
+        with self._condition:
+            while True:
+                idle: list = self._idle.setdefault(key, [])
+                while len(idle) > 0:
+                    conn, released_at = idle.pop()
+                    if self.__is_healthy(conn, released_at):
+                        self._in_use[key] = self._in_use.get(key, 0) + 1
+                        return conn
+                    conn.close()
+                if self._in_use.get(key, 0) < self.max_size:
+                    self._in_use[key] = self._in_use.get(key, 0) + 1
+                    break
+                remaining: float = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"No connection to {host}:{port} was released within {self.acquire_timeout} seconds"
+                    )
+                self._condition.wait(remaining)
+        try:
+            return self.__create_connection(protocol, host, port)
+        except Exception:
+            self.__release_slot(key)
+            raise
+
+    def release(
+        self,
+        protocol: str,
+        host: str,
+        port: str,
+        conn: http.client.HTTPConnection,
+        reusable: bool = True,
+    ) -> None:
+        """
+        Returns a connection to the pool, or closes it when it cannot be reused.
+        """
+        key: tuple = (protocol, host, str(port))
+        if reusable:
+            with self._condition:
+                self._idle.setdefault(key, []).append((conn, time.monotonic()))
+        else:
+            conn.close()
+        self.__release_slot(key)
+
+    def close(self) -> None:
+        """
+        Closes every idle connection held by the pool.
+        """
+        with self._condition:
+            for idle in self._idle.values():
+                for conn, _ in idle:
+                    conn.close()
+            self._idle.clear()
+
+    def get_stats(self) -> dict:
+        with self._condition:
+            return {
+                "max_size": self.max_size,
+                "in_use": sum(self._in_use.values()),
+                "idle": sum(len(idle) for idle in self._idle.values()),
+            }
+
+    def __release_slot(self, key: tuple) -> None:
+        with self._condition:
+            self._in_use[key] = self._in_use.get(key, 1) - 1
+            self._condition.notify()
+
+    def __create_connection(
+        self, protocol: str, host: str, port: str
+    ) -> http.client.HTTPConnection:
+        isHttps: bool = protocol == "https"
+        conn: http.client.HTTPConnection = (
+            http.client.HTTPSConnection(host, port)
+            if isHttps
+            else http.client.HTTPConnection(host, port)
+        )
+        assert conn is not None, "Connection cannot be None"
+        return conn
+
+    def __is_healthy(self, conn: http.client.HTTPConnection, released_at: float) -> bool:
+        if time.monotonic() - released_at > self.idle_timeout:
+            return False
+        sock = getattr(conn, "sock", None)
+        if sock is None or not isinstance(sock, socket.socket):
+            return True
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        # An idle keep-alive socket only becomes readable when the server closed it.
+        return len(readable) == 0
@@ -1,15 +1,24 @@
 import sys, os
 sys.path.insert(0, os.path.abspath("."))
-import http.client
-from main.library.tools.core.log_tool import LogTool
+import http.client, time
+from main.library.tools.core.log_tool import LogTool, current_request_id
+from main.library.tools.core.metrics_tool import MetricsTool
 from main.library.tools.core.settings_tool import SettingsTool
+from main.library.tools.core.tracing_tool import traced
 
 
 class HttpClientTool:
-    def __init__(self, settings_tool: SettingsTool, log_tool: LogTool):
+    def __init__(
+        self,
+        settings_tool: SettingsTool,
+        log_tool: LogTool,
+        metrics_tool: MetricsTool | None = None,
+    ):
         self.settings_tool = settings_tool
         self.log_tool = log_tool
+        self.metrics_tool = metrics_tool
     
+    @traced()
     def get(self, url: str) -> bytes:
         assert url is not None, "URL cannot be None"
         assert url.startswith("http://") or url.startswith("https://"), "URL must start with 'http://' or 'https://'"
@@ -25,14 +34,21 @@ class HttpClientTool:
         uri: str = url.split(hostWithPort)[1]
         conn = http.client.HTTPSConnection(host, port) if isHttps else http.client.HTTPConnection(host, port)
         assert conn is not None, "Connection cannot be None"
-        conn.request("GET", uri)
-        response = conn.getresponse()
-        assert response is not None, "Response cannot be None"
-        status_code: int = response.status
-        response_data: bytes = response.read()
+        started_at: float = time.perf_counter()
+        status: str = "error"
+        try:
+            conn.request("GET", uri, headers=self.__get_headers())
+            response = conn.getresponse()
+            assert response is not None, "Response cannot be None"
+            status_code: int = response.status
+            status = str(status_code)
+            response_data: bytes = response.read()
+        finally:
+            self.__observe("GET", host, status, started_at)
         self.__validate_response(status_code, response.reason, response_data)
         return response_data
     
+    @traced()
     def post(self, url: str, data: str) -> bytes:
         assert url is not None, "URL cannot be None"
         assert url.startswith("http://") or url.startswith("https://"), "URL must start with 'http://' or 'https://'"
@@ -48,14 +64,21 @@ class HttpClientTool:
         uri: str = url.split(hostWithPort)[1]
         conn = http.client.HTTPSConnection(host, port) if isHttps else http.client.HTTPConnection(host, port)
         assert conn is not None, "Connection cannot be None"
-        conn.request("POST", uri, data)
-        response = conn.getresponse()
-        assert response is not None, "Response cannot be None"
-        status_code: int = response.status
-        response_data: bytes = response.read()
+        started_at: float = time.perf_counter()
+        status: str = "error"
+        try:
+            conn.request("POST", uri, data, self.__get_headers())
+            response = conn.getresponse()
+            assert response is not None, "Response cannot be None"
+            status_code: int = response.status
+            status = str(status_code)
+            response_data: bytes = response.read()
+        finally:
+            self.__observe("POST", host, status, started_at)
         self.__validate_response(status_code, response.reason, response_data)
         return response_data
     
+    @traced()
     def put(self, url: str, data: str) -> bytes:
         assert url is not None, "URL cannot be None"
         assert url.startswith("http://") or url.startswith("https://"), "URL must start with 'http://' or 'https://'"
@@ -71,14 +94,21 @@ class HttpClientTool:
         uri: str = url.split(hostWithPort)[1]
         conn = http.client.HTTPSConnection(host, port) if isHttps else http.client.HTTPConnection(host, port)
         assert conn is not None, "Connection cannot be None"
-        conn.request("PUT", uri, data)
-        response = conn.getresponse()
-        assert response is not None, "Response cannot be None"
-        status_code: int = response.status
-        response_data: bytes = response.read()
+        started_at: float = time.perf_counter()
+        status: str = "error"
+        try:
+            conn.request("PUT", uri, data, self.__get_headers())
+            response = conn.getresponse()
+            assert response is not None, "Response cannot be None"
+            status_code: int = response.status
+            status = str(status_code)
+            response_data: bytes = response.read()
+        finally:
+            self.__observe("PUT", host, status, started_at)
         self.__validate_response(status_code, response.reason, response_data)
         return response_data
     
+    @traced()
     def delete(self, url: str) -> bytes:
         assert url is not None, "URL cannot be None"
         assert url.startswith("http://") or url.startswith("https://"), "URL must start with 'http://' or 'https://'"
@@ -94,14 +124,34 @@ class HttpClientTool:
         uri: str = url.split(hostWithPort)[1]
         conn = http.client.HTTPSConnection(host, port) if isHttps else http.client.HTTPConnection(host, port)
         assert conn is not None, "Connection cannot be None"
-        conn.request("DELETE", uri)
-        response = conn.getresponse()
-        assert response is not None, "Response cannot be None"
-        status_code: int = response.status
-        response_data: bytes = response.read()
+        started_at: float = time.perf_counter()
+        status: str = "error"
+        try:
+            conn.request("DELETE", uri, headers=self.__get_headers())
+            response = conn.getresponse()
+            assert response is not None, "Response cannot be None"
+            status_code: int = response.status
+            status = str(status_code)
+            response_data: bytes = response.read()
+        finally:
+            self.__observe("DELETE", host, status, started_at)
         self.__validate_response(status_code, response.reason, response_data)
         return response_data
     
+    def __get_headers(self) -> dict:
+        # Lets the called service log the same request id as this one.
+        request_id: str | None = current_request_id.get()
+        return {"X-Request-Id": request_id} if request_id is not None else {}
+
+    def __observe(self, method: str, host: str, status: str, started_at: float) -> None:
+        if self.metrics_tool is not None:
+            self.metrics_tool.observe(
+                "http_client_request_duration_seconds",
+                {"method": method, "host": host, "status": status},
+                time.perf_counter() - started_at,
+                "Duration of each outgoing HttpClientTool request",
+            )
+
     def __validate_response(self, status_code: int, reason: str, response_data: bytes):
         if status_code < 200:
             if reason is not None and reason != "":
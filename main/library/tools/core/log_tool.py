@@ -1,10 +1,158 @@
 import sys, os
 sys.path.insert(0, os.path.abspath("."))
-from datetime import datetime
+import atexit, json, queue, threading, time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any
+
+# Id of the request being served, written with every record logged while serving it.
+current_request_id: ContextVar[str | None] = ContextVar("current_request_id", default=None)
+
+
+class LogWriter:
+    """
+    Writes log records as JSON lines from a background thread.
+
+    Records wait in a queue of at most LOG_QUEUE_SIZE entries; when it is full, new records
+    are dropped and counted instead of blocking the caller. Records that cannot be written
+    are counted as failed and reported on the process' original stderr.
+
+    A writer built with `start_thread=False` never starts the thread: its records stay queued
+    until `flush` writes them on the calling thread.
+    """
+
+    def __init__(self, start_thread: bool = True):
+        self.queue_size = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+        self.start_thread = start_thread
+        self.dropped = 0
+        self.failed = 0
+        self._reported_dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def put(
+        self,
+        level: str,
+        message: str,
+        to_stderr: bool,
+        request_id: str | None = None,
+    ) -> None:
+        """
+        Queues an already formatted record without blocking, starting the writer thread on first use.
+        """
+        if self._thread is None and self.start_thread:
+            self.__start()
+        try:
+            self._queue.put_nowait((time.time(), level, message, to_stderr, request_id))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def flush(self) -> None:
+        """
+        Blocks until every queued record has been written.
+        """
+        if self._thread is not None:
+            self._queue.join()
+            return
+        while True:
+            try:
+                record: tuple = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self.__write_record(record)
+
+    def __start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self.__run, name="log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def __run(self) -> None:
+        while True:
+            self.__write_record(self._queue.get())
+
+    def __write_record(self, record: tuple) -> None:
+        try:
+            self.__write(*record)
+        except Exception as error:
+            # A broken stream must not stop the writer, but the loss must not go unnoticed.
+            with self._lock:
+                self.failed += 1
+            try:
+                sys.__stderr__.write(
+                    f"log writer failed to write a {record[1]} record: {error!r}\n"
+                )
+            except Exception:
+                pass
+        finally:
+            self._queue.task_done()
+
+    def __write(
+        self,
+        created: float,
+        level: str,
+        message: str,
+        to_stderr: bool,
+        request_id: str | None,
+    ) -> None:
+        stream = sys.stderr if to_stderr else sys.stdout
+        dropped: int = self.dropped - self._reported_dropped
+        if dropped > 0:
+            self._reported_dropped += dropped
+            stream.write(
+                self.__format(created, "WARN", f"{dropped} log messages were dropped") + "\n"
+            )
+        stream.write(self.__format(created, level, message, request_id) + "\n")
+        stream.flush()
+
+    def __format(
+        self, created: float, level: str, message: str, request_id: str | None = None
+    ) -> str:
+        record: dict = {
+            "timestamp": datetime.fromtimestamp(created, timezone.utc).isoformat(),
+            "level": level,
+            "message": message,
+        }
+        if request_id is not None:
+            record["request_id"] = request_id
+        return json.dumps(record, ensure_ascii=False)
+
+
+def render_message(msg: str, args: tuple) -> str:
+    if len(args) == 0:
+        return str(msg)
+    try:
+        return str(msg) % args
+    except (TypeError, ValueError):
+        return " ".join([str(msg)] + [str(arg) for arg in args])
+
+
+_writer: LogWriter = LogWriter()
+
+
+def _reset_writer_after_fork() -> None:
+    # The writer thread does not survive a fork, so the child starts its own.
+    global _writer
+    _writer = LogWriter()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_writer_after_fork)
+atexit.register(lambda: _writer.flush())
+
 
 class LogTool:
     """
     A utility class for logging messages with different log levels.
+
+    Messages are written as JSON lines by a background thread, so logging does not block
+    the caller. Extra arguments are %-formatted into the message only when the level is
+    enabled, e.g. log_tool.info("Payload: %s", page). Records logged while serving a
+    request carry its id, taken from current_request_id.
     """
 
     def __init__(self):
@@ -15,47 +163,65 @@ class LogTool:
         """
         self.log_level = os.getenv("LOG_LEVEL", "debug")
 
-    def info(self, msg: str) -> None:
+    def info(self, msg: str, *args: Any) -> None:
         """
         Logs an informational message.
 
         Args:
             msg (str): The message to be logged.
+            *args (Any): Values %-formatted into the message, only if it is logged.
         """
         if self.log_level == "debug":
-            self._log("[INFO]", msg)
+            self._log("INFO", msg, args)
 
-    def warn(self, msg: str) -> None:
+    def warn(self, msg: str, *args: Any) -> None:
         """
         Logs a warning message.
 
         Args:
             msg (str): The message to be logged.
+            *args (Any): Values %-formatted into the message, only if it is logged.
         """
         if self.log_level in ["debug", "warning"]:
-            self._log("[WARN]", msg)
+            self._log("WARN", msg, args)
 
-    def error(self, msg: str) -> None:
+    def error(self, msg: str, *args: Any) -> None:
         """
         Logs an error message.
 
         Args:
             msg (str): The message to be logged.
+            *args (Any): Values %-formatted into the message, only if it is logged.
         """
         if self.log_level in ["debug", "warning", "error"]:
-            self._log("[ERROR]", msg, to_stderr=True)
+            self._log("ERROR", msg, args, to_stderr=True)
+
+    def flush(self) -> None:
+        """
+        Blocks until every message logged so far has been written.
+        """
+        _writer.flush()
+
+    def get_stats(self) -> dict:
+        """
+        Returns the size of the log queue, how many messages were dropped because it was full
+        and how many could not be written.
+        """
+        return {
+            "queue_size": _writer.queue_size,
+            "dropped": _writer.dropped,
+            "failed": _writer.failed,
+        }
 
-    def _log(self, tag: str, msg: str, to_stderr: bool = False) -> None:
+    def _log(self, level: str, msg: str, args: tuple = (), to_stderr: bool = False) -> None:
         """
-        Logs a message with the specified tag.
+        Formats a message with the specified level and queues it for the background writer.
 
         Args:
-            tag (str): The tag to be included in the log message.
+            level (str): The level to be included in the log record.
             msg (str): The message to be logged.
+            args (tuple, optional): Values %-formatted into the message, on the calling thread
+                so later changes to them do not show in the record.
             to_stderr (bool, optional): Whether to log the message to stderr. Defaults to False.
         """
-        log_msg = f"{datetime.now()} {tag} {msg}"
-        if to_stderr:
-            print(log_msg, file=sys.stderr)
-        else:
-            print(log_msg)
\ No newline at end of file
+        _writer.put(level, render_message(msg, args), to_stderr, current_request_id.get())
@@ -0,0 +1,143 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("."))
+import asyncio, threading, time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+from main.library.tools.core.log_tool import LogTool
+from main.library.tools.core.settings_tool import SettingsTool
+
+
+class LruCacheTool:
+    """
+    An in-memory LRU cache with a time to live and a memory cap.
+
+    Limits are read from the settings <prefix>_MAX_ENTRIES, <prefix>_MAX_BYTES and
+    <prefix>_TTL (seconds). The size of each entry is given by the caller, so the cap is
+    only as accurate as the caller's estimate.
+
+    get_or_load de-duplicates concurrent misses: callers missing the same key share one
+    load. Deleting a key while it loads keeps the stale result out of the cache.
+    """
+
+    def __init__(self, settings_tool: SettingsTool, log_tool: LogTool, prefix: str):
+        self.settings_tool: SettingsTool = settings_tool
+        self.log_tool: LogTool = log_tool
+        self.prefix: str = prefix
+        max_entries: str | None = self.settings_tool.get(f"{prefix}_MAX_ENTRIES")
+        max_bytes: str | None = self.settings_tool.get(f"{prefix}_MAX_BYTES")
+        ttl: str | None = self.settings_tool.get(f"{prefix}_TTL")
+        self.max_entries: int = int(max_entries) if max_entries is not None else 1000
+        self.max_bytes: int = int(max_bytes) if max_bytes is not None else 64 * 1024 * 1024
+        self.ttl: float = float(ttl) if ttl is not None else 3600.0
+        assert self.max_entries > 0, f"{prefix}_MAX_ENTRIES must be greater than zero"
+        assert self.max_bytes > 0, f"{prefix}_MAX_BYTES must be greater than zero"
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.coalesced: int = 0
+        self.total_bytes: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[Any, int, float]] = OrderedDict()
+        self._loading: dict[Hashable, asyncio.Task] = {}
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry: tuple[Any, int, float] | None = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, size, expires_at = entry
+            if time.monotonic() >= expires_at:
+                self.__remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, size: int = 1) -> None:
+        with self._lock:
+            if key in self._entries:
+                self.__remove(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size, time.monotonic() + self.ttl)
+            self.total_bytes += size
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                oldest: Hashable = next(iter(self._entries))
+                self.__remove(oldest)
+                self.evictions += 1
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        size_of: Callable[[Any], int] | None = None,
+    ) -> Any:
+        value: Any | None = self.get(key)
+        if value is not None:
+            return value
+        loading: asyncio.Task | None = self._loading.get(key)
+        if loading is None:
+            loading = asyncio.create_task(self.__load(key, loader, size_of))
+            # Retrieves the error if every caller was cancelled before the load finished.
+            loading.add_done_callback(lambda task: task.cancelled() or task.exception())
+            self._loading[key] = loading
+        else:
+            with self._lock:
+                self.coalesced += 1
+        # A cancelled caller must not cancel the load shared with the others.
+        return await asyncio.shield(loading)
+
+    async def __load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        size_of: Callable[[Any], int] | None,
+    ) -> Any:
+        task: asyncio.Task | None = asyncio.current_task()
+        try:
+            value: Any = await loader()
+            if self._loading.get(key) is task:
+                self.set(key, value, size_of(value) if size_of is not None else 1)
+            return value
+        finally:
+            if self._loading.get(key) is task:
+                del self._loading[key]
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._loading.pop(key, None)
+            if key in self._entries:
+                self.__remove(key)
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        with self._lock:
+            for key in [key for key in self._loading if predicate(key)]:
+                del self._loading[key]
+            keys: list[Hashable] = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self.__remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._loading.clear()
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "coalesced": self.coalesced,
+            }
+
+    def __remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.total_bytes -= size
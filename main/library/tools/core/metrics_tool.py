@@ -0,0 +1,153 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("."))
+import bisect, re, threading
+from typing import Callable, Iterable
+from main.library.tools.core.log_tool import LogTool
+from main.library.tools.core.settings_tool import SettingsTool
+
+# Fine below one second, where most Notion calls land, and wide enough for slow generations.
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.25, 0.5, 0.75,
+    1.0, 1.5, 2.5, 5.0, 7.5, 10.0, 15.0, 30.0, 60.0,
+)
+ID_PATTERN: re.Pattern = re.compile(
+    r"(?<=/)([0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12})(?=/|$|\?)"
+)
+
+
+class MetricsTool:
+    """
+    Collects histograms and counters in memory and renders them in the Prometheus text format.
+
+    Histogram buckets default to DEFAULT_BUCKETS and can be replaced with a comma separated
+    METRICS_BUCKETS setting. Stats that services already keep (get_stats) are registered as
+    sources and only read when the metrics are rendered.
+    """
+
+    def __init__(self, settings_tool: SettingsTool, log_tool: LogTool):
+        self.settings_tool: SettingsTool = settings_tool
+        self.log_tool: LogTool = log_tool
+        buckets: str | None = self.settings_tool.get("METRICS_BUCKETS")
+        self.buckets: tuple[float, ...] = (
+            tuple(sorted(float(bucket) for bucket in buckets.split(",")))
+            if buckets
+            else DEFAULT_BUCKETS
+        )
+        self._lock: threading.Lock = threading.Lock()
+        self._help: dict[str, tuple[str, str]] = {}
+        # name -> labels -> [bucket counts..., sum, count]
+        self._histograms: dict[str, dict[tuple, list[float]]] = {}
+        self._counters: dict[str, dict[tuple, float]] = {}
+        self._sources: list[tuple[str, Callable[[], dict], frozenset[str]]] = []
+
+    def observe(self, name: str, labels: dict[str, str], value: float, help: str = "") -> None:
+        """
+        Records one observation, in seconds for latencies, in the histogram `name`.
+        """
+        key: tuple = tuple(sorted(labels.items()))
+        index: int = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            if name not in self._histograms:
+                self._histograms[name] = {}
+                self._help[name] = ("histogram", help)
+            series: list[float] | None = self._histograms[name].get(key)
+            if series is None:
+                series = [0.0] * (len(self.buckets) + 2)
+                self._histograms[name][key] = series
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def increment(
+        self, name: str, labels: dict[str, str], amount: float = 1, help: str = ""
+    ) -> None:
+        key: tuple = tuple(sorted(labels.items()))
+        with self._lock:
+            if name not in self._counters:
+                self._counters[name] = {}
+                self._help[name] = ("counter", help)
+            self._counters[name][key] = self._counters[name].get(key, 0) + amount
+
+    def register_stats(
+        self, prefix: str, source: Callable[[], dict], counters: Iterable[str] = ()
+    ) -> None:
+        """
+        Exposes each numeric value of `source()` as `<prefix>_<key>` when rendering.
+
+        Keys listed in `counters` are exposed as counters, the rest as gauges.
+        """
+        self._sources.append((prefix, source, frozenset(counters)))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            histograms: dict = {
+                name: {key: list(series) for key, series in values.items()}
+                for name, values in self._histograms.items()
+            }
+            counters: dict = {
+                name: dict(values) for name, values in self._counters.items()
+            }
+            helps: dict = dict(self._help)
+        for name, values in histograms.items():
+            self.__render_header(lines, name, *helps[name])
+            for key, series in values.items():
+                cumulative: float = 0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    lines.append(
+                        f"{name}_bucket{format_labels(key + (('le', format_value(bound)),))} {format_value(cumulative)}"
+                    )
+                lines.append(
+                    f"{name}_bucket{format_labels(key + (('le', '+Inf'),))} {format_value(series[-1])}"
+                )
+                lines.append(f"{name}_sum{format_labels(key)} {format_value(series[-2])}")
+                lines.append(f"{name}_count{format_labels(key)} {format_value(series[-1])}")
+        for name, values in counters.items():
+            self.__render_header(lines, name, *helps[name])
+            for key, value in values.items():
+                lines.append(f"{name}{format_labels(key)} {format_value(value)}")
+        for prefix, source, counter_keys in self._sources:
+            try:
+                stats: dict = source()
+            except Exception as e:
+                self.log_tool.error(f"Error reading metrics source {prefix}: {e}")
+                continue
+            for key, value in stats.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                is_counter: bool = key in counter_keys
+                name: str = f"{prefix}_{key}_total" if is_counter else f"{prefix}_{key}"
+                lines.append(f"# TYPE {name} {'counter' if is_counter else 'gauge'}")
+                lines.append(f"{name} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def __render_header(self, lines: list[str], name: str, kind: str, help: str) -> None:
+        if help:
+            lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+
+
+def get_endpoint_template(uri: str) -> str:
+    """
+    Replaces the ids in a Notion URI with {id}, e.g. /v1/pages/{id}, to keep label values few.
+    """
+    return ID_PATTERN.sub("{id}", uri.split("?", 1)[0])
+
+
+def format_labels(key: tuple) -> str:
+    if len(key) == 0:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in key) + "}"
+
+
+def escape_label_value(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
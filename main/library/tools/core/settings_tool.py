@@ -1,11 +1,31 @@
 import sys, os
 sys.path.insert(0, os.path.abspath("."))
+import threading, time
+from types import MappingProxyType
 from main.library.utils.core.path_helper import get_root_dir
 
 
 class SettingsTool:
+    """
+    Reads and writes the settings file of the current environment (.env.<env>.env).
+
+    The file is parsed once into an immutable snapshot. Reads are served from the snapshot,
+    which is only reloaded when the file's mtime changes (checked at most once every
+    `check_interval` seconds), when `set`/`delete` write the file, or when `reload` is called.
+    """
+
+    def __init__(self, check_interval: float = 1.0):
+        self.check_interval: float = check_interval
+        self.reload_count: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self._snapshot: MappingProxyType | None = None
+        self._snapshot_signature: tuple | None = None
+        self._snapshot_env: str | None = None
+        self._checked_at: float = 0.0
+        self._root_dir: str | None = None
+
     def get(self, key: str) -> str | None:
-        settings_dict: dict = self.__get_settings_dict()
+        settings_dict: MappingProxyType = self.__get_settings_dict()
         if key == "env":
             key = "MICRO_TOOLS_SYS_ENV"
         setting_from_env: str = os.getenv(key)
@@ -17,33 +37,26 @@ class SettingsTool:
             return None
 
     def set(self, key: str, value: str) -> None:
-        settings_dict: dict = self.__get_settings_dict()
-        settings_dict[key] = value
-        root_dir: str = get_root_dir()
-        env_var_value: str = os.getenv("MICRO_TOOLS_SYS_ENV")
-        assert env_var_value is not None, "Environment variable 'MICRO_TOOLS_SYS_ENV' is not set."
-        settings_file_path: str = root_dir + "/.env." + env_var_value + ".env"
-        with open(settings_file_path, "w") as file:
-            for key, value in settings_dict.items():
-                file.write(key + "=\"" + value + "\"\n")
-    
+        with self._lock:
+            settings_dict: dict = dict(self.__get_settings_dict())
+            settings_dict[key] = value
+            self.__write_settings_dict(settings_dict)
+
     def delete(self, key: str) -> None:
-        settings_dict: dict = self.__get_settings_dict()
-        if key in settings_dict:
-            settings_dict.pop(key)
-            root_dir: str = get_root_dir()
-            env_var_value: str = os.getenv("MICRO_TOOLS_SYS_ENV")
-            assert env_var_value is not None, "Environment variable 'MICRO_TOOLS_SYS_ENV' is not set."
-            settings_file_path: str = root_dir + "/.env." + env_var_value + ".env"
-            with open(settings_file_path, "w") as file:
-                for key, value in settings_dict.items():
-                    file.write(key + "=\"" + value + "\"\n")
-
-    def __get_settings_dict(self) -> dict:
-        root_dir: str = get_root_dir()
-        env_var_value: str = os.getenv("MICRO_TOOLS_SYS_ENV")
-        assert env_var_value is not None, "Environment variable 'MICRO_TOOLS_SYS_ENV' is not set."
-        settings_file_path: str = root_dir + "/.env." + env_var_value + ".env"
+        with self._lock:
+            settings_dict: dict = dict(self.__get_settings_dict())
+            if key in settings_dict:
+                settings_dict.pop(key)
+                self.__write_settings_dict(settings_dict)
+
+    def reload(self) -> MappingProxyType:
+        """
+        Re-reads the settings file unconditionally and replaces the current snapshot.
+
+        Returns:
+            MappingProxyType: The new, read-only settings snapshot.
+        """
+        settings_file_path: str = self.__get_settings_file_path()
         assert os.path.exists(settings_file_path), "Settings file not found: " + settings_file_path
         settings_dict: dict = {}
         with open(settings_file_path, "r") as file:
@@ -55,4 +68,43 @@ class SettingsTool:
         assert len(settings_dict) > 0, "Settings file is empty: " + settings_file_path
         settings_dict_keys: list = list(settings_dict.keys())
         assert "sys_name" in settings_dict_keys, "Setting 'sys_name' not found in settings file: " + settings_file_path
-        return settings_dict
\ No newline at end of file
+        self._snapshot = MappingProxyType(settings_dict)
+        self._snapshot_signature = self.__get_file_signature(settings_file_path)
+        self._snapshot_env = os.getenv("MICRO_TOOLS_SYS_ENV")
+        self._checked_at = time.monotonic()
+        self.reload_count += 1
+        return self._snapshot
+
+    def __get_settings_dict(self) -> MappingProxyType:
+        snapshot: MappingProxyType | None = self._snapshot
+        if snapshot is None or self._snapshot_env != os.getenv("MICRO_TOOLS_SYS_ENV"):
+            return self.reload()
+        now: float = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return snapshot
+        self._checked_at = now
+        signature: tuple | None = self.__get_file_signature(self.__get_settings_file_path())
+        if signature != self._snapshot_signature:
+            return self.reload()
+        return snapshot
+
+    def __write_settings_dict(self, settings_dict: dict) -> None:
+        settings_file_path: str = self.__get_settings_file_path()
+        with open(settings_file_path, "w") as file:
+            for key, value in settings_dict.items():
+                file.write(key + "=\"" + value + "\"\n")
+        self.reload()
+
+    def __get_settings_file_path(self) -> str:
+        env_var_value: str = os.getenv("MICRO_TOOLS_SYS_ENV")
+        assert env_var_value is not None, "Environment variable 'MICRO_TOOLS_SYS_ENV' is not set."
+        if self._root_dir is None:
+            self._root_dir = get_root_dir()
+        return self._root_dir + "/.env." + env_var_value + ".env"
+
+    def __get_file_signature(self, settings_file_path: str) -> tuple | None:
+        try:
+            stat: os.stat_result = os.stat(settings_file_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,253 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("."))
+import functools, inspect, json, secrets, threading, time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator, Protocol
+from main.library.tools.core.log_tool import LogTool, current_request_id
+from main.library.tools.core.settings_tool import SettingsTool
+
+
+class Span:
+    """
+    A timed unit of work inside a request. The trace id of every span is the request id.
+    """
+
+    def __init__(
+        self,
+        tracing_tool: "TracingTool",
+        name: str,
+        trace_id: str,
+        parent_id: str | None,
+        attributes: dict[str, Any],
+    ):
+        self.tracing_tool: TracingTool = tracing_tool
+        self.name: str = name
+        self.trace_id: str = trace_id
+        self.span_id: str = secrets.token_hex(8)
+        self.parent_id: str | None = parent_id
+        self.attributes: dict[str, Any] = attributes
+        self.status: str = "ok"
+        self.error: str | None = None
+        self.start_time: float = time.time()
+        self.duration: float = 0.0
+        self._started_at: float = time.perf_counter()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self) -> None:
+        self.duration = time.perf_counter() - self._started_at
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": datetime.fromtimestamp(self.start_time, timezone.utc).isoformat(),
+            "duration_ms": round(self.duration * 1000, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class InMemorySpanExporter:
+    """
+    Keeps the last `max_spans` finished spans in memory, e.g. for tests and GET /traces.
+    """
+
+    def __init__(self, max_spans: int = 10000):
+        self.spans: deque[dict] = deque(maxlen=max_spans)
+        self._lock: threading.Lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span.to_dict())
+
+    def get_spans(self, trace_id: str | None = None) -> list[dict]:
+        with self._lock:
+            return [
+                span for span in self.spans if trace_id is None or span["trace_id"] == trace_id
+            ]
+
+    def close(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class FileSpanExporter:
+    """
+    Appends finished spans to a file as JSON lines. Meant for local use: each span is one
+    write on the calling thread.
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+        self._lock: threading.Lock = threading.Lock()
+        self._file = None
+
+    def export(self, span: Span) -> None:
+        line: str = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            if self._file is None:
+                directory: str = os.path.dirname(self.path)
+                if directory != "":
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+            self._file.write(line + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class TracingTool:
+    """
+    Records spans of each request and hands them to an exporter.
+
+    The exporter is chosen by the TRACING_EXPORTER setting: "memory" keeps the last
+    TRACING_MAX_SPANS spans, "file" appends them to TRACING_FILE, and "none" (the default)
+    records nothing. Any object with export(span) and close() can be given instead.
+
+    Spans are only recorded inside a trace started by start_trace, so code instrumented with
+    start_span or traced costs a context variable lookup when it runs outside a request.
+    """
+
+    def __init__(
+        self,
+        settings_tool: SettingsTool,
+        log_tool: LogTool,
+        exporter: SpanExporter | None = None,
+    ):
+        self.settings_tool: SettingsTool = settings_tool
+        self.log_tool: LogTool = log_tool
+        self.exporter: SpanExporter | None = (
+            exporter if exporter is not None else self.__build_exporter()
+        )
+
+    @contextmanager
+    def start_trace(
+        self, request_id: str, name: str, **attributes: Any
+    ) -> Iterator[Span | None]:
+        """
+        Serves a request: its id is logged with every record and, when an exporter is set,
+        becomes the trace id of a root span covering the block.
+        """
+        assert request_id is not None, "Request id cannot be None"
+        request_id_token = current_request_id.set(request_id)
+        try:
+            if self.exporter is None:
+                yield None
+                return
+            with self._record(Span(self, name, request_id, None, attributes)) as span:
+                yield span
+        finally:
+            current_request_id.reset(request_id_token)
+
+    def get_spans(self, trace_id: str) -> list[dict] | None:
+        """
+        Returns the spans of a trace ordered by start, or None when the exporter keeps none.
+        """
+        get_spans: Callable[[str], list[dict]] | None = getattr(
+            self.exporter, "get_spans", None
+        )
+        if get_spans is None:
+            return None
+        return sorted(get_spans(trace_id), key=lambda span: span["start_time"])
+
+    def close(self) -> None:
+        if self.exporter is not None:
+            self.exporter.close()
+
+    @contextmanager
+    def _record(self, span: Span) -> Iterator[Span]:
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end()
+            _current_span.reset(token)
+            try:
+                self.exporter.export(span)
+            except Exception as e:
+                self.log_tool.warn(f"Error exporting span {span.name}: {e}")
+
+    def __build_exporter(self) -> SpanExporter | None:
+        exporter: str = (self.settings_tool.get("TRACING_EXPORTER") or "none").lower()
+        if exporter == "none":
+            return None
+        if exporter == "memory":
+            max_spans: str | None = self.settings_tool.get("TRACING_MAX_SPANS")
+            return InMemorySpanExporter(int(max_spans) if max_spans is not None else 10000)
+        if exporter == "file":
+            return FileSpanExporter(
+                self.settings_tool.get("TRACING_FILE") or "tmp/traces.jsonl"
+            )
+        raise Exception(f"Invalid TRACING_EXPORTER: {exporter}")
+
+
+@contextmanager
+def start_span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """
+    Records a child of the current span, or nothing (yielding None) outside a trace.
+    """
+    parent: Span | None = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    with parent.tracing_tool._record(
+        Span(parent.tracing_tool, name, parent.trace_id, parent.span_id, attributes)
+    ) as span:
+        yield span
+
+
+def traced(name: str | None = None) -> Callable[[Callable], Callable]:
+    """
+    Wraps a function or coroutine function in a span named `name`, by default its qualified
+    name, e.g. AsyncNotionPageManager.read_page_by_id. Arguments are not recorded.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        assert not inspect.isasyncgenfunction(func), "Async generators cannot be traced"
+        span_name: str = name or func.__qualname__
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _current_span.get() is None:
+                    return await func(*args, **kwargs)
+                with start_span(span_name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with start_span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,15 @@
+class HttpException(Exception):
+    def __init__(
+        self,
+        message: str,
+        status_code: int,
+        reason: str | None = None,
+        response_data: bytes | None = None,
+        retry_after: float | None = None,
+    ):
+        self.message = message
+        self.status_code = status_code
+        self.reason = reason
+        self.response_data = response_data
+        self.retry_after = retry_after
+        super().__init__(message)
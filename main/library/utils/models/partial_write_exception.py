@@ -0,0 +1,13 @@
+class PartialWriteException(Exception):
+    def __init__(
+        self,
+        message: str,
+        page_id: str,
+        next_block_index: int,
+        cause: Exception | None = None,
+    ):
+        self.message = message
+        self.page_id = page_id
+        self.next_block_index = next_block_index
+        self.cause = cause
+        super().__init__(message)
@@ -0,0 +1,498 @@
+"""
+A local stand-in for the Notion API, for load benchmarks and end-to-end tests without network access.
+
+Implements the endpoints this service calls: pages, databases, block children and search,
+with cursor pagination. Every request can be delayed (latency plus random jitter), limited
+per token with a token bucket, and randomly answered with 429. Throttled requests get a
+Retry-After header, like Notion's. Database query filters and sorts are accepted but not
+evaluated.
+
+The store is seeded with one database of generated pages. GET /_fake/seed returns their
+ids and GET /_fake/stats returns request counts.
+
+Run with: python -m tests.benchmarks.fake_notion_server --port 8081 --latency 0.05
+"""
+
+import sys, os, argparse, asyncio, math, random, time, uuid
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath("."))
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+MAX_PAGE_SIZE: int = 100
+USER_ID: str = "6595192e-1c62-4f33-801c-84424f2ffa9c"
+
+
+class FakeNotionSettings:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: float = 0.0,
+        burst: float = 3.0,
+        error_rate: float = 0.0,
+        retry_after: float = 0.5,
+        pages: int = 200,
+        blocks: int = 50,
+        seed: int = 42,
+    ):
+        # rate_limit is in requests per second per token; zero disables it.
+        self.latency: float = latency
+        self.jitter: float = jitter
+        self.rate_limit: float = rate_limit
+        self.burst: float = burst
+        self.error_rate: float = error_rate
+        self.retry_after: float = retry_after
+        self.pages: int = pages
+        self.blocks: int = blocks
+        self.seed: int = seed
+
+
+class FakeNotionStore:
+    """
+    Pages, databases and block children kept in memory, in Notion's response format.
+    """
+
+    def __init__(self, seed: int = 42):
+        self.random: random.Random = random.Random(seed)
+        self.pages: dict[str, dict] = {}
+        self.databases: dict[str, dict] = {}
+        self.children: dict[str, list[dict]] = {}
+
+    def new_id(self) -> str:
+        return str(uuid.UUID(int=self.random.getrandbits(128), version=4))
+
+    def seed(self, page_count: int, block_count: int) -> str:
+        database_id: str = self.create_database(
+            {
+                "parent": {"type": "page_id", "page_id": self.new_id()},
+                "title": [{"type": "text", "text": {"content": "Benchmark"}}],
+                "properties": {
+                    "Name": {"title": {}},
+                    "Description": {"rich_text": {}},
+                    "Number": {"number": {"format": "number"}},
+                },
+            }
+        )["id"]
+        for index in range(page_count):
+            self.create_page(
+                {
+                    "parent": {"database_id": database_id},
+                    "icon": {"type": "emoji", "emoji": "🚀"},
+                    "properties": {
+                        "Name": {"title": [{"text": {"content": f"Page {index}"}}]},
+                        "Description": {
+                            "rich_text": [{"text": {"content": f"Generated page number {index}"}}]
+                        },
+                        "Number": {"number": index},
+                    },
+                    "children": [
+                        {
+                            "object": "block",
+                            "type": "paragraph",
+                            "paragraph": {
+                                "rich_text": [{"text": {"content": f"Paragraph {block}"}}]
+                            },
+                        }
+                        for block in range(block_count)
+                    ],
+                }
+            )
+        return database_id
+
+    def create_page(self, body: dict) -> dict:
+        parent: dict = body.get("parent") or {}
+        database_id: str | None = parent.get("database_id")
+        if database_id is not None and database_id not in self.databases:
+            raise NotFound(f"Could not find database with ID: {database_id}.")
+        page_id: str = self.new_id()
+        now: str = get_now()
+        page: dict = {
+            "object": "page",
+            "id": page_id,
+            "created_time": now,
+            "last_edited_time": now,
+            "created_by": {"object": "user", "id": USER_ID},
+            "last_edited_by": {"object": "user", "id": USER_ID},
+            "cover": None,
+            "icon": body.get("icon"),
+            "parent": {"type": "database_id", "database_id": database_id}
+            if database_id is not None
+            else parent,
+            "archived": False,
+            "in_trash": False,
+            "properties": {
+                name: build_property(name, value)
+                for name, value in (body.get("properties") or {}).items()
+            },
+            "url": f"https://www.notion.so/{page_id.replace('-', '')}",
+        }
+        self.pages[page_id] = page
+        self.children[page_id] = []
+        self.append_children(page_id, body.get("children") or [])
+        return page
+
+    def update_page(self, page_id: str, body: dict) -> dict:
+        page: dict = self.get_page(page_id)
+        for name, value in (body.get("properties") or {}).items():
+            page["properties"][name] = build_property(name, value)
+        if "archived" in body:
+            page["archived"] = bool(body["archived"])
+        if "icon" in body:
+            page["icon"] = body["icon"]
+        page["last_edited_time"] = get_now()
+        return page
+
+    def get_page(self, page_id: str) -> dict:
+        page: dict | None = self.pages.get(page_id)
+        if page is None:
+            raise NotFound(f"Could not find page with ID: {page_id}.")
+        return page
+
+    def append_children(self, block_id: str, children: list[dict]) -> list[dict]:
+        if block_id not in self.children:
+            raise NotFound(f"Could not find block with ID: {block_id}.")
+        blocks: list[dict] = [
+            build_block(self.new_id(), block_id, child) for child in children
+        ]
+        self.children[block_id].extend(blocks)
+        for block in blocks:
+            self.children[block["id"]] = []
+        if block_id in self.pages:
+            self.pages[block_id]["last_edited_time"] = get_now()
+        return blocks
+
+    def create_database(self, body: dict) -> dict:
+        database_id: str = self.new_id()
+        now: str = get_now()
+        database: dict = {
+            "object": "database",
+            "id": database_id,
+            "created_time": now,
+            "last_edited_time": now,
+            "icon": body.get("icon"),
+            "cover": None,
+            "title": build_rich_text(body.get("title") or []),
+            "description": build_rich_text(body.get("description") or []),
+            "is_inline": bool(body.get("is_inline", False)),
+            "parent": body.get("parent") or {"type": "page_id", "page_id": self.new_id()},
+            "properties": {
+                name: {"id": name, "name": name, "type": prop_type, prop_type: options}
+                for name, value in (body.get("properties") or {}).items()
+                for prop_type, options in value.items()
+            },
+            "archived": False,
+            "url": f"https://www.notion.so/{database_id.replace('-', '')}",
+        }
+        self.databases[database_id] = database
+        return database
+
+    def update_database(self, database_id: str, body: dict) -> dict:
+        database: dict = self.get_database(database_id)
+        if "title" in body:
+            database["title"] = build_rich_text(body["title"])
+        if "description" in body:
+            database["description"] = build_rich_text(body["description"])
+        if "archived" in body:
+            database["archived"] = bool(body["archived"])
+        database["last_edited_time"] = get_now()
+        return database
+
+    def get_database(self, database_id: str) -> dict:
+        database: dict | None = self.databases.get(database_id)
+        if database is None:
+            raise NotFound(f"Could not find database with ID: {database_id}.")
+        return database
+
+    def query_database(self, database_id: str) -> list[dict]:
+        self.get_database(database_id)
+        return [
+            page
+            for page in self.pages.values()
+            if page["parent"].get("database_id") == database_id and not page["archived"]
+        ]
+
+    def search(self, body: dict) -> list[dict]:
+        query: str = str(body.get("query") or "").lower()
+        object_type: str | None = (body.get("filter") or {}).get("value")
+        results: list[dict] = []
+        if object_type in (None, "page"):
+            results.extend(
+                page for page in self.pages.values() if query in get_title(page).lower()
+            )
+        if object_type in (None, "database"):
+            results.extend(
+                database
+                for database in self.databases.values()
+                if query in "".join(text["plain_text"] for text in database["title"]).lower()
+            )
+        return results
+
+
+class NotFound(Exception):
+    pass
+
+
+class TokenBuckets:
+    """
+    One token bucket per integration token, as Notion limits each integration.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate: float = rate
+        self.burst: float = burst
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def take(self, token: str) -> float:
+        """
+        Takes one request from the token's budget, returning 0 or how long to wait for one.
+        """
+        now: float = time.monotonic()
+        tokens, updated_at = self._buckets.get(token, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+        if tokens >= 1:
+            self._buckets[token] = (tokens - 1, now)
+            return 0.0
+        self._buckets[token] = (tokens, now)
+        return (1 - tokens) / self.rate
+
+
+def create_fake_notion_app(settings: FakeNotionSettings | None = None) -> FastAPI:
+    settings = settings or FakeNotionSettings()
+    store: FakeNotionStore = FakeNotionStore(settings.seed)
+    database_id: str = store.seed(settings.pages, settings.blocks)
+    buckets: TokenBuckets | None = (
+        TokenBuckets(settings.rate_limit, settings.burst) if settings.rate_limit > 0 else None
+    )
+    chaos: random.Random = random.Random(settings.seed)
+    stats: dict = {"requests": 0, "rate_limited": 0, "injected_errors": 0}
+    app: FastAPI = FastAPI(title="Fake Notion API")
+
+    @app.exception_handler(NotFound)
+    async def handle_not_found(request: Request, e: NotFound) -> JSONResponse:
+        return build_error(404, "object_not_found", str(e))
+
+    @app.middleware("http")
+    async def simulate_notion(request: Request, call_next):
+        if request.url.path.startswith("/_fake/"):
+            return await call_next(request)
+        stats["requests"] += 1
+        authorization: str = request.headers.get("Authorization", "")
+        if not authorization.startswith("Bearer ") or authorization == "Bearer ":
+            return build_error(401, "unauthorized", "API token is invalid.")
+        if settings.latency > 0 or settings.jitter > 0:
+            await asyncio.sleep(settings.latency + chaos.uniform(0, settings.jitter))
+        if buckets is not None:
+            wait: float = buckets.take(authorization)
+            if wait > 0:
+                stats["rate_limited"] += 1
+                return build_rate_limited(wait)
+        if settings.error_rate > 0 and chaos.random() < settings.error_rate:
+            stats["injected_errors"] += 1
+            return build_rate_limited(settings.retry_after)
+        return await call_next(request)
+
+    @app.get("/_fake/seed")
+    async def get_seed() -> dict:
+        return {"database_id": database_id, "page_ids": list(store.pages.keys())}
+
+    @app.get("/_fake/stats")
+    async def get_stats() -> dict:
+        return stats
+
+    @app.post("/v1/pages")
+    async def create_page(request: Request) -> JSONResponse:
+        return JSONResponse(store.create_page(await request.json()))
+
+    @app.get("/v1/pages/{page_id}")
+    async def read_page(page_id: str) -> JSONResponse:
+        return JSONResponse(store.get_page(page_id))
+
+    @app.patch("/v1/pages/{page_id}")
+    async def update_page(page_id: str, request: Request) -> JSONResponse:
+        return JSONResponse(store.update_page(page_id, await request.json()))
+
+    @app.get("/v1/blocks/{block_id}/children")
+    async def read_children(
+        block_id: str, page_size: int = MAX_PAGE_SIZE, start_cursor: str | None = None
+    ) -> JSONResponse:
+        if block_id not in store.children:
+            raise NotFound(f"Could not find block with ID: {block_id}.")
+        return JSONResponse(
+            paginate(store.children[block_id], page_size, start_cursor, "block")
+        )
+
+    @app.patch("/v1/blocks/{block_id}/children")
+    async def append_children(block_id: str, request: Request) -> JSONResponse:
+        body: dict = await request.json()
+        blocks: list[dict] = store.append_children(block_id, body.get("children") or [])
+        return JSONResponse(
+            {"object": "list", "results": blocks, "next_cursor": None, "has_more": False}
+        )
+
+    @app.post("/v1/databases")
+    async def create_database(request: Request) -> JSONResponse:
+        return JSONResponse(store.create_database(await request.json()))
+
+    @app.get("/v1/databases/{database_id}")
+    async def read_database(database_id: str) -> JSONResponse:
+        return JSONResponse(store.get_database(database_id))
+
+    @app.patch("/v1/databases/{database_id}")
+    async def update_database(database_id: str, request: Request) -> JSONResponse:
+        return JSONResponse(store.update_database(database_id, await request.json()))
+
+    @app.post("/v1/databases/{database_id}/query")
+    async def query_database(database_id: str, request: Request) -> JSONResponse:
+        body: dict = await read_json(request)
+        return JSONResponse(
+            paginate(
+                store.query_database(database_id),
+                int(body.get("page_size") or MAX_PAGE_SIZE),
+                body.get("start_cursor"),
+                "page_or_database",
+            )
+        )
+
+    @app.post("/v1/search")
+    async def search(request: Request) -> JSONResponse:
+        body: dict = await read_json(request)
+        return JSONResponse(
+            paginate(
+                store.search(body),
+                int(body.get("page_size") or MAX_PAGE_SIZE),
+                body.get("start_cursor"),
+                "page_or_database",
+            )
+        )
+
+    return app
+
+
+def paginate(items: list[dict], page_size: int, start_cursor: str | None, kind: str) -> dict:
+    # Cursors are opaque to clients, so the offset of the next item is enough. Results are
+    # serialized right away, so they are not copied.
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    start: int = int(start_cursor) if start_cursor else 0
+    end: int = start + page_size
+    return {
+        "object": "list",
+        "results": items[start:end],
+        "next_cursor": str(end) if end < len(items) else None,
+        "has_more": end < len(items),
+        "type": kind,
+        kind: {},
+    }
+
+
+async def read_json(request: Request) -> dict:
+    body: bytes = await request.body()
+    return await request.json() if len(body) > 0 else {}
+
+
+def build_property(name: str, value: dict) -> dict:
+    prop_type: str = next(iter(value))
+    prop_value = value[prop_type]
+    if prop_type in ("title", "rich_text"):
+        prop_value = build_rich_text(prop_value)
+    elif prop_type == "select" and prop_value is not None:
+        prop_value = {"color": "default", **prop_value}
+    elif prop_type == "multi_select":
+        prop_value = [{"color": "default", **option} for option in prop_value]
+    return {"id": name, "type": prop_type, prop_type: prop_value}
+
+
+def build_block(block_id: str, parent_id: str, child: dict) -> dict:
+    block_type: str = child["type"]
+    content: dict = dict(child[block_type])
+    if "rich_text" in content:
+        content["rich_text"] = build_rich_text(content["rich_text"])
+    now: str = get_now()
+    return {
+        "object": "block",
+        "id": block_id,
+        "parent": {"type": "block_id", "block_id": parent_id},
+        "created_time": now,
+        "last_edited_time": now,
+        "has_children": False,
+        "archived": False,
+        "type": block_type,
+        block_type: content,
+    }
+
+
+def build_rich_text(rich_text: list[dict]) -> list[dict]:
+    items: list[dict] = []
+    for item in rich_text:
+        content: str = (item.get("text") or {}).get("content", item.get("plain_text", ""))
+        items.append(
+            {
+                "type": "text",
+                "text": {"content": content, "link": None},
+                "plain_text": content,
+                "href": None,
+            }
+        )
+    return items
+
+
+def get_title(page: dict) -> str:
+    for prop in page["properties"].values():
+        if prop["type"] == "title":
+            return "".join(text["plain_text"] for text in prop["title"])
+    return ""
+
+
+def get_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def build_error(status: int, code: str, message: str, headers: dict | None = None) -> JSONResponse:
+    return JSONResponse(
+        {"object": "error", "status": status, "code": code, "message": message},
+        status_code=status,
+        headers=headers,
+    )
+
+
+def build_rate_limited(wait: float) -> JSONResponse:
+    return build_error(
+        429,
+        "rate_limited",
+        "You have been rate limited. Please try again in a few minutes.",
+        {"Retry-After": f"{math.ceil(wait * 100) / 100:.2f}"},
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds, at random")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests per second per token; 0 disables")
+    parser.add_argument("--burst", type=float, default=3.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=0.5)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--blocks", type=int, default=50)
+    args = parser.parse_args()
+    settings: FakeNotionSettings = FakeNotionSettings(
+        args.latency,
+        args.jitter,
+        args.rate_limit,
+        args.burst,
+        args.error_rate,
+        args.retry_after,
+        args.pages,
+        args.blocks,
+    )
+    uvicorn.run(
+        create_fake_notion_app(settings), host=args.host, port=args.port, log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
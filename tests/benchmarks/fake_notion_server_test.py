@@ -0,0 +1,91 @@
+import sys, os, pytest
+import httpx
+
+sys.path.insert(0, os.path.abspath("."))
+
+from main.library.di_container import Container
+from main.library.repositories.notion.core.async_notion_block_manager import (
+    AsyncNotionBlockManager,
+)
+from main.library.repositories.notion.core.async_notion_page_manager import (
+    AsyncNotionPageManager,
+)
+from main.library.repositories.notion.core.async_notion_transport import (
+    AsyncNotionTransport,
+)
+from main.library.repositories.notion.core.notion_rate_limiter import (
+    NotionRateLimiter,
+)
+from main.library.repositories.notion.models.notion_page import NotionPage
+from tests.benchmarks.fake_notion_server import (
+    FakeNotionSettings,
+    create_fake_notion_app,
+)
+
+container: Container = Container()
+
+
+def build_manager(settings: FakeNotionSettings) -> tuple[AsyncNotionPageManager, httpx.AsyncClient]:
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_fake_notion_app(settings)),
+        base_url="https://api.notion.com",
+    )
+    notion_rate_limiter: NotionRateLimiter = NotionRateLimiter(
+        container.settings_tool(), container.log_tool()
+    )
+    notion_rate_limiter.rate = 1000
+    notion_rate_limiter.burst = 1000
+    async_notion_transport: AsyncNotionTransport = AsyncNotionTransport(
+        container.settings_tool(), container.log_tool(), notion_rate_limiter, client
+    )
+    async_notion_block_manager: AsyncNotionBlockManager = AsyncNotionBlockManager(
+        container.settings_tool(), container.log_tool(), async_notion_transport
+    )
+    manager: AsyncNotionPageManager = AsyncNotionPageManager(
+        container.settings_tool(),
+        container.log_tool(),
+        async_notion_block_manager,
+        async_notion_transport,
+    )
+    return manager, client
+
+
+@pytest.mark.asyncio
+async def test_should_read_paginated_page_from_fake_notion():
+    # Arrange
+    manager, client = build_manager(FakeNotionSettings(pages=2, blocks=250))
+    seed: dict = (await client.get("/_fake/seed")).json()
+
+    # Act
+    page: NotionPage = await manager.read_page_by_id("secret_123", seed["page_ids"][0])
+    pages: list[NotionPage] = await manager.query_pages_by_database_id(
+        "secret_123", seed["database_id"], page_size=1
+    )
+    await client.aclose()
+
+    # Assert
+    assert len(page.blocks) == 250
+    assert page.blocks[-1].value == "Paragraph 249"
+    assert len(pages) == 1
+
+
+@pytest.mark.asyncio
+async def test_should_retry_after_fake_notion_rate_limits():
+    # Arrange
+    manager, client = build_manager(
+        FakeNotionSettings(rate_limit=50, burst=1, pages=1, blocks=1)
+    )
+    seed: dict = (await client.get("/_fake/seed")).json()
+
+    # Act
+    pages: list[NotionPage] = [
+        await manager.read_page_properties_by_page_id("secret_123", seed["page_ids"][0])
+        for _ in range(3)
+    ]
+    stats: dict = (await client.get("/_fake/stats")).json()
+    await client.aclose()
+
+    # Assert
+    assert len(pages) == 3
+    assert stats["rate_limited"] > 0
+    assert manager.async_notion_transport.retry_count == stats["rate_limited"]
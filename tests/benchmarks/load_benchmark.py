@@ -0,0 +1,249 @@
+"""
+Drives the API end to end against the fake Notion server and reports throughput and latency.
+
+Starts tests.benchmarks.fake_notion_server and the API (uvicorn) as subprocesses on free
+local ports, points the API at the fake server, then runs each scenario (create, read,
+query, search) with --requests requests at --concurrency. No network access is needed.
+
+The API's own Notion rate limiter is raised out of the way unless --app-rate-limit is given,
+so the numbers measure this service rather than Notion's budget. Pass --notion-rate-limit 3
+(and --app-rate-limit 0) to see how throttling and retries behave instead.
+
+Run with: python -m tests.benchmarks.load_benchmark --concurrency 32 --requests 1000 --latency 0.05
+"""
+
+import sys, os, argparse, asyncio, json, math, socket, subprocess, time
+
+sys.path.insert(0, os.path.abspath("."))
+import httpx
+
+TOKEN: str = "secret_benchmark"
+SCENARIOS: tuple[str, ...] = ("create", "read", "query", "search")
+
+
+class ScenarioResult:
+    def __init__(self, name: str, latencies: list[float], errors: int, elapsed: float):
+        self.name: str = name
+        self.latencies: list[float] = sorted(latencies)
+        self.errors: int = errors
+        self.elapsed: float = elapsed
+
+    def to_dict(self) -> dict:
+        return {
+            "scenario": self.name,
+            "requests": len(self.latencies),
+            "errors": self.errors,
+            "requests_per_second": round(len(self.latencies) / self.elapsed, 2),
+            "p50_ms": round(get_percentile(self.latencies, 50) * 1000, 2),
+            "p95_ms": round(get_percentile(self.latencies, 95) * 1000, 2),
+            "p99_ms": round(get_percentile(self.latencies, 99) * 1000, 2),
+        }
+
+
+def get_percentile(sorted_values: list[float], percentile: float) -> float:
+    # Nearest rank, so p99 of 100 samples is the 99th slowest rather than an interpolation.
+    if len(sorted_values) == 0:
+        return 0.0
+    rank: int = max(1, math.ceil(percentile / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def build_requests(name: str, seed: dict, index: int) -> tuple[str, str, dict | None]:
+    database_id: str = seed["database_id"]
+    page_ids: list[str] = seed["page_ids"]
+    if name == "create":
+        return (
+            "POST",
+            f"/pages/{database_id}/create",
+            {
+                "icon": {"type": "emoji", "value": "🚀"},
+                "properties": [
+                    {"name": "Name", "type": "title", "value": f"Load page {index}"},
+                    {"name": "Number", "type": "number", "value": float(index)},
+                ],
+                "blocks": [
+                    {"type": "paragraph", "value": f"Paragraph {block}"} for block in range(20)
+                ],
+            },
+        )
+    if name == "read":
+        return "GET", f"/pages/{page_ids[index % len(page_ids)]}/read", None
+    if name == "query":
+        return (
+            "POST",
+            f"/pages/{database_id}/query",
+            {"page_size": 100, "filter": {"property": "Name", "title": {"contains": "Page"}}},
+        )
+    if name == "search":
+        return "POST", "/search", {"query": f"Page {index % 10}", "page_size": 20}
+    raise Exception(f"Invalid scenario: {name}")
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, name: str, seed: dict, total: int, concurrency: int
+) -> ScenarioResult:
+    latencies: list[float] = []
+    errors: int = 0
+    next_index: int = 0
+
+    async def worker() -> None:
+        nonlocal errors, next_index
+        while next_index < total:
+            index: int = next_index
+            next_index += 1
+            method, uri, body = build_requests(name, seed, index)
+            started_at: float = time.perf_counter()
+            try:
+                response: httpx.Response = await client.request(method, uri, json=body)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started_at)
+
+    started_at: float = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return ScenarioResult(name, latencies, errors, time.perf_counter() - started_at)
+
+
+async def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 30) -> None:
+    deadline: float = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise Exception(f"Process serving {url} exited with code {process.returncode}")
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.1)
+    raise Exception(f"{url} was not ready after {timeout}s")
+
+
+def start_processes(args: argparse.Namespace) -> tuple[subprocess.Popen, subprocess.Popen, int, int]:
+    notion_port: int = get_free_port()
+    api_port: int = get_free_port()
+    fake_notion: subprocess.Popen = subprocess.Popen(
+        [
+            sys.executable, "-m", "tests.benchmarks.fake_notion_server",
+            "--port", str(notion_port),
+            "--latency", str(args.latency),
+            "--jitter", str(args.jitter),
+            "--rate-limit", str(args.notion_rate_limit),
+            "--error-rate", str(args.error_rate),
+            "--pages", str(args.pages),
+            "--blocks", str(args.blocks),
+        ]
+    )
+    env: dict = {
+        **os.environ,
+        "MICRO_TOOLS_SYS_ENV": os.getenv("MICRO_TOOLS_SYS_ENV", "dev"),
+        "NOTION_PROTOCOL": "http",
+        "NOTION_HOST": "127.0.0.1",
+        "NOTION_PORT": str(notion_port),
+        "LOG_LEVEL": "error",
+        "TRACING_EXPORTER": "none",
+    }
+    if args.app_rate_limit > 0:
+        env["NOTION_RATE_LIMIT_PER_SECOND"] = str(args.app_rate_limit)
+        env["NOTION_RATE_LIMIT_BURST"] = str(max(1, args.app_rate_limit))
+    else:
+        env["NOTION_RATE_LIMIT_PER_SECOND"] = "1000000"
+        env["NOTION_RATE_LIMIT_BURST"] = "1000000"
+    api: subprocess.Popen = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main.entrypoint.main:app",
+            "--host", "127.0.0.1",
+            "--port", str(api_port),
+            "--log-level", "warning",
+            "--no-access-log",
+        ],
+        env=env,
+    )
+    return fake_notion, api, notion_port, api_port
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    fake_notion, api, notion_port, api_port = start_processes(args)
+    try:
+        await wait_until_ready(f"http://127.0.0.1:{notion_port}/_fake/seed", fake_notion)
+        await wait_until_ready(f"http://127.0.0.1:{api_port}/info", api)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{notion_port}") as notion:
+            seed: dict = (await notion.get("/_fake/seed")).json()
+        limits: httpx.Limits = httpx.Limits(
+            max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+        )
+        results: list[dict] = []
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{api_port}",
+            headers={"Authorization": f"Bearer {TOKEN}"},
+            limits=limits,
+            timeout=120,
+        ) as client:
+            for name in args.scenarios:
+                result: ScenarioResult = await run_scenario(
+                    client, name, seed, args.requests, args.concurrency
+                )
+                results.append(result.to_dict())
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{notion_port}") as notion:
+            notion_stats: dict = (await notion.get("/_fake/stats")).json()
+        for result in results:
+            result["concurrency"] = args.concurrency
+        results.append({"scenario": "fake_notion", **notion_stats})
+        return results
+    finally:
+        for process in (api, fake_notion):
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def print_table(results: list[dict]) -> None:
+    print(f"{'scenario':<10}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for result in results:
+        if result["scenario"] == "fake_notion":
+            continue
+        print(
+            f"{result['scenario']:<10}{result['requests']:>10}{result['errors']:>8}"
+            f"{result['requests_per_second']:>10.1f}{result['p50_ms']:>10.1f}"
+            f"{result['p95_ms']:>10.1f}{result['p99_ms']:>10.1f}"
+        )
+    notion_stats: dict = results[-1]
+    print(
+        f"Fake Notion served {notion_stats['requests']} requests, "
+        f"{notion_stats['rate_limited']} rate limited and {notion_stats['injected_errors']} injected 429s."
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake Notion latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--notion-rate-limit", type=float, default=0.0, help="Fake Notion requests per second per token")
+    parser.add_argument("--app-rate-limit", type=float, default=0.0, help="NOTION_RATE_LIMIT_PER_SECOND of the API")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of Notion requests answered with 429")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--blocks", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+    results: list[dict] = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+
+if __name__ == "__main__":
+    main()
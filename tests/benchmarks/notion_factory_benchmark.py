@@ -0,0 +1,144 @@
+"""
+Decodes a 1,000-block page with build_blocks_from_response and with the former per-block path.
+
+The former path is the code the block managers used to run for each result:
+build_block_from_response and its asserts, then the if/elif chain of get_block_value_from_response.
+Both sides return the same NotionPageBlock list.
+
+Run with: python -m tests.benchmarks.notion_factory_benchmark
+"""
+
+import sys, os, timeit
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.abspath("."))
+from main.library.repositories.notion.models.notion_page_block import NotionPageBlock
+from main.library.repositories.notion.utils.notion_factory import (
+    build_blocks_from_response,
+)
+
+BLOCK_COUNT: int = 1000
+REPEAT: int = 7
+NUMBER: int = 100
+
+
+def legacy_build_block_from_response(block: dict) -> NotionPageBlock:
+    # The former build_block_from_response.
+    assert block is not None, "Block cannot be None"
+    assert "object" in block, "Block object cannot be None"
+    assert block["object"] == "block", "Block object must be a block"
+    assert "type" in block, "Block type cannot be None"
+    block_type: str = block["type"]
+    value: Any = legacy_get_block_value_from_response(block)
+    block_id: str = block["id"]
+    return NotionPageBlock(block_type, value, block_id)
+
+
+def legacy_build_blocks_from_response(blocks: list[dict]) -> list[NotionPageBlock]:
+    # The former loop of the block managers.
+    page_blocks: list[NotionPageBlock] = []
+    for block in blocks:
+        page_blocks.append(legacy_build_block_from_response(block))
+    return page_blocks
+
+
+def legacy_get_block_value_from_response(block: dict) -> Any:
+    # The former get_block_value_from_response, asserts included.
+    assert block is not None, "Block cannot be None"
+    assert "type" in block, "Block type cannot be None"
+    block_type: str = block["type"]
+    if block_type == "paragraph":
+        return str(block["paragraph"]["rich_text"][0]["plain_text"])
+    elif block_type == "heading_1":
+        return str(block["heading_1"]["rich_text"][0]["plain_text"])
+    elif block_type == "heading_2":
+        return str(block["heading_2"]["rich_text"][0]["plain_text"])
+    elif block_type == "heading_3":
+        return str(block["heading_3"]["rich_text"][0]["plain_text"])
+    elif block_type == "bulleted_list_item":
+        return str(block["bulleted_list_item"]["rich_text"][0]["plain_text"])
+    elif block_type == "numbered_list_item":
+        return str(block["numbered_list_item"]["rich_text"][0]["plain_text"])
+    elif block_type == "to_do":
+        return str(block["to_do"]["rich_text"][0]["plain_text"])
+    elif block_type == "toggle":
+        return str(block["toggle"]["rich_text"][0]["plain_text"])
+    elif block_type == "image":
+        return str(block["image"]["external"]["url"])
+    elif block_type == "video":
+        return str(block["video"]["external"]["url"])
+    elif block_type == "file":
+        return {
+            "name": str(block["file"]["name"]),
+            "url": str(block["file"]["external"]["url"]),
+        }
+    elif block_type == "code":
+        return {
+            "content": str(block["code"]["rich_text"][0]["plain_text"]),
+            "language": str(block["code"]["language"]),
+        }
+    elif block_type == "quote":
+        return str(block["quote"]["rich_text"][0]["plain_text"])
+    else:
+        raise Exception(f"Invalid block type: {block_type}")
+
+
+def build_sample_blocks(count: int) -> list[dict]:
+    # An even mix of text, media and code blocks, as real pages are rarely all paragraphs.
+    block_types: list[str] = [
+        "paragraph",
+        "bulleted_list_item",
+        "numbered_list_item",
+        "to_do",
+        "toggle",
+        "quote",
+        "image",
+        "code",
+    ]
+    blocks: list[dict] = []
+    for index in range(count):
+        block_type: str = block_types[index % len(block_types)]
+        content: dict
+        if block_type == "image":
+            content = {"type": "external", "external": {"url": f"https://example.com/{index}.png"}}
+        elif block_type == "code":
+            content = {
+                "rich_text": [{"type": "text", "plain_text": f"print({index})"}],
+                "language": "python",
+            }
+        else:
+            content = {"rich_text": [{"type": "text", "plain_text": f"Block {index}"}]}
+        blocks.append(
+            {
+                "object": "block",
+                "id": f"block-{index}",
+                "type": block_type,
+                "has_children": False,
+                block_type: content,
+            }
+        )
+    return blocks
+
+
+def measure(decode: Callable[[list[dict]], list[NotionPageBlock]], blocks: list[dict]) -> float:
+    timings: list[float] = timeit.repeat(lambda: decode(blocks), repeat=REPEAT, number=NUMBER)
+    return min(timings) / NUMBER
+
+
+def main() -> None:
+    blocks: list[dict] = build_sample_blocks(BLOCK_COUNT)
+    legacy_blocks: list[NotionPageBlock] = legacy_build_blocks_from_response(blocks)
+    registry_blocks: list[NotionPageBlock] = build_blocks_from_response(blocks)
+    assert [block.to_dict() for block in legacy_blocks] == [
+        block.to_dict() for block in registry_blocks
+    ]
+    legacy_seconds: float = measure(legacy_build_blocks_from_response, blocks)
+    registry_seconds: float = measure(build_blocks_from_response, blocks)
+    print(f"Decoding a {BLOCK_COUNT}-block page (best of {REPEAT} x {NUMBER} runs):")
+    print(f"  former per-block path:      {legacy_seconds * 1000:.3f} ms")
+    print(f"  build_blocks_from_response: {registry_seconds * 1000:.3f} ms")
+    print(f"  speedup:                    {legacy_seconds / registry_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
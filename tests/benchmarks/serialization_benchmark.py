@@ -0,0 +1,305 @@
+"""
+Measures the CPU time and memory spent decoding Notion responses and encoding requests.
+
+Each case runs on a synthetic payload shaped like real traffic: pages with 50 properties,
+a page with 5,000 blocks and searches returning 100 results. The page with 5,000 blocks is
+also rendered to response bytes by FastAPI's default path and by FastJSONResponse. For
+every case it reports ops/s (best of REPEAT rounds) and the peak memory allocated by one
+call (tracemalloc).
+
+Results are compared with the baseline stored in BASELINE_PATH. A case regresses when its
+ops/s drop, or its peak memory grows, by more than --tolerance. Timings depend on the
+machine, so save a new baseline (--save) before comparing on another one.
+
+Run with: python -m tests.benchmarks.serialization_benchmark [--save] [--check] [--tolerance 0.25]
+"""
+
+import sys, os, argparse, json, platform, timeit, tracemalloc
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.abspath("."))
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from main.entrypoint.utils.responses.fast_json_response import FastJSONResponse
+from main.library.repositories.notion.models.notion_database import NotionDatabase
+from main.library.repositories.notion.models.notion_page import NotionPage
+from main.library.repositories.notion.models.notion_search_result import (
+    NotionSearchResult,
+)
+from main.library.repositories.notion.utils.notion_factory import (
+    build_blocks_for_request,
+    build_blocks_from_response,
+    build_page_from_response,
+    build_properties_for_request,
+)
+from tests.benchmarks.notion_factory_benchmark import build_sample_blocks
+
+BASELINE_PATH: str = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baselines", "serialization_benchmark.json"
+)
+PROPERTY_COUNT: int = 50
+BLOCK_COUNT: int = 5000
+SEARCH_RESULT_COUNT: int = 100
+REPEAT: int = 5
+
+USER_ID: str = "6595192e-1c62-4f33-801c-84424f2ffa9c"
+WRITABLE_PROPERTY_TYPES: list[str] = [
+    "title",
+    "rich_text",
+    "number",
+    "select",
+    "multi_select",
+    "date",
+    "people",
+    "files",
+    "checkbox",
+    "url",
+    "email",
+    "phone_number",
+    "relation",
+]
+READ_ONLY_PROPERTY_TYPES: list[str] = [
+    "formula",
+    "rollup",
+    "created_time",
+    "last_edited_time",
+    "created_by",
+    "last_edited_by",
+]
+
+
+def build_rich_text(content: str) -> list[dict]:
+    return [
+        {
+            "type": "text",
+            "text": {"content": content, "link": None},
+            "annotations": {"bold": False, "italic": False, "code": False, "color": "default"},
+            "plain_text": content,
+            "href": None,
+        }
+    ]
+
+
+def build_property_value(prop_type: str, index: int) -> Any:
+    if prop_type in ("title", "rich_text"):
+        return build_rich_text(f"Text of property {index}, long enough to look like real content")
+    if prop_type == "number":
+        return index * 1.5
+    if prop_type == "select":
+        return {"id": f"opt-{index}", "name": f"Option {index}", "color": "blue"}
+    if prop_type == "multi_select":
+        return [{"id": f"tag-{tag}", "name": f"Tag {tag}", "color": "gray"} for tag in range(3)]
+    if prop_type == "date":
+        return {"start": "2024-05-24", "end": None, "time_zone": None}
+    if prop_type in ("people", "created_by", "last_edited_by"):
+        person: dict = {"object": "user", "id": USER_ID}
+        return person if prop_type != "people" else [person]
+    if prop_type == "files":
+        return [{"name": f"file-{index}.png", "type": "external", "external": {"url": f"https://example.com/{index}.png"}}]
+    if prop_type == "checkbox":
+        return index % 2 == 0
+    if prop_type == "url":
+        return f"https://example.com/{index}"
+    if prop_type == "email":
+        return f"user{index}@example.com"
+    if prop_type == "phone_number":
+        return "+5511999999999"
+    if prop_type == "relation":
+        return [{"id": f"c5353a8c-a89c-4dd0-96c5-e3e2d19a{index:04d}"}]
+    if prop_type == "formula":
+        return {"type": "number", "number": index}
+    if prop_type == "rollup":
+        return {"type": "array", "array": [], "function": "show_original"}
+    return "2024-05-24T02:04:00.000Z"
+
+
+def build_page_response(
+    index: int, property_count: int = PROPERTY_COUNT, property_types: list[str] | None = None
+) -> dict:
+    # A page has exactly one title, and the rest cycles through the other property types.
+    types: list[str] = property_types or WRITABLE_PROPERTY_TYPES + READ_ONLY_PROPERTY_TYPES
+    other_types: list[str] = [prop_type for prop_type in types if prop_type != "title"]
+    properties: dict = {"Name": {"id": "title", "type": "title", "title": build_rich_text(f"Page {index}")}}
+    for prop_index in range(property_count - 1):
+        prop_type: str = other_types[prop_index % len(other_types)]
+        properties[f"Property {prop_index}"] = {
+            "id": f"p{prop_index}",
+            "type": prop_type,
+            prop_type: build_property_value(prop_type, prop_index),
+        }
+    return {
+        "object": "page",
+        "id": f"c5353a8c-a89c-4dd0-96c5-e3e2d19a{index:04d}",
+        "created_time": "2024-05-24T02:04:00.000Z",
+        "last_edited_time": "2024-05-24T02:04:00.000Z",
+        "created_by": {"object": "user", "id": USER_ID},
+        "last_edited_by": {"object": "user", "id": USER_ID},
+        "cover": None,
+        "icon": {"type": "emoji", "emoji": "🚀"},
+        "parent": {"type": "database_id", "database_id": "c7c1007a-d112-4b8c-a621-a769adaf7dda"},
+        "archived": False,
+        "properties": properties,
+        "url": f"https://www.notion.so/page-{index}",
+    }
+
+
+def build_database_response(index: int, property_count: int = PROPERTY_COUNT) -> dict:
+    types: list[str] = WRITABLE_PROPERTY_TYPES[1:] + READ_ONLY_PROPERTY_TYPES
+    properties: dict = {"Name": {"id": "title", "name": "Name", "type": "title", "title": {}}}
+    for prop_index in range(property_count - 1):
+        prop_type: str = types[prop_index % len(types)]
+        options: dict = {}
+        if prop_type == "number":
+            options = {"format": "number"}
+        elif prop_type in ("select", "multi_select"):
+            options = {"options": [{"id": f"opt-{option}", "name": f"Option {option}", "color": "blue"} for option in range(5)]}
+        properties[f"Property {prop_index}"] = {
+            "id": f"p{prop_index}",
+            "name": f"Property {prop_index}",
+            "type": prop_type,
+            prop_type: options,
+        }
+    return {
+        "object": "database",
+        "id": f"d7c1007a-d112-4b8c-a621-a769adaf{index:04d}",
+        "created_time": "2024-05-24T02:04:00.000Z",
+        "last_edited_time": "2024-05-24T02:04:00.000Z",
+        "icon": {"type": "emoji", "emoji": "📚"},
+        "cover": None,
+        "title": build_rich_text(f"Database {index}"),
+        "description": build_rich_text("A database generated for benchmarks"),
+        "is_inline": False,
+        "parent": {"type": "page_id", "page_id": "6301f640-e21c-4526-a72e-d96e7d4ba71d"},
+        "properties": properties,
+        "archived": False,
+        "url": f"https://www.notion.so/database-{index}",
+    }
+
+
+def build_search_response(result_count: int = SEARCH_RESULT_COUNT) -> dict:
+    # Mostly pages, as in real searches, with one database every ten results.
+    results: list[dict] = [
+        build_database_response(index) if index % 10 == 9 else build_page_response(index)
+        for index in range(result_count)
+    ]
+    return {"object": "list", "results": results, "next_cursor": None, "has_more": False}
+
+
+def build_cases() -> dict[str, Callable[[], Any]]:
+    """
+    Returns the benchmark cases by name, each a call without arguments on prebuilt payloads.
+    """
+    page_response: dict = build_page_response(0)
+    block_responses: list[dict] = build_sample_blocks(BLOCK_COUNT)
+    database_response: dict = build_database_response(0)
+    search_response: dict = build_search_response()
+    writable_page: NotionPage = build_page_from_response(
+        build_page_response(0, property_types=WRITABLE_PROPERTY_TYPES)
+    )
+    writable_page.blocks = build_blocks_from_response(block_responses)
+    return {
+        "build_page_from_response": lambda: build_page_from_response(page_response),
+        "build_blocks_from_response": lambda: build_blocks_from_response(block_responses),
+        "NotionDatabase.from_read_response": lambda: NotionDatabase.from_read_response(
+            database_response
+        ),
+        "NotionSearchResult.from_dict": lambda: NotionSearchResult.from_dict(search_response),
+        "build_properties_for_request": lambda: build_properties_for_request(writable_page),
+        "build_blocks_for_request": lambda: build_blocks_for_request(writable_page),
+        "NotionPage.to_dict": lambda: writable_page.to_dict(),
+        # FastAPI's default encoding against the response class used by the Notion routes.
+        "JSONResponse(NotionPage)": lambda: JSONResponse(jsonable_encoder(writable_page.to_dict())),
+        "FastJSONResponse(NotionPage)": lambda: FastJSONResponse(writable_page.to_dict()),
+    }
+
+
+def measure(case: Callable[[], Any]) -> dict:
+    timer: timeit.Timer = timeit.Timer(case)
+    number, _ = timer.autorange()
+    seconds: float = min(timer.repeat(repeat=REPEAT, number=number)) / number
+    tracemalloc.start()
+    try:
+        case()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"ops_per_second": round(1 / seconds, 2), "peak_kib": round(peak / 1024, 1)}
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """
+    Returns the names of the cases that regressed against the baseline by more than `tolerance`.
+    """
+    regressions: list[str] = []
+    for name, result in results.items():
+        expected: dict | None = baseline.get(name)
+        if expected is None:
+            continue
+        slower: bool = result["ops_per_second"] < expected["ops_per_second"] * (1 - tolerance)
+        bigger: bool = result["peak_kib"] > expected["peak_kib"] * (1 + tolerance)
+        if slower or bigger:
+            regressions.append(name)
+    return regressions
+
+
+def read_baseline() -> dict | None:
+    if not os.path.exists(BASELINE_PATH):
+        return None
+    with open(BASELINE_PATH, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def write_baseline(results: dict[str, dict]) -> None:
+    os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+    with open(BASELINE_PATH, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "cases": results,
+            },
+            file,
+            indent=2,
+        )
+        file.write("\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--case", action="append", help="Only run the named cases")
+    args = parser.parse_args()
+    cases: dict[str, Callable[[], Any]] = build_cases()
+    if args.case:
+        cases = {name: case for name, case in cases.items() if name in args.case}
+    baseline: dict | None = read_baseline()
+    baseline_cases: dict = baseline["cases"] if baseline is not None else {}
+    results: dict[str, dict] = {}
+    print(f"{'case':<36}{'ops/s':>12}{'peak KiB':>12}{'vs baseline':>14}")
+    for name, case in cases.items():
+        result: dict = measure(case)
+        results[name] = result
+        change: str = ""
+        if name in baseline_cases:
+            change = f"{result['ops_per_second'] / baseline_cases[name]['ops_per_second'] - 1:+.1%}"
+        print(f"{name:<36}{result['ops_per_second']:>12.1f}{result['peak_kib']:>12.1f}{change:>14}")
+    if args.save:
+        write_baseline({**baseline_cases, **results})
+        print(f"Baseline saved to {BASELINE_PATH}")
+        return
+    if baseline is None:
+        print("No baseline yet, run with --save to store one.")
+        return
+    if baseline.get("machine") != platform.machine() or baseline.get("python") != platform.python_version():
+        print(f"Baseline was taken on {baseline.get('machine')} with Python {baseline.get('python')}.")
+    regressions: list[str] = compare(results, baseline_cases, args.tolerance)
+    for name in regressions:
+        print(f"REGRESSION: {name} is more than {args.tolerance:.0%} worse than the baseline")
+    if args.check and len(regressions) > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("."))
+
+from main.library.repositories.notion.models.notion_page import NotionPage
+from main.library.repositories.notion.models.notion_search_result import (
+    NotionSearchResult,
+)
+from main.library.repositories.notion.utils.notion_factory import (
+    build_page_from_response,
+)
+from tests.benchmarks.serialization_benchmark import (
+    PROPERTY_COUNT,
+    SEARCH_RESULT_COUNT,
+    build_cases,
+    build_page_response,
+    build_search_response,
+    compare,
+)
+
+
+def test_should_decode_every_synthetic_payload():
+    # Arrange
+    page_response: dict = build_page_response(0)
+    search_response: dict = build_search_response()
+
+    # Act
+    page: NotionPage = build_page_from_response(page_response)
+    search_result: NotionSearchResult = NotionSearchResult.from_dict(search_response)
+    outputs: dict = {name: case() for name, case in build_cases().items()}
+
+    # Assert
+    assert len(page.properties) == PROPERTY_COUNT
+    assert search_result.count() == SEARCH_RESULT_COUNT
+    assert all(output is not None for output in outputs.values())
+
+
+def test_should_flag_slower_or_bigger_cases_as_regressions():
+    # Arrange
+    baseline: dict = {
+        "steady": {"ops_per_second": 100.0, "peak_kib": 10.0},
+        "slower": {"ops_per_second": 100.0, "peak_kib": 10.0},
+        "bigger": {"ops_per_second": 100.0, "peak_kib": 10.0},
+    }
+    results: dict = {
+        "steady": {"ops_per_second": 80.0, "peak_kib": 12.0},
+        "slower": {"ops_per_second": 70.0, "peak_kib": 10.0},
+        "bigger": {"ops_per_second": 100.0, "peak_kib": 13.0},
+        "new": {"ops_per_second": 1.0, "peak_kib": 1000.0},
+    }
+
+    # Act
+    regressions: list[str] = compare(results, baseline, 0.25)
+
+    # Assert
+    assert regressions == ["slower", "bigger"]
@@ -1,7 +1,9 @@
-import sys, os, pytest
+import sys, os, json, pytest
 sys.path.insert(0, os.path.abspath("."))
 from fastapi.testclient import TestClient
+from main.entrypoint.controllers.main_controller import get_trace
 from main.entrypoint.main import app
+from main.library.tools.core.tracing_tool import InMemorySpanExporter, TracingTool
 
 client = TestClient(app)
 
@@ -16,3 +18,16 @@ def test_should_return_info():
     assert "processor" in data
     assert "python_version" in data
     assert "environment" in data
+
+@pytest.mark.asyncio
+async def test_should_return_trace_as_json_response():
+    tracing_tool = TracingTool(
+        app.container.settings_tool(), app.container.log_tool(), InMemorySpanExporter()
+    )
+    with tracing_tool.start_trace("req-1", "GET /info"):
+        pass
+    response = await get_trace(request_id="req-1", tracing_tool=tracing_tool)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    spans = json.loads(response.body)
+    assert [span["name"] for span in spans] == ["GET /info"]
@@ -0,0 +1,51 @@
+import sys, os, json
+
+sys.path.insert(0, os.path.abspath("."))
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from main.entrypoint.utils.responses.fast_json_response import (
+    FastJSONResponse,
+    build_json_response,
+)
+from main.library.repositories.notion.models.notion_custom_icon import NotionIcon
+from main.library.repositories.notion.models.notion_page import NotionPage
+from main.library.repositories.notion.models.notion_page_block import NotionPageBlock
+from main.library.repositories.notion.models.notion_property import NotionProperty
+
+
+def build_page() -> NotionPage:
+    return NotionPage(
+        NotionIcon("emoji", "🚀"),
+        [NotionProperty("Name", "title", "Página de teste")],
+        [NotionPageBlock("paragraph", "Olá, mundo!")],
+        page_id="page-1",
+    )
+
+
+def test_should_render_same_json_as_default_response():
+    # Arrange
+    page: NotionPage = build_page()
+
+    # Act
+    fast_response: FastJSONResponse = FastJSONResponse(page)
+    default_response: JSONResponse = JSONResponse(jsonable_encoder(page.to_dict()))
+
+    # Assert
+    assert json.loads(fast_response.body) == json.loads(default_response.body)
+    assert fast_response.headers["content-type"] == "application/json"
+
+
+def test_should_fall_back_to_default_response_when_disabled(monkeypatch):
+    # Mocks
+    monkeypatch.setenv("FAST_JSON_RESPONSE", "false")
+
+    # Arrange
+    page: NotionPage = build_page()
+
+    # Act
+    response: JSONResponse = build_json_response(page.to_dict(), status_code=201)
+
+    # Assert
+    assert type(response) is JSONResponse
+    assert response.status_code == 201
+    assert json.loads(response.body)["id"] == "page-1"
@@ -0,0 +1,30 @@
+import sys, os, pytest
+
+sys.path.insert(0, os.path.abspath("."))
+
+from main.library.di_container import Container, shutdown_resources, startup_resources
+
+
+@pytest.mark.asyncio
+async def test_should_share_services_and_close_them_on_shutdown(mocker):
+    # Arrange
+    container: Container = Container()
+
+    # Act
+    await startup_resources(container)
+    page_manager = container.async_notion_page_manager()
+    transport = container.async_notion_transport()
+    aclose = mocker.patch.object(transport, "aclose", mocker.AsyncMock())
+    close_mirror = mocker.patch.object(
+        container.notion_mirror(), "close", side_effect=Exception("already closed")
+    )
+    close_pool = mocker.patch.object(container.connection_pool_tool(), "close")
+    await shutdown_resources(container)
+
+    # Assert
+    assert page_manager is container.async_notion_page_manager(), "Services should be shared"
+    assert container.log_tool() is container.log_tool()
+    assert page_manager.async_notion_transport is transport
+    assert aclose.await_count == 1
+    assert close_mirror.call_count == 1
+    assert close_pool.call_count == 1, "A failing step should not skip the next ones"
@@ -0,0 +1,112 @@
+import sys, os, asyncio, json, pytest
+import httpx
+
+sys.path.insert(0, os.path.abspath("."))
+
+from main.library.di_container import Container
+from main.library.repositories.notion.core.async_notion_database_manager import (
+    AsyncNotionDatabaseManager,
+)
+from main.library.repositories.notion.core.async_notion_transport import (
+    AsyncNotionTransport,
+)
+from main.library.repositories.notion.models.notion_database import NotionDatabase
+from main.library.tools.core.lru_cache_tool import LruCacheTool
+
+container: Container = Container()
+
+database_sample: dict = {
+    "object": "database",
+    "id": "1c62e8a0-bb82-46d9-8000-71c3679e840e",
+    "icon": {"type": "emoji", "emoji": "🚀"},
+    "title": [{"type": "text", "plain_text": "Banco de dados"}],
+    "description": [{"type": "text", "plain_text": "Descrição do db"}],
+    "is_inline": True,
+    "properties": {
+        "Name": {"id": "title", "name": "Name", "type": "title", "title": {}},
+    },
+    "parent": {"type": "page_id", "page_id": "6f48b54c-094d-4339-aa90-89f9985fb6c7"},
+    "url": "https://www.notion.so/1c62e8a0bb8246d9800071c3679e840e",
+    "archived": False,
+}
+
+
+def build_manager(handler) -> AsyncNotionDatabaseManager:
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="https://api.notion.com"
+    )
+    async_notion_transport: AsyncNotionTransport = AsyncNotionTransport(
+        container.settings_tool(),
+        container.log_tool(),
+        container.notion_rate_limiter(),
+        client,
+    )
+    notion_database_cache: LruCacheTool = LruCacheTool(
+        container.settings_tool(), container.log_tool(), "NOTION_DATABASE_CACHE"
+    )
+    return AsyncNotionDatabaseManager(
+        container.settings_tool(),
+        container.log_tool(),
+        async_notion_transport,
+        notion_database_cache,
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_share_one_read_between_concurrent_misses():
+    # Mocks
+    reads: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        reads.append(request.url.path)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=database_sample)
+
+    # Arrange
+    async_notion_database_manager: AsyncNotionDatabaseManager = build_manager(handler)
+
+    # Act
+    databases: list[NotionDatabase] = await asyncio.gather(
+        *[
+            async_notion_database_manager.read_database_by_id(
+                "secret_123", database_sample["id"]
+            )
+            for _ in range(5)
+        ]
+    )
+    cached: NotionDatabase = await async_notion_database_manager.read_database_by_id(
+        "secret_123", database_sample["id"]
+    )
+
+    # Assert
+    assert len(reads) == 1, "Concurrent misses should trigger a single Notion call"
+    assert all(database.id == database_sample["id"] for database in databases)
+    assert cached.id == database_sample["id"]
+    stats: dict = async_notion_database_manager.get_cache_stats()
+    assert stats["coalesced"] == 4
+    assert stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_should_drop_cached_schema_on_update():
+    # Mocks
+    reads: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            reads.append(request.url.path)
+            return httpx.Response(200, json=database_sample)
+        assert json.loads(request.content) == {"archived": True}
+        return httpx.Response(200, json=database_sample)
+
+    # Arrange
+    async_notion_database_manager: AsyncNotionDatabaseManager = build_manager(handler)
+
+    # Act
+    await async_notion_database_manager.read_database_by_id("secret_123", database_sample["id"])
+    await async_notion_database_manager.read_database_by_id("secret_456", database_sample["id"])
+    await async_notion_database_manager.archive_database("secret_123", database_sample["id"])
+    await async_notion_database_manager.read_database_by_id("secret_456", database_sample["id"])
+
+    # Assert
+    assert len(reads) == 3, "Archiving should drop the schema cached for every token"
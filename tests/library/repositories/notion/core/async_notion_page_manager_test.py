@@ -0,0 +1,523 @@
+import sys, os, asyncio, json, pytest
+import httpx
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath("."))
+
+from main.library.di_container import Container
+from main.library.repositories.notion.core.async_notion_block_manager import (
+    AsyncNotionBlockManager,
+)
+from main.library.repositories.notion.core.async_notion_page_manager import (
+    AsyncNotionPageManager,
+)
+from main.library.repositories.notion.core.async_notion_transport import (
+    AsyncNotionTransport,
+)
+from main.library.repositories.notion.core.notion_rate_limiter import (
+    NotionRateLimiter,
+)
+from main.library.repositories.notion.models.notion_custom_icon import NotionIcon
+from main.library.repositories.notion.models.notion_page import NotionPage
+from main.library.repositories.notion.models.notion_page_block import NotionPageBlock
+from main.library.repositories.notion.models.notion_property import NotionProperty
+from main.library.tools.core.lru_cache_tool import LruCacheTool
+from main.library.utils.models.partial_write_exception import PartialWriteException
+
+container: Container = Container()
+
+page_sample: dict = {
+    "object": "page",
+    "id": "48a4c8b5-8c75-43ee-8863-505c38ffa20e",
+    "created_time": "2024-05-24T01:47:00.000Z",
+    "last_edited_time": "2024-05-24T02:04:00.000Z",
+    "created_by": {"object": "user", "id": "27910b45-ae07-403c-b7e9-35b5adc896af"},
+    "last_edited_by": {"object": "user", "id": "27910b45-ae07-403c-b7e9-35b5adc896af"},
+    "icon": {"type": "emoji", "emoji": "👩🏻‍💻"},
+    "parent": {"type": "database_id", "database_id": "6301f640-e21c-4526-a72e-d96e7d4ba71d"},
+    "archived": False,
+    "properties": {
+        "Nome": {
+            "id": "title",
+            "type": "title",
+            "title": [{"type": "text", "plain_text": "Exemplo de nome"}],
+        }
+    },
+    "url": "https://www.notion.so/Exemplo-de-nome-48a4c8b58c7543ee8863505c38ffa20e",
+}
+
+
+def paragraph_sample(block_id: str, text: str) -> dict:
+    return {
+        "object": "block",
+        "id": block_id,
+        "type": "paragraph",
+        "has_children": False,
+        "paragraph": {"rich_text": [{"type": "text", "plain_text": text}]},
+    }
+
+
+def build_manager(
+    handler,
+    notion_rate_limiter: NotionRateLimiter | None = None,
+    notion_page_cache: LruCacheTool | None = None,
+) -> AsyncNotionPageManager:
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="https://api.notion.com"
+    )
+    async_notion_transport: AsyncNotionTransport = AsyncNotionTransport(
+        container.settings_tool(),
+        container.log_tool(),
+        notion_rate_limiter or container.notion_rate_limiter(),
+        client,
+    )
+    async_notion_block_manager: AsyncNotionBlockManager = AsyncNotionBlockManager(
+        container.settings_tool(), container.log_tool(), async_notion_transport
+    )
+    return AsyncNotionPageManager(
+        container.settings_tool(),
+        container.log_tool(),
+        async_notion_block_manager,
+        async_notion_transport,
+        notion_page_cache,
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_read_page_by_id():
+    # Mocks
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/v1/blocks/"):
+            if request.url.params.get("start_cursor") is None:
+                return httpx.Response(
+                    200,
+                    json={
+                        "results": [paragraph_sample("b1", "This is a test 1")],
+                        "has_more": True,
+                        "next_cursor": "cursor-2",
+                    },
+                )
+            return httpx.Response(
+                200,
+                json={
+                    "results": [paragraph_sample("b2", "This is a test 2")],
+                    "has_more": False,
+                    "next_cursor": None,
+                },
+            )
+        return httpx.Response(200, json=page_sample)
+
+    # Arrange
+    async_notion_page_manager: AsyncNotionPageManager = build_manager(handler)
+
+    # Act
+    response_page: NotionPage = await async_notion_page_manager.read_page_by_id(
+        "secret_123", page_sample["id"]
+    )
+
+    # Assert
+    assert response_page is not None, "Page not found"
+    assert len(response_page.properties) == 1, "Page properties are empty"
+    assert [block.value for block in response_page.blocks] == [
+        "This is a test 1",
+        "This is a test 2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_should_query_pages_by_database_id():
+    # Mocks
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.method == "POST"
+        assert request.url.path == "/v1/databases/6301f640e21c4526a72ed96e7d4ba71d/query"
+        return httpx.Response(
+            200,
+            json={"results": [page_sample, page_sample], "has_more": False},
+        )
+
+    # Arrange
+    async_notion_page_manager: AsyncNotionPageManager = build_manager(handler)
+
+    # Act
+    pages: list[NotionPage] = await async_notion_page_manager.query_pages_by_database_id(
+        "secret_123", "6301f640e21c4526a72ed96e7d4ba71d"
+    )
+
+    # Assert
+    assert len(pages) == 2, "Both pages should be returned"
+
+
+@pytest.mark.asyncio
+async def test_should_read_nested_blocks_of_page():
+    # Mocks
+    toggle: dict = paragraph_sample("b1", "Toggle")
+    toggle["has_children"] = True
+    nested_toggle: dict = paragraph_sample("b2", "Nested toggle")
+    nested_toggle["has_children"] = True
+    children_by_block_id: dict = {
+        page_sample["id"]: [toggle, paragraph_sample("b3", "Sibling")],
+        "b1": [nested_toggle],
+        "b2": [paragraph_sample("b4", "Leaf")],
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/v1/blocks/"):
+            block_id: str = request.url.path.split("/")[3]
+            return httpx.Response(
+                200,
+                json={
+                    "results": children_by_block_id[block_id],
+                    "has_more": False,
+                    "next_cursor": None,
+                },
+            )
+        return httpx.Response(200, json=page_sample)
+
+    # Arrange
+    async_notion_page_manager: AsyncNotionPageManager = build_manager(handler)
+
+    # Act
+    response_page: NotionPage = await async_notion_page_manager.read_page_by_id(
+        "secret_123", page_sample["id"]
+    )
+
+    # Assert
+    assert [block.value for block in response_page.blocks] == ["Toggle", "Sibling"]
+    assert response_page.blocks[1].children is None, "Leaf blocks have no children"
+    nested: NotionPageBlock = response_page.blocks[0].children[0]
+    assert nested.value == "Nested toggle"
+    assert [block.value for block in nested.children] == ["Leaf"]
+
+
+@pytest.mark.asyncio
+async def test_should_fetch_sibling_children_concurrently():
+    # Mocks
+    parents: list[dict] = []
+    for index in range(3):
+        parent: dict = paragraph_sample(f"p{index}", f"Parent {index}")
+        parent["has_children"] = True
+        parents.append(parent)
+    in_flight: list[int] = [0, 0]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if not request.url.path.startswith("/v1/blocks/"):
+            return httpx.Response(200, json=page_sample)
+        block_id: str = request.url.path.split("/")[3]
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight[1], in_flight[0])
+        await asyncio.sleep(0.05)
+        in_flight[0] -= 1
+        results: list[dict] = (
+            parents
+            if block_id == page_sample["id"]
+            else [paragraph_sample(f"{block_id}-c", "Child")]
+        )
+        return httpx.Response(
+            200, json={"results": results, "has_more": False, "next_cursor": None}
+        )
+
+    # Arrange
+    notion_rate_limiter: NotionRateLimiter = NotionRateLimiter(
+        container.settings_tool(), container.log_tool()
+    )
+    notion_rate_limiter.burst = 10
+    async_notion_page_manager: AsyncNotionPageManager = build_manager(
+        handler, notion_rate_limiter
+    )
+
+    # Act
+    response_page: NotionPage = await async_notion_page_manager.read_page_by_id(
+        "secret_123", page_sample["id"]
+    )
+
+    # Assert
+    assert all(len(block.children) == 1 for block in response_page.blocks)
+    assert in_flight[1] == 3, "Children of sibling blocks should be fetched together"
+
+
+@pytest.mark.asyncio
+async def test_should_iter_pages_until_last_cursor():
+    # Mocks
+    cursors: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body: dict = json.loads(request.content)
+        start_cursor: str | None = body.get("start_cursor")
+        cursors.append(start_cursor)
+        next_cursor: str | None = {None: "cursor-2", "cursor-2": "cursor-3"}.get(
+            start_cursor
+        )
+        return httpx.Response(
+            200,
+            json={
+                "results": [page_sample, page_sample],
+                "has_more": next_cursor is not None,
+                "next_cursor": next_cursor,
+            },
+        )
+
+    # Arrange
+    async_notion_page_manager: AsyncNotionPageManager = build_manager(handler)
+
+    # Act
+    batch_sizes: list[int] = []
+    async for batch in async_notion_page_manager.iter_pages_by_database_id(
+        "secret_123", "6301f640e21c4526a72ed96e7d4ba71d", page_size=2
+    ):
+        batch_sizes.append(len(batch))
+
+    # Assert
+    assert batch_sizes == [2, 2, 2], "Every batch should be yielded"
+    assert cursors == [None, "cursor-2", "cursor-3"], "Cursors should be followed in order"
+
+
+@pytest.mark.asyncio
+async def test_should_create_pages_with_bounded_concurrency(monkeypatch):
+    # Mocks
+    monkeypatch.setenv("NOTION_BULK_CREATE_CONCURRENCY", "2")
+    in_flight: list[int] = [0, 0]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body: dict = json.loads(request.content)
+        title: str = body["properties"]["Nome"]["title"][0]["text"]["content"]
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight[1], in_flight[0])
+        await asyncio.sleep(0.02)
+        in_flight[0] -= 1
+        return httpx.Response(200, json={"object": "page", "id": f"id-{title}"})
+
+    def build_page(title: str) -> NotionPage:
+        return NotionPage(
+            NotionIcon("emoji", "🚀"), [NotionProperty("Nome", "title", title)], []
+        )
+
+    # Arrange
+    notion_rate_limiter: NotionRateLimiter = NotionRateLimiter(
+        container.settings_tool(), container.log_tool()
+    )
+    notion_rate_limiter.burst = 10
+    async_notion_page_manager: AsyncNotionPageManager = build_manager(
+        handler, notion_rate_limiter
+    )
+    pages: list[NotionPage] = [build_page(str(index)) for index in range(5)]
+    pages.insert(2, NotionPage(NotionIcon("emoji", "🚀"), [], []))
+
+    # Act
+    results: list[dict] = [
+        result
+        async for result in async_notion_page_manager.create_pages(
+            "secret_123", pages, "6301f640e21c4526a72ed96e7d4ba71d"
+        )
+    ]
+
+    # Assert
+    results_by_index: dict = {result["index"]: result for result in results}
+    assert len(results) == 6, "Every page should have a result"
+    assert results_by_index[2] == {
+        "index": 2,
+        "Message": "Page properties cannot be empty",
+    }
+    assert [results_by_index[index]["page_id"] for index in (0, 1, 3, 4, 5)] == [
+        "id-0",
+        "id-1",
+        "id-2",
+        "id-3",
+        "id-4",
+    ]
+    assert in_flight[1] == 2, "No more than two pages should be created at once"
+
+
+@pytest.mark.asyncio
+async def test_should_append_blocks_beyond_first_hundred_in_order(monkeypatch):
+    # Mocks
+    monkeypatch.setenv("NOTION_RETRY_MAX_ATTEMPTS", "1")
+    requests: list[tuple[str, list[str]]] = []
+    failures: list[int] = [1]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body: dict = json.loads(request.content)
+        contents: list[str] = [
+            child["paragraph"]["rich_text"][0]["text"]["content"]
+            for child in body["children"]
+        ]
+        if request.method == "PATCH" and contents[0] == "200" and failures[0] > 0:
+            failures[0] -= 1
+            return httpx.Response(503, json={"message": "unavailable"})
+        requests.append((request.method, contents))
+        return httpx.Response(200, json={"object": "page", "id": "new-page-id"})
+
+    # Arrange
+    notion_rate_limiter: NotionRateLimiter = NotionRateLimiter(
+        container.settings_tool(), container.log_tool()
+    )
+    notion_rate_limiter.burst = 10
+    async_notion_page_manager: AsyncNotionPageManager = build_manager(
+        handler, notion_rate_limiter
+    )
+    page: NotionPage = NotionPage(
+        NotionIcon("emoji", "🚀"),
+        [NotionProperty("Nome", "title", "Long page")],
+        [NotionPageBlock("paragraph", str(index)) for index in range(250)],
+    )
+
+    # Act
+    with pytest.raises(PartialWriteException) as error:
+        await async_notion_page_manager.create_page(
+            "secret_123", page, "6301f640e21c4526a72ed96e7d4ba71d"
+        )
+    appended: int = await async_notion_page_manager.append_blocks(
+        "secret_123", error.value.page_id, page, error.value.next_block_index
+    )
+
+    # Assert
+    assert error.value.page_id == "new-page-id"
+    assert error.value.next_block_index == 200, "Only the failed batch should be resent"
+    assert appended == 50
+    assert [(method, len(contents)) for method, contents in requests] == [
+        ("POST", 100),
+        ("PATCH", 100),
+        ("PATCH", 50),
+    ]
+    assert [content for _, contents in requests for content in contents] == [
+        str(index) for index in range(250)
+    ], "Blocks should reach Notion in page order"
+
+
+@pytest.mark.asyncio
+async def test_should_reuse_cached_blocks_until_page_changes():
+    # Mocks
+    block_reads: list[str] = []
+    page_state: dict = dict(page_sample)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/v1/blocks/"):
+            block_reads.append(request.url.path)
+            return httpx.Response(
+                200,
+                json={
+                    "results": [paragraph_sample("b1", f"Read {len(block_reads)}")],
+                    "has_more": False,
+                    "next_cursor": None,
+                },
+            )
+        if request.method == "PATCH":
+            page_state["archived"] = json.loads(request.content)["archived"]
+        return httpx.Response(200, json=page_state)
+
+    # Arrange
+    notion_page_cache: LruCacheTool = LruCacheTool(
+        container.settings_tool(), container.log_tool(), "NOTION_PAGE_CACHE"
+    )
+    async_notion_page_manager: AsyncNotionPageManager = build_manager(
+        handler, notion_page_cache=notion_page_cache
+    )
+
+    # Act
+    first: NotionPage = await async_notion_page_manager.read_page_by_id(
+        "secret_123", page_sample["id"]
+    )
+    cached: NotionPage = await async_notion_page_manager.read_page_by_id(
+        "secret_123", page_sample["id"]
+    )
+    page_state["last_edited_time"] = "2024-05-25T10:00:00.000Z"
+    edited: NotionPage = await async_notion_page_manager.read_page_by_id(
+        "secret_123", page_sample["id"]
+    )
+    await async_notion_page_manager.archive_page_by_id("secret_123", page_sample["id"])
+    archived: NotionPage = await async_notion_page_manager.read_page_by_id(
+        "secret_123", page_sample["id"]
+    )
+
+    # Assert
+    assert first.blocks[0].value == "Read 1"
+    assert cached.blocks[0].value == "Read 1", "Unchanged page should be served from cache"
+    assert edited.blocks[0].value == "Read 2", "Edited page should be refetched"
+    assert archived.blocks[0].value == "Read 3", "Archiving should invalidate the cache"
+    assert len(block_reads) == 3
+
+
+@pytest.mark.asyncio
+async def test_should_not_cache_blocks_read_within_edit_minute():
+    # Mocks
+    block_reads: list[str] = []
+    recent_page: dict = dict(page_sample)
+    recent_page["last_edited_time"] = datetime.now(timezone.utc).isoformat()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/v1/blocks/"):
+            block_reads.append(request.url.path)
+            return httpx.Response(
+                200,
+                json={
+                    "results": [paragraph_sample("b1", "Recent")],
+                    "has_more": False,
+                    "next_cursor": None,
+                },
+            )
+        return httpx.Response(200, json=recent_page)
+
+    # Arrange
+    notion_page_cache: LruCacheTool = LruCacheTool(
+        container.settings_tool(), container.log_tool(), "NOTION_PAGE_CACHE"
+    )
+    async_notion_page_manager: AsyncNotionPageManager = build_manager(
+        handler, notion_page_cache=notion_page_cache
+    )
+
+    # Act
+    for _ in range(2):
+        await async_notion_page_manager.read_page_by_id("secret_123", page_sample["id"])
+
+    # Assert
+    assert len(block_reads) == 2, "A page edited this minute may still change unnoticed"
+    assert notion_page_cache.get_stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_should_cache_empty_pages_and_copy_cached_blocks():
+    # Mocks
+    block_reads: list[str] = []
+    page_blocks: dict[str, list[dict]] = {
+        "empty": [],
+        page_sample["id"]: [paragraph_sample("b1", "Original")],
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/v1/blocks/"):
+            page_id: str = request.url.path.split("/")[3]
+            block_reads.append(page_id)
+            return httpx.Response(
+                200,
+                json={"results": page_blocks[page_id], "has_more": False, "next_cursor": None},
+            )
+        return httpx.Response(200, json=page_sample)
+
+    # Arrange
+    notion_page_cache: LruCacheTool = LruCacheTool(
+        container.settings_tool(), container.log_tool(), "NOTION_PAGE_CACHE"
+    )
+    async_notion_page_manager: AsyncNotionPageManager = build_manager(
+        handler, notion_page_cache=notion_page_cache
+    )
+
+    # Act
+    for _ in range(2):
+        empty: NotionPage = await async_notion_page_manager.read_page_by_id(
+            "secret_123", "empty"
+        )
+    first: NotionPage = await async_notion_page_manager.read_page_by_id(
+        "secret_123", page_sample["id"]
+    )
+    first.blocks[0].value = "Changed by the first caller"
+    second: NotionPage = await async_notion_page_manager.read_page_by_id(
+        "secret_123", page_sample["id"]
+    )
+    second.blocks.clear()
+    third: NotionPage = await async_notion_page_manager.read_page_by_id(
+        "secret_123", page_sample["id"]
+    )
+
+    # Assert
+    assert empty.blocks == []
+    assert block_reads == ["empty", page_sample["id"]], "Empty pages should be cached too"
+    assert third.blocks[0].value == "Original", "Callers should not share cached blocks"
@@ -0,0 +1,312 @@
+import sys, os, asyncio, http.server, threading, time, pytest
+import httpx
+
+sys.path.insert(0, os.path.abspath("."))
+
+from main.library.di_container import Container
+from main.library.repositories.notion.core.async_notion_transport import (
+    AsyncNotionTransport,
+)
+from main.library.repositories.notion.core.notion_rate_limiter import (
+    NotionRateLimiter,
+)
+from main.library.tools.core.metrics_tool import MetricsTool
+from main.library.utils.models.http_exception import HttpException
+
+container: Container = Container()
+
+
+@pytest.mark.asyncio
+async def test_should_send_concurrent_requests_without_blocking():
+    # Mocks
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, json={"object": "page", "archived": True})
+
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="https://api.notion.com"
+    )
+
+    # Arrange
+    notion_rate_limiter: NotionRateLimiter = NotionRateLimiter(
+        container.settings_tool(), container.log_tool()
+    )
+    notion_rate_limiter.burst = 5
+    async_notion_transport: AsyncNotionTransport = AsyncNotionTransport(
+        container.settings_tool(), container.log_tool(), notion_rate_limiter, client
+    )
+    token: str = "secret_123"
+    uri: str = "/v1/pages/c5353a8c-a89c-4dd0-96c5-e3e2d19a0387"
+
+    # Act
+    started_at: float = time.monotonic()
+    responses: list[dict] = await asyncio.gather(
+        *[
+            async_notion_transport.request(token, "PATCH", uri, {"archived": True})
+            for _ in range(5)
+        ]
+    )
+    elapsed: float = time.monotonic() - started_at
+    await async_notion_transport.aclose()
+
+    # Assert
+    assert len(responses) == 5
+    assert all(response["archived"] is True for response in responses)
+    assert elapsed < 0.6, "Requests should run concurrently"
+
+
+@pytest.mark.asyncio
+async def test_should_raise_when_notion_returns_error():
+    # Mocks
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(404, json={"object": "error", "code": "object_not_found"})
+
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="https://api.notion.com"
+    )
+
+    # Arrange
+    async_notion_transport: AsyncNotionTransport = AsyncNotionTransport(
+        container.settings_tool(),
+        container.log_tool(),
+        container.notion_rate_limiter(),
+        client,
+    )
+
+    # Act / Assert
+    with pytest.raises(Exception) as error:
+        await async_notion_transport.request("secret_123", "GET", "/v1/pages/unknown")
+    assert "404" in str(error.value)
+
+
+@pytest.mark.asyncio
+async def test_should_retry_throttled_and_failed_requests(monkeypatch):
+    # Mocks
+    monkeypatch.setenv("NOTION_RETRY_BASE_DELAY", "0.01")
+    responses: list = [
+        httpx.Response(429, headers={"Retry-After": "0"}, json={"code": "rate_limited"}),
+        httpx.Response(503, json={"code": "service_unavailable"}),
+        httpx.Response(200, json={"object": "page", "archived": True}),
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return responses.pop(0)
+
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="https://api.notion.com"
+    )
+
+    # Arrange
+    async_notion_transport: AsyncNotionTransport = AsyncNotionTransport(
+        container.settings_tool(),
+        container.log_tool(),
+        container.notion_rate_limiter(),
+        client,
+    )
+
+    # Act
+    response: dict = await async_notion_transport.request(
+        "secret_retry", "PATCH", "/v1/pages/unknown", {"archived": True}
+    )
+
+    # Assert
+    assert response["archived"] is True
+    assert async_notion_transport.get_stats()["retry_count"] == 2
+    assert len(responses) == 0
+
+
+@pytest.mark.asyncio
+async def test_should_give_up_after_max_attempts(monkeypatch):
+    # Mocks
+    monkeypatch.setenv("NOTION_RETRY_BASE_DELAY", "0.01")
+    monkeypatch.setenv("NOTION_RETRY_MAX_ATTEMPTS", "2")
+    calls: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(502, json={"code": "bad_gateway"})
+
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="https://api.notion.com"
+    )
+
+    # Arrange
+    async_notion_transport: AsyncNotionTransport = AsyncNotionTransport(
+        container.settings_tool(),
+        container.log_tool(),
+        container.notion_rate_limiter(),
+        client,
+    )
+
+    # Act / Assert
+    with pytest.raises(HttpException) as error:
+        await async_notion_transport.request("secret_give_up", "GET", "/v1/pages/x")
+    assert error.value.status_code == 502
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_should_coalesce_identical_concurrent_reads():
+    # Mocks
+    calls: list[tuple[str, str]] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"object": "list", "results": []})
+
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="https://api.notion.com"
+    )
+
+    # Arrange
+    async_notion_transport: AsyncNotionTransport = AsyncNotionTransport(
+        container.settings_tool(),
+        container.log_tool(),
+        container.notion_rate_limiter(),
+        client,
+    )
+    uri: str = "/v1/pages/c5353a8c-a89c-4dd0-96c5-e3e2d19a0387"
+
+    # Act
+    responses: list[dict] = await asyncio.gather(
+        *[async_notion_transport.request("secret_123", "GET", uri) for _ in range(3)],
+        *[
+            async_notion_transport.request(
+                "secret_123", "POST", "/v1/search", {"query": "a", "page_size": 10}
+            )
+            for _ in range(3)
+        ],
+        async_notion_transport.request("secret_456", "GET", uri),
+    )
+    responses[0]["results"].append("changed")
+    await async_notion_transport.aclose()
+
+    # Assert
+    assert calls == [
+        ("GET", "/v1/pages/c5353a8c-a89c-4dd0-96c5-e3e2d19a0387"),
+        ("POST", "/v1/search"),
+        ("GET", "/v1/pages/c5353a8c-a89c-4dd0-96c5-e3e2d19a0387"),
+    ], "Only one call per token and request should reach Notion"
+    assert responses[1]["results"] == [], "Each caller should get its own response"
+    assert async_notion_transport.get_stats()["coalesced_count"] == 4
+
+
+@pytest.mark.asyncio
+async def test_should_observe_request_duration_by_endpoint_template():
+    # Mocks
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"object": "page"})
+
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="https://api.notion.com"
+    )
+
+    # Arrange
+    metrics_tool: MetricsTool = MetricsTool(container.settings_tool(), container.log_tool())
+    async_notion_transport: AsyncNotionTransport = AsyncNotionTransport(
+        container.settings_tool(),
+        container.log_tool(),
+        NotionRateLimiter(container.settings_tool(), container.log_tool()),
+        client,
+        metrics_tool,
+    )
+
+    # Act
+    await async_notion_transport.request(
+        "secret_123", "GET", "/v1/pages/c5353a8c-a89c-4dd0-96c5-e3e2d19a0387"
+    )
+    await async_notion_transport.aclose()
+
+    # Assert
+    assert (
+        'notion_request_duration_seconds_count{endpoint="/v1/pages/{id}",method="GET",status="200"} 1'
+        in metrics_tool.render()
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_retry_server_errors_only_for_idempotent_requests(monkeypatch):
+    # Mocks
+    monkeypatch.setenv("NOTION_RETRY_BASE_DELAY", "0.01")
+    calls: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"}, json={})
+        if request.method == "POST":
+            return httpx.Response(500, json={"code": "internal_server_error"})
+        if len(calls) == 3:
+            return httpx.Response(500, json={"code": "internal_server_error"})
+        return httpx.Response(200, json={"object": "page"})
+
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="https://api.notion.com"
+    )
+
+    # Arrange
+    async_notion_transport: AsyncNotionTransport = AsyncNotionTransport(
+        container.settings_tool(),
+        container.log_tool(),
+        container.notion_rate_limiter(),
+        client,
+    )
+
+    # Act
+    with pytest.raises(HttpException) as error:
+        await async_notion_transport.request(
+            "secret_idempotent", "POST", "/v1/pages", {"parent": {}}
+        )
+    response: dict = await async_notion_transport.request(
+        "secret_idempotent", "GET", "/v1/pages/x"
+    )
+
+    # Assert
+    assert error.value.status_code == 500
+    assert response["object"] == "page"
+    assert calls == ["POST", "POST", "GET", "GET"]
+
+
+@pytest.mark.asyncio
+async def test_should_report_pool_use_of_the_client(monkeypatch):
+    # Mocks
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body: bytes = b'{"object":"page"}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("NOTION_PROTOCOL", "http")
+    monkeypatch.setenv("NOTION_HOST", "127.0.0.1")
+    monkeypatch.setenv("NOTION_PORT", str(server.server_address[1]))
+    monkeypatch.setenv("HTTP_POOL_MAX_SIZE", "4")
+
+    # Arrange
+    async_notion_transport: AsyncNotionTransport = AsyncNotionTransport(
+        container.settings_tool(),
+        container.log_tool(),
+        NotionRateLimiter(container.settings_tool(), container.log_tool()),
+    )
+
+    # Act
+    try:
+        await async_notion_transport.request("secret_pool", "GET", "/v1/pages/x")
+        stats: dict = async_notion_transport.get_pool_stats()
+    finally:
+        await async_notion_transport.aclose()
+        server.shutdown()
+        server.server_close()
+
+    # Assert
+    assert stats == {"max_size": 4, "in_use": 0, "idle": 1}
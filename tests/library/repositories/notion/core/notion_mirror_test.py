@@ -0,0 +1,296 @@
+import sys, os, json, pytest
+import httpx
+
+sys.path.insert(0, os.path.abspath("."))
+
+from main.library.di_container import Container
+from main.library.repositories.notion.core.async_notion_block_manager import (
+    AsyncNotionBlockManager,
+)
+from main.library.repositories.notion.core.async_notion_page_manager import (
+    AsyncNotionPageManager,
+)
+from main.library.repositories.notion.core.async_notion_transport import (
+    AsyncNotionTransport,
+)
+from main.library.repositories.notion.core.notion_mirror import NotionMirror
+from main.library.repositories.notion.core.notion_rate_limiter import (
+    NotionRateLimiter,
+)
+from main.library.repositories.notion.models.notion_page import NotionPage
+from main.library.utils.models.validation_exception import ValidationException
+
+container: Container = Container()
+
+
+def page_sample(
+    page_id: str, name: str, score: float | None, tags: list[str], done: bool, edited: str
+) -> dict:
+    return {
+        "object": "page",
+        "id": page_id,
+        "created_time": "2024-05-24T01:47:00.000Z",
+        "last_edited_time": edited,
+        "created_by": {"object": "user", "id": "27910b45-ae07-403c-b7e9-35b5adc896af"},
+        "last_edited_by": {"object": "user", "id": "27910b45-ae07-403c-b7e9-35b5adc896af"},
+        "icon": {"type": "emoji", "emoji": "🚀"},
+        "parent": {"type": "database_id", "database_id": "db1"},
+        "archived": False,
+        "properties": {
+            "Nome": {
+                "id": "title",
+                "type": "title",
+                "title": [{"type": "text", "plain_text": name}],
+            },
+            "Nota": {"id": "n", "type": "number", "number": score},
+            "Tags": {
+                "id": "t",
+                "type": "multi_select",
+                "multi_select": [{"name": tag, "color": "gray"} for tag in tags],
+            },
+            "Feito": {"id": "f", "type": "checkbox", "checkbox": done},
+        },
+        "url": f"https://www.notion.so/{page_id}",
+    }
+
+
+def block_sample(block_id: str, text: str) -> dict:
+    return {
+        "object": "block",
+        "id": block_id,
+        "type": "paragraph",
+        "paragraph": {"rich_text": [{"type": "text", "plain_text": text}]},
+        "has_children": False,
+    }
+
+
+def build_mirror(handler, monkeypatch, index_blocks: bool = False) -> NotionMirror:
+    monkeypatch.setenv("NOTION_MIRROR_PATH", ":memory:")
+    monkeypatch.setenv("NOTION_SEARCH_INDEX_BLOCKS", "true" if index_blocks else "false")
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="https://api.notion.com"
+    )
+    notion_rate_limiter: NotionRateLimiter = NotionRateLimiter(
+        container.settings_tool(), container.log_tool()
+    )
+    notion_rate_limiter.burst = 10
+    async_notion_transport: AsyncNotionTransport = AsyncNotionTransport(
+        container.settings_tool(), container.log_tool(), notion_rate_limiter, client
+    )
+    async_notion_page_manager: AsyncNotionPageManager = AsyncNotionPageManager(
+        container.settings_tool(),
+        container.log_tool(),
+        AsyncNotionBlockManager(
+            container.settings_tool(), container.log_tool(), async_notion_transport
+        ),
+        async_notion_transport,
+    )
+    return NotionMirror(
+        container.settings_tool(), container.log_tool(), async_notion_page_manager
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_sync_incrementally_and_query_locally(monkeypatch):
+    # Mocks
+    remote_pages: list[dict] = [
+        page_sample("p1", "Alpha report", 7.5, ["urgent"], False, "2024-05-24T02:00:00.000Z"),
+        page_sample("p2", "Beta notes", 3.0, [], True, "2024-05-24T02:01:00.000Z"),
+        page_sample("p3", "Gamma report", None, ["urgent", "later"], True, "2024-05-24T02:02:00.000Z"),
+    ]
+    filters: list[dict | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body: dict = json.loads(request.content)
+        filters.append(body.get("filter"))
+        if body.get("filter") is None:
+            results: list[dict] = remote_pages
+        else:
+            since: str = body["filter"]["last_edited_time"]["on_or_after"]
+            results = [page for page in remote_pages if page["last_edited_time"] >= since]
+        return httpx.Response(
+            200, json={"results": results, "has_more": False, "next_cursor": None}
+        )
+
+    # Arrange
+    notion_mirror: NotionMirror = build_mirror(handler, monkeypatch)
+
+    # Act
+    first_sync: dict = await notion_mirror.sync_database("secret_123", "db1")
+    remote_pages[1] = page_sample(
+        "p2", "Beta notes v2", 9.0, [], True, "2024-05-24T03:00:00.000Z"
+    )
+    second_sync: dict = await notion_mirror.sync_database("secret_123", "db1")
+    reports: list[NotionPage] = notion_mirror.query_pages(
+        "secret_123", "db1", {"property": "Nome", "title": {"contains": "REPORT"}}
+    )
+    high_scores: list[NotionPage] = notion_mirror.query_pages(
+        "secret_123", "db1", {"property": "Nota", "number": {"greater_than": 5}}
+    )
+    urgent_and_done: list[NotionPage] = notion_mirror.query_pages(
+        "secret_123",
+        "db1",
+        {
+            "and": [
+                {"property": "Tags", "multi_select": {"contains": "urgent"}},
+                {"property": "Feito", "checkbox": {"equals": True}},
+            ]
+        },
+    )
+    without_score: list[NotionPage] = notion_mirror.query_pages(
+        "secret_123", "db1", {"property": "Nota", "number": {"is_empty": True}}
+    )
+
+    # Assert
+    assert first_sync["synced_pages"] == 3 and first_sync["full"] is True
+    assert second_sync["full"] is False
+    assert filters[1] == {
+        "timestamp": "last_edited_time",
+        "last_edited_time": {"on_or_after": "2024-05-24T02:02:00.000Z"},
+    }, "The second sync should only ask for pages edited since the first one"
+    assert second_sync["page_count"] == 3
+    assert [page.id for page in reports] == ["p3", "p1"], "Newest edits come first"
+    assert [page.id for page in high_scores] == ["p2", "p1"]
+    assert high_scores[0].properties[0].value == "Beta notes v2"
+    assert [page.id for page in urgent_and_done] == ["p3"]
+    assert [page.id for page in without_score] == ["p3"]
+    assert urgent_and_done[0].icon.value == "🚀"
+
+
+@pytest.mark.asyncio
+async def test_should_drop_deleted_pages_on_full_sync_and_guard_access(monkeypatch):
+    # Mocks
+    remote_pages: list[dict] = [
+        page_sample("p1", "Alpha", 1.0, [], False, "2024-05-24T02:00:00.000Z"),
+        page_sample("p2", "Beta", 2.0, [], False, "2024-05-24T02:01:00.000Z"),
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, json={"results": remote_pages, "has_more": False, "next_cursor": None}
+        )
+
+    # Arrange
+    notion_mirror: NotionMirror = build_mirror(handler, monkeypatch)
+    await notion_mirror.sync_database("secret_123", "db1")
+    remote_pages.pop(0)
+
+    # Act
+    full_sync: dict = await notion_mirror.sync_database("secret_123", "db1", full=True)
+    pages: list[NotionPage] = notion_mirror.query_pages("secret_123", "db1")
+
+    # Assert
+    assert full_sync["deleted_pages"] == 1
+    assert [page.id for page in pages] == ["p2"]
+    with pytest.raises(ValidationException):
+        notion_mirror.query_pages("secret_other", "db1")
+
+
+@pytest.mark.asyncio
+async def test_should_search_titles_properties_and_blocks_from_the_index(monkeypatch):
+    # Mocks
+    remote_pages: list[dict] = [
+        page_sample("p1", "Alpha report", 7.5, ["urgent"], False, "2024-05-24T02:00:00.000Z"),
+        page_sample("p2", "Beta notes", 3.0, [], True, "2024-05-24T02:01:00.000Z"),
+        page_sample("p3", "Gamma report", None, ["later"], True, "2024-05-24T02:02:00.000Z"),
+    ]
+    remote_blocks: dict[str, list[dict]] = {
+        "p1": [block_sample("b1", "Quarterly café revenue grew")],
+        "p2": [],
+        "p3": [block_sample("b3", "Alpha is only mentioned in the body")],
+    }
+    block_reads: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/v1/blocks/"):
+            page_id: str = request.url.path.split("/")[3]
+            block_reads.append(page_id)
+            return httpx.Response(
+                200,
+                json={"results": remote_blocks[page_id], "has_more": False, "next_cursor": None},
+            )
+        body: dict = json.loads(request.content)
+        results: list[dict] = remote_pages
+        if body.get("filter") is not None:
+            since: str = body["filter"]["last_edited_time"]["on_or_after"]
+            results = [page for page in remote_pages if page["last_edited_time"] >= since]
+        return httpx.Response(
+            200, json={"results": results, "has_more": False, "next_cursor": None}
+        )
+
+    # Arrange
+    notion_mirror: NotionMirror = build_mirror(handler, monkeypatch, index_blocks=True)
+    await notion_mirror.sync_database("secret_123", "db1")
+    remote_pages[1] = page_sample("p2", "Beta notes", 3.0, [], True, "2024-05-24T03:00:00.000Z")
+    remote_blocks["p2"] = [block_sample("b2", "New cafe menu")]
+    block_reads.clear()
+
+    # Act
+    await notion_mirror.sync_database("secret_123", "db1")
+    alpha: dict = notion_mirror.search_pages("secret_123", "alpha")
+    cafe: dict = notion_mirror.search_pages("secret_123", "CAFÉ")
+    first_report: dict = notion_mirror.search_pages("secret_123", "rep", page_size=1)
+    urgent: dict = notion_mirror.search_pages("secret_123", "urgent")
+    other_token: dict = notion_mirror.search_pages("secret_other", "alpha")
+
+    # Assert
+    assert "p1" not in block_reads, "Pages not edited since the last sync keep their index"
+    assert "p2" in block_reads
+    assert [result["id"] for result in alpha["results"]] == ["p1", "p3"], "Title matches rank first"
+    assert sorted(result["id"] for result in cafe["results"]) == ["p1", "p2"]
+    assert "<b>café</b>" in cafe["results"][0]["snippet"] + cafe["results"][1]["snippet"]
+    assert len(first_report["results"]) == 1
+    assert first_report["has_more"] is True and first_report["next_offset"] == 1
+    assert [result["id"] for result in urgent["results"]] == ["p1"]
+    assert other_token["results"] == []
+
+
+@pytest.mark.asyncio
+async def test_should_index_properties_when_blocks_cannot_be_read(monkeypatch):
+    # Mocks
+    remote_pages: list[dict] = [
+        page_sample("p1", "Alpha", 1.0, [], False, "2024-05-24T02:00:00.000Z"),
+        page_sample("p2", "Beta", 2.0, [], False, "2024-05-24T02:01:00.000Z"),
+        page_sample("p3", "Gamma", 3.0, [], False, "2024-05-24T02:02:00.000Z"),
+    ]
+    divider: dict = {
+        "object": "block",
+        "id": "d1",
+        "type": "divider",
+        "divider": {},
+        "has_children": False,
+    }
+    toggle: dict = block_sample("t1", "Toggle with children")
+    toggle["has_children"] = True
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/v1/blocks/"):
+            block_id: str = request.url.path.split("/")[3]
+            if block_id == "p1":
+                results: list[dict] = [divider, block_sample("b1", "Visible text")]
+            elif block_id == "p2":
+                results = [toggle]
+            else:
+                # p3 and the children of the toggle in p2.
+                return httpx.Response(404, json={"message": "Could not find block"})
+            return httpx.Response(
+                200, json={"results": results, "has_more": False, "next_cursor": None}
+            )
+        return httpx.Response(
+            200, json={"results": remote_pages, "has_more": False, "next_cursor": None}
+        )
+
+    # Arrange
+    notion_mirror: NotionMirror = build_mirror(handler, monkeypatch, index_blocks=True)
+
+    # Act
+    sync: dict = await notion_mirror.sync_database("secret_123", "db1")
+    visible: dict = notion_mirror.search_pages("secret_123", "visible")
+    toggle_text: dict = notion_mirror.search_pages("secret_123", "toggle")
+    gamma: dict = notion_mirror.search_pages("secret_123", "gamma")
+
+    # Assert
+    assert sync["synced_pages"] == 3
+    assert [result["id"] for result in visible["results"]] == ["p1"], "Unknown block types are skipped"
+    assert toggle_text["results"] == [], "A partial block tree should not be indexed"
+    assert [result["id"] for result in gamma["results"]] == ["p3"]
@@ -130,7 +130,10 @@ def test_should_read_page_by_id(mocker):
     # Arrange
     token: str = "secret_123"
     notion_page_manager_with_mocks = NotionPageManager(
-        settings_tool, log_tool, notion_block_manager_mock
+        settings_tool,
+        log_tool,
+        notion_block_manager_mock,
+        container.notion_transport(),
     )
     page_id: str = "c5353a8c-a89c-4dd0-96c5-e3e2d19a0387"
 
@@ -0,0 +1,64 @@
+import sys, os, time, pytest
+
+sys.path.insert(0, os.path.abspath("."))
+
+from main.library.di_container import Container
+from main.library.repositories.notion.core.notion_rate_limiter import (
+    NotionRateLimiter,
+)
+
+container: Container = Container()
+
+
+def build_rate_limiter(rate: float, burst: float) -> NotionRateLimiter:
+    notion_rate_limiter: NotionRateLimiter = NotionRateLimiter(
+        container.settings_tool(), container.log_tool()
+    )
+    notion_rate_limiter.rate = rate
+    notion_rate_limiter.burst = burst
+    return notion_rate_limiter
+
+
+def test_should_let_burst_through_and_queue_the_rest():
+    # Arrange
+    notion_rate_limiter: NotionRateLimiter = build_rate_limiter(rate=20, burst=3)
+
+    # Act
+    started_at: float = time.monotonic()
+    waits: list[float] = [notion_rate_limiter.acquire("secret_123") for _ in range(5)]
+    elapsed: float = time.monotonic() - started_at
+
+    # Assert
+    assert waits[:3] == [0.0, 0.0, 0.0], "The burst should not wait"
+    assert waits[3] > 0 and waits[4] > 0, "Requests over the burst should queue"
+    assert elapsed >= 0.09
+    stats: dict = notion_rate_limiter.get_stats()
+    assert stats["wait_count"] == 2
+    assert stats["wait_seconds"] == pytest.approx(waits[3] + waits[4])
+
+
+def test_should_keep_one_bucket_per_token():
+    # Arrange
+    notion_rate_limiter: NotionRateLimiter = build_rate_limiter(rate=1, burst=1)
+
+    # Act
+    first_token_wait: float = notion_rate_limiter.acquire("secret_1")
+    second_token_wait: float = notion_rate_limiter.acquire("secret_2")
+
+    # Assert
+    assert first_token_wait == 0.0
+    assert second_token_wait == 0.0
+    assert notion_rate_limiter.get_stats()["buckets"] == 2
+
+
+@pytest.mark.asyncio
+async def test_should_hold_back_penalized_token():
+    # Arrange
+    notion_rate_limiter: NotionRateLimiter = build_rate_limiter(rate=100, burst=10)
+    notion_rate_limiter.penalize("secret_123", 0.1)
+
+    # Act
+    wait: float = await notion_rate_limiter.acquire_async("secret_123")
+
+    # Assert
+    assert wait >= 0.1
@@ -0,0 +1,68 @@
+import sys, os, http.client, pytest
+
+sys.path.insert(0, os.path.abspath("."))
+
+from main.library.di_container import Container
+from main.library.repositories.notion.core.notion_transport import NotionTransport
+
+container: Container = Container()
+
+
+def test_should_reuse_keep_alive_connection_between_requests(mocker):
+    # Mocks
+    keepAliveResponse = mocker.Mock()
+    keepAliveResponse.status = 200
+    keepAliveResponse.will_close = False
+    keepAliveResponse.read.return_value = b'{"object":"page","archived":true}'
+    conn = mocker.Mock(sock=None)
+    conn.getresponse.return_value = keepAliveResponse
+    connection_class = mocker.patch("http.client.HTTPSConnection", return_value=conn)
+
+    # Arrange
+    notion_transport: NotionTransport = container.notion_transport()
+    token: str = "secret_123"
+    uri: str = "/v1/pages/c5353a8c-a89c-4dd0-96c5-e3e2d19a0387"
+
+    # Act
+    first: dict = notion_transport.request(token, "PATCH", uri, {"archived": True})
+    second: dict = notion_transport.request(token, "PATCH", uri, {"archived": True})
+
+    # Assert
+    assert first["archived"] is True
+    assert second["archived"] is True
+    assert connection_class.call_count == 1, "The connection should be kept alive"
+    assert conn.request.call_count == 2
+    assert container.connection_pool_tool().get_stats()["in_use"] == 0
+
+
+def test_should_resend_only_idempotent_requests_on_stale_connection(mocker):
+    # Mocks
+    response = mocker.Mock()
+    response.status = 200
+    response.will_close = False
+    response.read.return_value = b'{"object":"page","id":"page-1"}'
+    response.getheader.return_value = None
+    stale_conn = mocker.Mock(sock=object())
+    stale_conn.getresponse.side_effect = http.client.RemoteDisconnected("closed")
+    fresh_conn = mocker.Mock(sock=None)
+    fresh_conn.getresponse.return_value = response
+    connection_pool_tool = mocker.Mock()
+    connection_pool_tool.acquire.side_effect = [stale_conn, stale_conn, fresh_conn]
+
+    # Arrange
+    notion_transport: NotionTransport = NotionTransport(
+        container.settings_tool(),
+        container.log_tool(),
+        connection_pool_tool,
+        container.notion_rate_limiter(),
+    )
+
+    # Act
+    with pytest.raises(http.client.RemoteDisconnected):
+        notion_transport.request("secret_stale", "POST", "/v1/pages", {"parent": {}})
+    page: dict = notion_transport.request("secret_stale", "GET", "/v1/pages/page-1")
+
+    # Assert
+    assert page["id"] == "page-1"
+    assert stale_conn.request.call_count == 2
+    assert fresh_conn.request.call_count == 1
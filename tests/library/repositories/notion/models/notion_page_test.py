@@ -0,0 +1,47 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("."))
+
+from main.library.repositories.notion.models.notion_custom_icon import NotionIcon
+from main.library.repositories.notion.models.notion_page import NotionPage
+from main.library.repositories.notion.models.notion_page_block import NotionPageBlock
+from main.library.repositories.notion.models.notion_property import NotionProperty
+
+
+def test_should_convert_page_to_dict():
+    # Arrange
+    page: NotionPage = NotionPage(
+        NotionIcon("emoji", "🚀"),
+        [NotionProperty("Name", "title", "Test Page")],
+        [
+            NotionPageBlock(
+                "toggle",
+                "Toggle",
+                block_id="block-1",
+                has_children=True,
+                children=[NotionPageBlock("paragraph", "Inside")],
+            )
+        ],
+        page_id="page-1",
+    )
+
+    # Act
+    page_dict: dict = page.to_dict()
+
+    # Assert
+    assert not hasattr(page, "__dict__")
+    assert page_dict["id"] == "page-1"
+    assert page_dict["icon"] == {"type": "emoji", "value": "🚀"}
+    assert page_dict["properties"] == [
+        {"name": "Name", "type": "title", "value": "Test Page", "options": None}
+    ]
+    assert page_dict["blocks"][0]["id"] == "block-1"
+    assert page_dict["blocks"][0]["children"] == [
+        {
+            "id": None,
+            "type": "paragraph",
+            "value": "Inside",
+            "has_children": False,
+            "children": None,
+        }
+    ]
@@ -0,0 +1,77 @@
+import sys, os, pytest
+
+sys.path.insert(0, os.path.abspath("."))
+
+from main.library.repositories.notion.models.notion_page import NotionPage
+from main.library.repositories.notion.models.notion_page_block import NotionPageBlock
+from main.library.repositories.notion.utils import notion_factory
+from main.library.repositories.notion.utils.notion_factory import (
+    build_blocks_for_request,
+    get_block_value_from_response,
+    get_prop_value_from_response,
+    register_block_codec,
+)
+
+
+def test_should_join_every_rich_text_segment():
+    # Arrange
+    block: dict = {
+        "object": "block",
+        "id": "b1",
+        "type": "paragraph",
+        "paragraph": {
+            "rich_text": [
+                {"type": "text", "plain_text": "Hello, "},
+                {"type": "text", "plain_text": "bold", "annotations": {"bold": True}},
+                {"type": "text", "plain_text": " world"},
+            ]
+        },
+    }
+    prop: dict = {"id": "title", "type": "title", "title": []}
+
+    # Act
+    block_value: str = get_block_value_from_response(block)
+    prop_value: str = get_prop_value_from_response(prop)
+
+    # Assert
+    assert block_value == "Hello, bold world", "Every segment should be decoded"
+    assert prop_value == "", "An empty title should decode to an empty string"
+
+
+def test_should_reject_unknown_block_type():
+    # Arrange
+    block: dict = {"object": "block", "id": "b1", "type": "unknown", "unknown": {}}
+
+    # Act & Assert
+    with pytest.raises(Exception, match="Invalid block type: unknown"):
+        get_block_value_from_response(block)
+
+
+def test_should_register_new_block_codec(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(notion_factory, "BLOCK_DECODERS", dict(notion_factory.BLOCK_DECODERS))
+    monkeypatch.setattr(notion_factory, "BLOCK_ENCODERS", dict(notion_factory.BLOCK_ENCODERS))
+    register_block_codec(
+        "bookmark",
+        decoder=lambda content: content["url"],
+        encoder=lambda block_type, value: {"url": value},
+    )
+    block: dict = {
+        "object": "block",
+        "id": "b1",
+        "type": "bookmark",
+        "bookmark": {"url": "https://example.com"},
+    }
+    page: NotionPage = NotionPage(
+        None, [], [NotionPageBlock("bookmark", "https://example.com")]
+    )
+
+    # Act
+    value: str = get_block_value_from_response(block)
+    blocks: list = build_blocks_for_request(page)
+
+    # Assert
+    assert value == "https://example.com"
+    assert blocks == [
+        {"object": "block", "type": "bookmark", "bookmark": {"url": "https://example.com"}}
+    ]
@@ -0,0 +1,77 @@
+import sys, os, pytest
+import characterai.aiocai
+
+sys.path.insert(0, os.path.abspath("."))
+
+from main.library.di_container import Container
+from main.library.tools.core.character_ai_pool_tool import CharacterAiPoolTool
+
+container: Container = Container()
+
+
+def mock_client(mocker):
+    client_mock = mocker.MagicMock()
+    client_mock.get_me = mocker.AsyncMock(return_value=mocker.Mock(id=1))
+    client_mock.close = mocker.AsyncMock()
+    chat_mock = mocker.MagicMock()
+    chat_mock.ws.open = True
+    chat_mock.close = mocker.AsyncMock()
+    client_mock.connect = mocker.AsyncMock(return_value=chat_mock)
+    return client_mock
+
+
+@pytest.mark.asyncio
+async def test_should_reuse_connection_and_identity(mocker):
+    # Mocks
+    client_class = mocker.patch.object(characterai.aiocai, "Client")
+    client_class.side_effect = lambda token: mock_client(mocker)
+
+    # Arrange
+    pool: CharacterAiPoolTool = CharacterAiPoolTool(
+        container.settings_tool(), container.log_tool()
+    )
+
+    # Act
+    async with pool.connection("token") as first:
+        async with pool.connection("token") as concurrent:
+            pass
+    async with pool.connection("token") as follow_up:
+        follow_up_reused: bool = follow_up.reused
+
+    # Assert
+    assert concurrent is not first, "Concurrent checkouts should not share a connection"
+    assert follow_up_reused is True, "Follow-up message should reuse an open connection"
+    assert client_class.call_count == 2
+    assert first.client.get_me.await_count == 1, "Identity should be fetched once per token"
+    assert concurrent.client.get_me.await_count == 0
+
+
+@pytest.mark.asyncio
+async def test_should_close_failed_and_idle_connections(mocker):
+    # Mocks
+    mocker.patch.object(characterai.aiocai, "Client").side_effect = (
+        lambda token: mock_client(mocker)
+    )
+    monotonic = mocker.patch("time.monotonic", return_value=1000.0)
+
+    # Arrange
+    pool: CharacterAiPoolTool = CharacterAiPoolTool(
+        container.settings_tool(), container.log_tool()
+    )
+    pool.idle_timeout = 60
+
+    # Act
+    with pytest.raises(RuntimeError):
+        async with pool.connection("token") as failed:
+            raise RuntimeError("send failed")
+    async with pool.connection("token") as idle:
+        pass
+    monotonic.return_value = 1061.0
+    async with pool.connection("token") as fresh:
+        fresh_reused: bool = fresh.reused
+
+    # Assert
+    assert failed.chat.close.await_count == 1, "Failed connection should be closed"
+    assert idle.chat.close.await_count == 1, "Idle connection should be evicted"
+    assert fresh is not idle and fresh_reused is False
+    assert pool.get_stats()["idle_connections"] == 1
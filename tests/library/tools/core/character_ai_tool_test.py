@@ -1,4 +1,4 @@
-import sys, os, pytest
+import sys, os, asyncio, json, pytest
 import characterai.aiocai
 
 from main.library.tools.core.character_ai_tool import CharacterAiTool
@@ -6,6 +6,7 @@ from main.library.tools.core.character_ai_tool import CharacterAiTool
 sys.path.insert(0, os.path.abspath("."))
 from main.library.di_container import Container
 from main.library.tools.core.log_tool import LogTool
+from main.library.tools.models.character_ai_response import CharacterAiResponse
 
 container: Container = Container()
 character_ai_tool: CharacterAiTool = container.character_ai_tool()
@@ -46,3 +47,140 @@ async def test_should_chat_with_character(mocker):
 
     # Assert
     assert response is not None
+
+
+@pytest.mark.asyncio
+async def test_should_reconnect_when_idle_connection_was_closed(mocker):
+    # Mocks
+    from websockets.exceptions import ConnectionClosed
+
+    mocker.patch("main.library.tools.core.character_ai_tool.CharacterAiResponse")
+    chats: list = []
+
+    def build_client(token):
+        client_mock = mocker.MagicMock()
+        client_mock.get_me = mocker.AsyncMock(return_value=mocker.Mock(id=1))
+        client_mock.close = mocker.AsyncMock()
+        chat_mock = mocker.MagicMock()
+        chat_mock.ws.open = True
+        chat_mock.close = mocker.AsyncMock()
+        chat_mock.send_message = mocker.AsyncMock(return_value=mocker.Mock())
+        client_mock.connect = mocker.AsyncMock(return_value=chat_mock)
+        chats.append(chat_mock)
+        return client_mock
+
+    mocker.patch.object(characterai.aiocai, "Client").side_effect = build_client
+    tool: CharacterAiTool = CharacterAiTool(
+        container.settings_tool(), container.log_tool()
+    )
+
+    # Act
+    await tool.chat("token", "char_id", "Olá", "chat_id")
+    chats[0].send_message.side_effect = ConnectionClosed(None, None)
+    response = await tool.chat("token", "char_id", "Olá de novo", "chat_id")
+
+    # Assert
+    assert response is not None
+    assert len(chats) == 2, "A new connection should replace the closed one"
+    assert chats[0].close.await_count == 1
+    assert chats[1].send_message.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_should_stream_reply_as_it_is_written(mocker):
+    # Mocks
+    def turn(author_id: str, text: str, final: bool = False) -> str:
+        candidate: dict = {
+            "candidate_id": "candidate",
+            "create_time": "2024-05-27T22:10:23Z",
+            "raw_content": text,
+        }
+        if final:
+            candidate["is_final"] = True
+        return json.dumps(
+            {
+                "turn": {
+                    "turn_key": {"chat_id": "chat_id", "turn_id": "turn_id"},
+                    "create_time": "2024-05-27T22:10:23Z",
+                    "last_update_time": "2024-05-27T22:10:23Z",
+                    "state": "STATE_OK",
+                    "author": {"author_id": author_id, "name": "Character"},
+                    "candidates": [candidate],
+                    "primary_candidate_id": "candidate",
+                }
+            }
+        )
+
+    client_mock = mocker.MagicMock()
+    client_mock.get_me = mocker.AsyncMock(return_value=mocker.Mock(id=1))
+    chat_mock = mocker.MagicMock()
+    chat_mock.ws.open = True
+    chat_mock.ws.send = mocker.AsyncMock()
+    chat_mock.ws.recv = mocker.AsyncMock(
+        side_effect=[
+            turn("123", "Olá"),
+            turn("char_id", "Eu"),
+            turn("char_id", "Eu sou"),
+            turn("char_id", "Eu sou o Vader", final=True),
+        ]
+    )
+    client_mock.connect = mocker.AsyncMock(return_value=chat_mock)
+    mocker.patch.object(characterai.aiocai, "Client", return_value=client_mock)
+    tool: CharacterAiTool = CharacterAiTool(
+        container.settings_tool(), container.log_tool()
+    )
+
+    # Act
+    events: list = [
+        event async for event in tool.stream_chat("token", "char_id", "Olá", "chat_id")
+    ]
+
+    # Assert
+    assert [event["delta"] for event in events[:-1]] == ["Eu", " sou", " o Vader"]
+    assert isinstance(events[-1], CharacterAiResponse)
+    assert events[-1].candidates[0].message == "Eu sou o Vader"
+    assert json.loads(chat_mock.ws.send.await_args.args[0])["payload"]["character_id"] == "char_id"
+
+
+@pytest.mark.asyncio
+async def test_should_chat_with_many_characters_concurrently(mocker, monkeypatch):
+    # Mocks
+    monkeypatch.setenv("CHARACTER_AI_BATCH_CONCURRENCY", "2")
+    in_flight: list[int] = [0, 0]
+
+    async def fake_chat(token, char_id, message, chat_id=None):
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight[1], in_flight[0])
+        try:
+            await asyncio.sleep(1 if char_id == "slow" else 0.01)
+            return f"{char_id}: {message}"
+        finally:
+            in_flight[0] -= 1
+
+    tool: CharacterAiTool = CharacterAiTool(
+        container.settings_tool(), container.log_tool()
+    )
+    mocker.patch.object(tool, "chat", side_effect=fake_chat)
+
+    # Act
+    results: list[dict] = [
+        result
+        async for result in tool.chat_many(
+            "token",
+            [
+                {"char_id": "slow", "message": "Oi", "timeout": 0.05},
+                {"char_id": "a", "message": "Oi"},
+                {"char_id": "b", "message": "Oi"},
+                {"message": "Oi"},
+            ],
+        )
+    ]
+
+    # Assert
+    assert in_flight[1] == 2, "At most two messages should be in flight"
+    assert sorted(result["index"] for result in results) == [0, 1, 2, 3]
+    by_index: dict = {result["index"]: result for result in results}
+    assert by_index[0]["Message"] == "Timed out"
+    assert by_index[1]["response"] == "a: Oi"
+    assert "Message" in by_index[3], "An invalid item should fail alone"
+    assert results[0]["index"] == 1, "Results should come in completion order"
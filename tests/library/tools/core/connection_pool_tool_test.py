@@ -0,0 +1,88 @@
+import sys, os, pytest, socket
+
+sys.path.insert(0, os.path.abspath("."))
+
+from main.library.di_container import Container
+from main.library.tools.core.connection_pool_tool import ConnectionPoolTool
+
+container: Container = Container()
+
+
+def build_pool(max_size: int = 2, acquire_timeout: float = 0.1) -> ConnectionPoolTool:
+    pool: ConnectionPoolTool = ConnectionPoolTool(
+        container.settings_tool(), container.log_tool()
+    )
+    pool.max_size = max_size
+    pool.acquire_timeout = acquire_timeout
+    return pool
+
+
+def test_should_reuse_released_connection(mocker):
+    # Mocks
+    connection_class = mocker.patch("http.client.HTTPSConnection")
+    connection_class.side_effect = lambda host, port: mocker.Mock(sock=None)
+
+    # Arrange
+    pool: ConnectionPoolTool = build_pool()
+
+    # Act
+    first = pool.acquire("https", "api.notion.com", "443")
+    pool.release("https", "api.notion.com", "443", first)
+    second = pool.acquire("https", "api.notion.com", "443")
+
+    # Assert
+    assert second is first, "Idle connection should have been reused"
+    assert connection_class.call_count == 1, "Only one connection should be opened"
+
+
+def test_should_block_until_timeout_when_pool_is_exhausted(mocker):
+    # Mocks
+    mocker.patch("http.client.HTTPSConnection", return_value=mocker.Mock(sock=None))
+
+    # Arrange
+    pool: ConnectionPoolTool = build_pool(max_size=1)
+    pool.acquire("https", "api.notion.com", "443")
+
+    # Act / Assert
+    with pytest.raises(TimeoutError):
+        pool.acquire("https", "api.notion.com", "443")
+
+
+def test_should_discard_connection_idle_for_too_long(mocker):
+    # Mocks
+    connection_class = mocker.patch("http.client.HTTPSConnection")
+    connection_class.side_effect = lambda host, port: mocker.Mock(sock=None)
+
+    # Arrange
+    pool: ConnectionPoolTool = build_pool()
+    pool.idle_timeout = 0
+    first = pool.acquire("https", "api.notion.com", "443")
+    pool.release("https", "api.notion.com", "443", first)
+
+    # Act
+    second = pool.acquire("https", "api.notion.com", "443")
+
+    # Assert
+    assert second is not first, "Expired connection should not be reused"
+    first.close.assert_called_once()
+
+
+def test_should_discard_connection_closed_by_server(mocker):
+    # Mocks
+    connection_class = mocker.patch("http.client.HTTPSConnection")
+    connection_class.side_effect = lambda host, port: mocker.Mock(sock=None)
+    client_socket, server_socket = socket.socketpair()
+
+    # Arrange
+    pool: ConnectionPoolTool = build_pool()
+    first = pool.acquire("https", "api.notion.com", "443")
+    first.sock = client_socket
+    pool.release("https", "api.notion.com", "443", first)
+    server_socket.close()
+
+    # Act
+    second = pool.acquire("https", "api.notion.com", "443")
+
+    # Assert
+    assert second is not first, "Connection closed by the server should not be reused"
+    client_socket.close()
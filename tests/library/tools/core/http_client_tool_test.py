@@ -3,6 +3,7 @@ sys.path.insert(0, os.path.abspath("."))
 
 from main.library.di_container import Container
 from main.library.tools.core.http_client_tool import HttpClientTool
+from main.library.tools.core.metrics_tool import MetricsTool
 
 container: Container = Container()
 http_client_tool: HttpClientTool = container.http_client_tool()
@@ -87,4 +88,23 @@ def test_should_simulate_delete_with_pytest_mock(mocker):
     # Assert
     assert response is not None, "Response data should not be None"    
     assert len(response) > 0, "Response data should not be empty"
-    assert response == b"Response data", "Response data should be 'Response data'"
\ No newline at end of file
+    assert response == b"Response data", "Response data should be 'Response data'"
+
+def test_should_observe_requests_that_raise(mocker):
+    # Mocks
+    conn = mocker.Mock()
+    conn.getresponse.side_effect = ConnectionResetError("Connection reset")
+    mocker.patch("http.client.HTTPConnection", return_value=conn)
+    
+    # Arrange
+    metrics_tool: MetricsTool = MetricsTool(container.settings_tool(), container.log_tool())
+    observed_http_client_tool: HttpClientTool = HttpClientTool(
+        container.settings_tool(), container.log_tool(), metrics_tool
+    )
+    
+    # Act
+    with pytest.raises(ConnectionResetError):
+        observed_http_client_tool.get("http://example.com/health")
+
+    # Assert
+    assert 'http_client_request_duration_seconds_count{host="example.com",method="GET",status="error"} 1' in metrics_tool.render()
\ No newline at end of file
@@ -1,22 +1,95 @@
-import sys, os, pytest
+import sys, os, json, pytest
 sys.path.insert(0, os.path.abspath("."))
 from main.library.di_container import Container
-from main.library.tools.core.log_tool import LogTool
+from main.library.tools.core.log_tool import LogTool, LogWriter, current_request_id
 
 container = Container()
 log_tool = container.log_tool()
 
 def test_should_info(capsys):
     log_tool.info("This is an informational message")
+    log_tool.flush()
     captured = capsys.readouterr()
     assert "This is an informational message" in captured.out
 
 def test_should_warn(capsys):
     log_tool.warn("This is a warning message")
+    log_tool.flush()
     captured = capsys.readouterr()
     assert "This is a warning message" in captured.out
 
 def test_should_error(capsys):
     log_tool.error("This is an error message")
+    log_tool.flush()
     captured = capsys.readouterr()
     assert "This is an error message" in captured.err
+
+def test_should_write_json_lines_with_lazy_arguments(capsys):
+    log_tool.info("Payload: %s", {"id": 1})
+    log_tool.flush()
+    record = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert record["level"] == "INFO"
+    assert record["message"] == "Payload: {'id': 1}"
+    assert "timestamp" in record
+
+def test_should_not_format_disabled_levels():
+    formatted = []
+
+    class Payload:
+        def __str__(self):
+            formatted.append(True)
+            return "payload"
+
+    error_log_tool = LogTool()
+    error_log_tool.log_level = "error"
+    error_log_tool.info("Payload: %s", Payload())
+    error_log_tool.flush()
+    assert formatted == []
+
+def test_should_drop_and_count_when_queue_is_full(capsys, monkeypatch):
+    monkeypatch.setenv("LOG_QUEUE_SIZE", "1")
+    writer = LogWriter(start_thread=False)
+    writer.put("INFO", "first", False)
+    writer.put("INFO", "second", False)
+    assert writer.dropped == 1
+    writer.flush()
+    lines = capsys.readouterr().out.strip().splitlines()
+    assert "1 log messages were dropped" in lines[0]
+    assert json.loads(lines[1])["message"] == "first"
+
+def test_should_format_message_when_logged(capsys):
+    payload = {"id": 1}
+    log_tool.info("Payload: %s", payload)
+    payload["id"] = 2
+    log_tool.flush()
+    record = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert record["message"] == "Payload: {'id': 1}"
+
+def test_should_count_and_report_records_that_cannot_be_written(capsys, monkeypatch):
+    fallback = []
+
+    class BrokenStream:
+        def write(self, text):
+            raise OSError("stream closed")
+
+    class FallbackStream:
+        def write(self, text):
+            fallback.append(text)
+
+    monkeypatch.setattr(sys, "stdout", BrokenStream())
+    monkeypatch.setattr(sys, "__stderr__", FallbackStream())
+    writer = LogWriter(start_thread=False)
+    writer.put("INFO", "lost", False)
+    writer.flush()
+    assert writer.failed == 1
+    assert "stream closed" in fallback[0]
+
+def test_should_log_current_request_id(capsys):
+    request_id_token = current_request_id.set("req-42")
+    try:
+        log_tool.info("Reading page")
+    finally:
+        current_request_id.reset(request_id_token)
+    log_tool.flush()
+    record = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert record["request_id"] == "req-42"
@@ -0,0 +1,72 @@
+import sys, os, pytest
+
+sys.path.insert(0, os.path.abspath("."))
+
+from main.library.di_container import Container
+from main.library.tools.core.lru_cache_tool import LruCacheTool
+
+container: Container = Container()
+
+
+def build_cache(max_entries: int = 2, max_bytes: int = 100, ttl: float = 60) -> LruCacheTool:
+    cache: LruCacheTool = LruCacheTool(
+        container.settings_tool(), container.log_tool(), "NOTION_PAGE_CACHE"
+    )
+    cache.max_entries = max_entries
+    cache.max_bytes = max_bytes
+    cache.ttl = ttl
+    return cache
+
+
+def test_should_evict_least_recently_used_entry():
+    # Arrange
+    cache: LruCacheTool = build_cache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    # Act
+    cache.get("a")
+    cache.set("c", 3)
+
+    # Assert
+    assert cache.get("a") == 1, "Recently read entry should be kept"
+    assert cache.get("b") is None, "Least recently used entry should be evicted"
+    assert cache.get("c") == 3, "New entry should be stored"
+    assert cache.get_stats()["evictions"] == 1, "One eviction should be counted"
+
+
+def test_should_evict_until_under_memory_cap():
+    # Arrange
+    cache: LruCacheTool = build_cache(max_entries=10, max_bytes=100)
+    cache.set("a", "a", size=40)
+    cache.set("b", "b", size=40)
+
+    # Act
+    cache.set("c", "c", size=50)
+    cache.set("d", "d", size=101)
+
+    # Assert
+    assert cache.get("a") is None, "Oldest entry should be evicted over the cap"
+    assert cache.get("b") == "b", "Entry under the cap should be kept"
+    assert cache.get("d") is None, "Entry larger than the cap should not be stored"
+    assert cache.get_stats()["bytes"] == 90, "Bytes should track stored entries"
+
+
+def test_should_expire_entry_after_ttl(mocker):
+    # Mocks
+    monotonic = mocker.patch("time.monotonic", return_value=1000.0)
+
+    # Arrange
+    cache: LruCacheTool = build_cache(ttl=60)
+    cache.set("a", 1)
+
+    # Act
+    monotonic.return_value = 1059.0
+    fresh = cache.get("a")
+    monotonic.return_value = 1060.0
+    expired = cache.get("a")
+
+    # Assert
+    assert fresh == 1, "Entry should be served within its TTL"
+    assert expired is None, "Entry should expire after its TTL"
+    assert cache.get_stats()["entries"] == 0, "Expired entry should be removed"
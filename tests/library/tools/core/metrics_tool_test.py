@@ -0,0 +1,56 @@
+import sys, os, pytest
+
+sys.path.insert(0, os.path.abspath("."))
+
+from main.library.di_container import Container
+from main.library.tools.core.metrics_tool import MetricsTool, get_endpoint_template
+
+container: Container = Container()
+
+
+def test_should_render_histogram_with_cumulative_buckets():
+    # Arrange
+    metrics_tool: MetricsTool = MetricsTool(container.settings_tool(), container.log_tool())
+    metrics_tool.buckets = (0.1, 1.0)
+    labels: dict = {"method": "GET", "endpoint": "/v1/pages/{id}", "status": "200"}
+
+    # Act
+    metrics_tool.observe("notion_request_duration_seconds", labels, 0.05)
+    metrics_tool.observe("notion_request_duration_seconds", labels, 0.5)
+    metrics_tool.observe("notion_request_duration_seconds", labels, 3)
+    rendered: str = metrics_tool.render()
+
+    # Assert
+    series: str = 'endpoint="/v1/pages/{id}",method="GET",status="200"'
+    assert "# TYPE notion_request_duration_seconds histogram" in rendered
+    assert f'notion_request_duration_seconds_bucket{{{series},le="0.1"}} 1' in rendered
+    assert f'notion_request_duration_seconds_bucket{{{series},le="1"}} 2' in rendered
+    assert f'notion_request_duration_seconds_bucket{{{series},le="+Inf"}} 3' in rendered
+    assert f"notion_request_duration_seconds_count{{{series}}} 3" in rendered
+
+
+def test_should_render_stats_sources_as_counters_and_gauges():
+    # Arrange
+    metrics_tool: MetricsTool = MetricsTool(container.settings_tool(), container.log_tool())
+    metrics_tool.register_stats(
+        "notion_page_cache", lambda: {"entries": 3, "hits": 7}, counters=("hits",)
+    )
+
+    # Act
+    rendered: str = metrics_tool.render()
+
+    # Assert
+    assert "# TYPE notion_page_cache_entries gauge\nnotion_page_cache_entries 3" in rendered
+    assert "# TYPE notion_page_cache_hits_total counter\nnotion_page_cache_hits_total 7" in rendered
+
+
+def test_should_replace_ids_in_endpoint_template():
+    # Act
+    templates: list[str] = [
+        get_endpoint_template("/v1/blocks/c5353a8c-a89c-4dd0-96c5-e3e2d19a0387/children?page_size=100"),
+        get_endpoint_template("/v1/databases/c7c1007ad1124b8ca621a769adaf7dda/query"),
+        get_endpoint_template("/v1/search"),
+    ]
+
+    # Assert
+    assert templates == ["/v1/blocks/{id}/children", "/v1/databases/{id}/query", "/v1/search"]
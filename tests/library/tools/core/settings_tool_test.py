@@ -83,4 +83,52 @@ def test_should_crud_setting_successfully():
     settings_tool.delete(key)
     deletedValue: str = settings_tool.get(key)
     assert deletedValue is None, "Setting was not deleted."
-    
\ No newline at end of file
+    
+def test_should_serve_reads_from_snapshot_without_io(mocker):
+    # Arrange
+    snapshot_settings_tool: SettingsTool = SettingsTool()
+    snapshot_settings_tool.get("sys_name")
+    reload_count: int = snapshot_settings_tool.reload_count
+    open_mock = mocker.patch("builtins.open", side_effect=AssertionError("File was opened"))
+    stat_mock = mocker.patch("os.stat", side_effect=AssertionError("File was stat'ed"))
+
+    # Act
+    values: list = [snapshot_settings_tool.get("NOTION_HOST") for _ in range(100)]
+
+    # Assert
+    assert all(value == values[0] for value in values)
+    assert snapshot_settings_tool.reload_count == reload_count
+    open_mock.assert_not_called()
+    stat_mock.assert_not_called()
+
+def test_should_reload_snapshot_when_file_changes():
+    # Arrange
+    key: str = "temp_key"
+    value: str = "temp_value"
+    watching_settings_tool: SettingsTool = SettingsTool(check_interval=0)
+    assert watching_settings_tool.get(key) is None
+    reload_count: int = watching_settings_tool.reload_count
+
+    # Act
+    settings_tool.set(key, value)
+    readValue: str = watching_settings_tool.get(key)
+
+    # Assert
+    assert readValue == value
+    assert watching_settings_tool.reload_count == reload_count + 1
+
+    # Cleanup
+    settings_tool.delete(key)
+
+def test_should_reload_snapshot_on_demand():
+    # Arrange
+    reload_count: int = settings_tool.reload_count
+
+    # Act
+    snapshot = settings_tool.reload()
+
+    # Assert
+    assert "sys_name" in snapshot
+    assert settings_tool.reload_count == reload_count + 1
+    with pytest.raises(TypeError):
+        snapshot["sys_name"] = "changed"
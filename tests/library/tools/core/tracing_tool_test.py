@@ -0,0 +1,87 @@
+import sys, os, asyncio, json, pytest
+
+sys.path.insert(0, os.path.abspath("."))
+
+from main.library.di_container import Container
+from main.library.tools.core.tracing_tool import (
+    FileSpanExporter,
+    InMemorySpanExporter,
+    TracingTool,
+    start_span,
+    traced,
+)
+
+container: Container = Container()
+
+
+class Reader:
+    @traced()
+    async def read(self) -> str:
+        await asyncio.sleep(0)
+        return "page"
+
+    @traced("reader.fail")
+    def fail(self) -> None:
+        raise Exception("Notion is down")
+
+
+@pytest.mark.asyncio
+async def test_should_nest_spans_under_the_request_trace():
+    # Arrange
+    exporter: InMemorySpanExporter = InMemorySpanExporter()
+    tracing_tool: TracingTool = TracingTool(
+        container.settings_tool(), container.log_tool(), exporter
+    )
+
+    # Act
+    with tracing_tool.start_trace("req-1", "GET /pages/{page_id}/read"):
+        with start_span("notion.request", method="GET"):
+            result: str = await Reader().read()
+        with pytest.raises(Exception):
+            Reader().fail()
+    spans: list[dict] = tracing_tool.get_spans("req-1")
+
+    # Assert
+    assert result == "page"
+    by_name: dict = {span["name"]: span for span in spans}
+    root: dict = by_name["GET /pages/{page_id}/read"]
+    assert root["parent_id"] is None
+    assert by_name["notion.request"]["parent_id"] == root["span_id"]
+    assert by_name["Reader.read"]["parent_id"] == by_name["notion.request"]["span_id"]
+    assert by_name["reader.fail"]["status"] == "error"
+    assert by_name["reader.fail"]["error"] == "Exception: Notion is down"
+    assert all(span["trace_id"] == "req-1" for span in spans)
+
+
+def test_should_not_record_spans_outside_a_trace():
+    # Arrange
+    exporter: InMemorySpanExporter = InMemorySpanExporter()
+    TracingTool(container.settings_tool(), container.log_tool(), exporter)
+
+    # Act
+    with start_span("notion.request") as span:
+        pass
+
+    # Assert
+    assert span is None
+    assert len(exporter.get_spans()) == 0
+
+
+def test_should_append_spans_to_file(tmp_path):
+    # Arrange
+    path: str = str(tmp_path / "traces" / "spans.jsonl")
+    tracing_tool: TracingTool = TracingTool(
+        container.settings_tool(), container.log_tool(), FileSpanExporter(path)
+    )
+
+    # Act
+    for request_id in ["req-1", "req-2"]:
+        with tracing_tool.start_trace(request_id, "GET /info"):
+            pass
+    tracing_tool.close()
+
+    # Assert
+    with open(path, encoding="utf-8") as file:
+        spans: list[dict] = [json.loads(line) for line in file]
+    assert [span["trace_id"] for span in spans] == ["req-1", "req-2"]
+    assert tracing_tool.get_spans("req-1") is None